@@ -0,0 +1,23 @@
+from baseclasses.models import MontrekSatelliteBaseABC
+from baseclasses.repositories.db.current_satellites import (
+    keeps_current_state,
+    rebuild_current_satellites,
+)
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the current satellites of all satellite classes keeping their "
+        "current state, e.g. after setting keep_current_state on existing data."
+    )
+
+    def handle(self, *args, **kwargs):
+        for model in apps.get_models():
+            if not issubclass(model, MontrekSatelliteBaseABC):
+                continue
+            if not keeps_current_state(model):
+                continue
+            rebuild_current_satellites(model)
+            self.stdout.write(f"Rebuilt current satellites of {model._meta.label}")
@@ -0,0 +1,23 @@
+from baseclasses.models import HubValueDate
+from baseclasses.repositories.db.latest_hub_value_dates import (
+    keeps_latest_value_date,
+    rebuild_latest_hub_value_dates,
+)
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the latest hub value dates of all hub value date classes "
+        "keeping them, e.g. after setting keep_latest_value_date on existing data."
+    )
+
+    def handle(self, *args, **kwargs):
+        for model in apps.get_models():
+            if not issubclass(model, HubValueDate):
+                continue
+            if not keeps_latest_value_date(model):
+                continue
+            rebuild_latest_hub_value_dates(model)
+            self.stdout.write(f"Rebuilt latest hub value dates of {model._meta.label}")
@@ -0,0 +1,40 @@
+from baseclasses.repositories.index_advisor import (
+    get_repository_classes,
+    get_repository_sql,
+    recommend_indexes,
+)
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the point-in-time indexes missing on the tables read by the "
+        "queries of all repositories."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database whose indexes are inspected.",
+        )
+
+    def handle(self, *args, **kwargs):
+        using = kwargs["database"]
+        sql_by_repository = {}
+        for repository_class in get_repository_classes():
+            name = f"{repository_class.__module__}.{repository_class.__qualname__}"
+            try:
+                sql_by_repository[name] = get_repository_sql(repository_class, using)
+            except Exception as error:
+                self.stderr.write(f"Skipped {name}: {error}")
+        recommendations = recommend_indexes(sql_by_repository, using)
+        if not recommendations:
+            self.stdout.write("No missing indexes found.")
+            return
+        for recommendation in recommendations:
+            self.stdout.write(
+                f"-- {len(recommendation.repositories)} repositories, "
+                f"e.g. {recommendation.repositories[0]}"
+            )
+            self.stdout.write(recommendation.get_sql(using))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baseclasses", "0028_delete_mockmodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ViewModelRefresh",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("view_model_table", models.CharField(max_length=255, unique=True)),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baseclasses", "0029_viewmodelrefresh"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="testlinksatellite",
+            name="baseclasses_hub_ent_19c945_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="testmontreksatellite",
+            name="baseclasses_hub_ent_02c9e4_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="testmontreksatellitenoidfields",
+            name="baseclasses_hub_ent_12c626_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="testmontrektimeseriessatellite",
+            name="baseclasses_hub_val_649d90_idx",
+        ),
+        migrations.AddIndex(
+            model_name="linktestmontrektestlink",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="baseclasses_hub_in__44b49d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linktestmontrektestlink",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="baseclasses_hub_out_90b329_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testlinksatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="baseclasses_hub_ent_36ae4a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testmontreksatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="baseclasses_hub_ent_e1dd90_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testmontreksatellitenoidfields",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="baseclasses_hub_ent_7def43_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testmontrektimeseriessatellite",
+            index=models.Index(
+                fields=["hub_value_date", "state_date_end", "state_date_start"],
+                name="baseclasses_hub_val_aff065_idx",
+            ),
+        ),
+    ]
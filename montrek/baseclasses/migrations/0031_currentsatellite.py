@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baseclasses", "0030_point_in_time_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CurrentSatellite",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("satellite_table", models.CharField(max_length=255)),
+                ("hub_id", models.BigIntegerField()),
+                ("satellite_id", models.BigIntegerField()),
+                ("state_date_start", models.DateTimeField()),
+                ("state_date_end", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["satellite_table", "hub_id", "state_date_end"],
+                        name="baseclasses_satelli_e90e7f_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baseclasses", "0031_currentsatellite"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LatestHubValueDate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hub_value_date_table", models.CharField(max_length=255)),
+                ("hub_id", models.BigIntegerField()),
+                ("hub_value_date_id", models.BigIntegerField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["hub_value_date_table", "hub_id"],
+                        name="baseclasses_hub_val_d81b42_idx",
+                    ),
+                    models.Index(
+                        fields=["hub_value_date_table", "hub_value_date_id"],
+                        name="baseclasses_hub_val_a8fcd4_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
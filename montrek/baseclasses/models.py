@@ -11,6 +11,14 @@ from django.utils import timezone
 
 # Create your models here.
 
+# Satellites and links are read at a reference date by their hub and the
+# state date range, see QueryBuilder. These composite indexes serve these
+# lookups and every lookup by the hub alone.
+POINT_IN_TIME_INDEX_FIELDS = {
+    hub_field: [hub_field, "state_date_end", "state_date_start"]
+    for hub_field in ("hub_entity", "hub_value_date", "hub_in", "hub_out")
+}
+
 
 class TimeStampMixin(models.Model):
     class Meta:
@@ -76,6 +84,54 @@ class ValueDateList(models.Model):
         return f"value_date: {self.value_date}"
 
 
+class ViewModelRefresh(models.Model):
+    # High-water mark of the last view model refresh, keyed by the view
+    # model's table. Data vault rows changed after refreshed_at are picked up
+    # by the next incremental refresh.
+    view_model_table = models.CharField(max_length=255, unique=True)
+    refreshed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.view_model_table}: {self.refreshed_at}"
+
+
+class CurrentSatellite(models.Model):
+    # Satellite versions that were not closed yet when their hub was last
+    # written, for satellite classes with keep_current_state. All versions
+    # valid from then on are kept, so reads at a later date need no history.
+    class Meta:
+        indexes = [
+            models.Index(fields=["satellite_table", "hub_id", "state_date_end"]),
+        ]
+
+    satellite_table = models.CharField(max_length=255)
+    hub_id = models.BigIntegerField()
+    satellite_id = models.BigIntegerField()
+    state_date_start = models.DateTimeField()
+    state_date_end = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.satellite_table}: {self.hub_id} -> {self.satellite_id}"
+
+
+class LatestHubValueDate(models.Model):
+    # The hub value date kept by latest_ts for each hub, for hub value date
+    # classes with keep_latest_value_date: the one with the latest value date,
+    # or the one without value date if the hub has no other.
+    class Meta:
+        indexes = [
+            models.Index(fields=["hub_value_date_table", "hub_id"]),
+            models.Index(fields=["hub_value_date_table", "hub_value_date_id"]),
+        ]
+
+    hub_value_date_table = models.CharField(max_length=255)
+    hub_id = models.BigIntegerField()
+    hub_value_date_id = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.hub_value_date_table}: {self.hub_id} -> {self.hub_value_date_id}"
+
+
 # Base Hub Model ABC
 class MontrekHubABC(TimeStampMixin, StateMixin, UserMixin):
     class Meta:
@@ -119,6 +175,11 @@ class HubValueDate(models.Model):
     hub = HubForeignKey(MontrekHubABC)
     value_date_list = models.ForeignKey(ValueDateList, on_delete=models.CASCADE)
 
+    # Keep the latest hub value date per hub in LatestHubValueDate, so
+    # latest_ts reads skip the older dates. Only for hub value dates written
+    # by the DbWriter; others must call refresh_latest_hub_value_dates.
+    keep_latest_value_date = False
+
     def __str__(self):
         return f"hub: {self.hub} value_date_list: {self.value_date_list}"
 
@@ -136,6 +197,10 @@ class MontrekSatelliteBaseABC(TimeStampMixin, StateMixin, UserMixin):
     # Some hubs can have multiple satellites (e.g. timeseries).
     allow_multiple = False
     is_timeseries = False
+    # Keep the versions not closed yet in CurrentSatellite, so reads at the
+    # current date skip the history. Only for static satellites written by
+    # the DbWriter; others must call refresh_current_satellites themselves.
+    keep_current_state = False
 
     def save(self, *args, **kwargs):
         if self.hash_identifier == "":
@@ -249,7 +314,7 @@ class MontrekSatelliteABC(MontrekSatelliteBaseABC):
         indexes = [
             models.Index(fields=["hash_identifier"]),
             models.Index(fields=["hash_value"]),
-            models.Index(fields=["hub_entity"]),
+            models.Index(fields=POINT_IN_TIME_INDEX_FIELDS["hub_entity"]),
         ]
 
     hub_entity = models.ForeignKey(MontrekHubABC, on_delete=models.CASCADE)
@@ -268,7 +333,7 @@ class MontrekTimeSeriesSatelliteABC(MontrekSatelliteBaseABC):
         indexes = [
             models.Index(fields=["hash_identifier"]),
             models.Index(fields=["hash_value"]),
-            models.Index(fields=["hub_value_date"]),
+            models.Index(fields=POINT_IN_TIME_INDEX_FIELDS["hub_value_date"]),
         ]
 
     hub_value_date = models.ForeignKey(HubValueDate, on_delete=models.CASCADE)
@@ -283,7 +348,7 @@ class MontrekTimeSeriesSatelliteABC(MontrekSatelliteBaseABC):
 
 
 class MontrekTypeSatelliteABC(MontrekSatelliteABC):
-    class Meta:
+    class Meta(MontrekSatelliteABC.Meta):
         abstract = True
 
     typename = models.CharField(max_length=50, default="NONE")
@@ -301,8 +366,8 @@ class MontrekLinkABC(TimeStampMixin, StateMixin):
     class Meta:
         abstract = True
         indexes = [
-            models.Index(fields=["hub_in"]),
-            models.Index(fields=["hub_out"]),
+            models.Index(fields=POINT_IN_TIME_INDEX_FIELDS["hub_in"]),
+            models.Index(fields=POINT_IN_TIME_INDEX_FIELDS["hub_out"]),
         ]
 
     link_type = LinkTypeEnum.NONE
@@ -322,21 +387,21 @@ class MontrekLinkABC(TimeStampMixin, StateMixin):
 
 
 class MontrekOneToOneLinkABC(MontrekLinkABC):
-    class Meta:
+    class Meta(MontrekLinkABC.Meta):
         abstract = True
 
     link_type = LinkTypeEnum.ONE_TO_ONE
 
 
 class MontrekOneToManyLinkABC(MontrekLinkABC):
-    class Meta:
+    class Meta(MontrekLinkABC.Meta):
         abstract = True
 
     link_type = LinkTypeEnum.ONE_TO_MANY
 
 
 class MontrekManyToManyLinkABC(MontrekLinkABC):
-    class Meta:
+    class Meta(MontrekLinkABC.Meta):
         abstract = True
 
     link_type = LinkTypeEnum.MANY_TO_MANY
@@ -1,10 +1,10 @@
 import inspect
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
 from dataclasses import dataclass
 from typing import Any
 from django.apps.registry import AppRegistryNotReady
 from django.db import models
-from django.db.models import ExpressionWrapper, Field, QuerySet, Subquery
+from django.db.models import ExpressionWrapper, F, Field, QuerySet, Subquery
 from django.utils import timezone
 from baseclasses.repositories.subquery_builder import (
     LINK_AGG_FIELD_TYPE_MAP,
@@ -123,21 +123,41 @@ class Annotator:
 
     def field_projections_to_subqueries(
         self,
-    ) -> dict[str, Subquery | ExpressionWrapper]:
+        join_names: dict[str, str] | None = None,
+        fields: Collection[str] | None = None,
+    ) -> dict[str, Subquery | ExpressionWrapper | F]:
+        """Project every registered satellite field onto the queryset.
+
+        ``join_names`` maps satellite alias names to the name of a joined
+        relation (see ``QueryBuilder`` with ``query_engine="join"``); fields of
+        those aliases are read from the join instead of a pk subquery.
+        If ``fields`` is given, only these output fields are projected.
+        """
+        join_names = join_names or {}
         subquery_map = {}
         for field_projection in self.field_projections:
+            if fields is not None and field_projection.outfield not in fields:
+                continue
             alias_name = field_projection.satellite_alias.alias_name
             subquery_builder = field_projection.satellite_alias.subquery_builder
             field = field_projection.field
             outfield = field_projection.outfield
+            if alias_name in join_names:
+                subquery_map[outfield] = subquery_builder.build_join_subquery(
+                    join_names[alias_name], field
+                )
+                continue
             subquery_map[outfield] = subquery_builder.build_subquery(alias_name, field)
         return subquery_map
 
     def linked_field_projections_to_subqueries(
         self,
+        fields: Collection[str] | None = None,
     ) -> dict[str, Subquery]:
         subquery_map = {}
         for lfp in self.linked_field_projections:
+            if fields is not None and lfp.outfield not in fields:
+                continue
             alias_name = lfp.linked_satellite_alias.alias_name
             builder = lfp.linked_satellite_alias.subquery_builder
             subquery_map[lfp.outfield] = builder.build_subquery(alias_name, lfp.field)
@@ -147,15 +167,23 @@ class Annotator:
         self,
         reference_date: timezone.datetime,
         queryset: QuerySet | None = None,
-    ) -> dict[str, Subquery]:
-        return {
-            field: (
-                subquery_builder.build(reference_date, queryset=queryset)
-                if "queryset" in inspect.signature(subquery_builder.build).parameters
-                else subquery_builder.build(reference_date)
-            )
-            for field, subquery_builder in self.annotations.items()
-        }
+        prefer_joins: bool = False,
+        fields: Collection[str] | None = None,
+    ) -> dict[str, Subquery | F]:
+        annotations = {}
+        for field, subquery_builder in self.annotations.items():
+            if fields is not None and field not in fields:
+                continue
+            join_field = subquery_builder.build_join_field() if prefer_joins else None
+            if join_field is not None:
+                annotations[field] = join_field
+            elif "queryset" in inspect.signature(subquery_builder.build).parameters:
+                annotations[field] = subquery_builder.build(
+                    reference_date, queryset=queryset
+                )
+            else:
+                annotations[field] = subquery_builder.build(reference_date)
+        return annotations
 
     def set_field_type(
         self, field: str, outfield: str, satellite_class: type[MontrekSatelliteBaseABC]
@@ -0,0 +1,52 @@
+import itertools
+from collections.abc import Iterable
+
+from baseclasses.models import CurrentSatellite, MontrekSatelliteBaseABC
+from django.utils import timezone
+
+# Hubs refreshed per query, below the parameter limit of every database
+REFRESH_BATCH_SIZE = 500
+
+
+def keeps_current_state(satellite_class: type[MontrekSatelliteBaseABC]) -> bool:
+    return satellite_class.keep_current_state and not satellite_class.is_timeseries
+
+
+def refresh_current_satellites(
+    satellite_class: type[MontrekSatelliteBaseABC], hub_ids: Iterable[int | None]
+):
+    """
+    Replace the current satellites of the hubs by the versions of their
+    satellites that are not closed yet.
+    """
+    if not keeps_current_state(satellite_class):
+        return
+    satellite_table = satellite_class._meta.db_table
+    now = timezone.now()
+    hub_ids = sorted({hub_id for hub_id in hub_ids if hub_id is not None})
+    for batch in itertools.batched(hub_ids, REFRESH_BATCH_SIZE):
+        CurrentSatellite.objects.filter(
+            satellite_table=satellite_table, hub_id__in=batch
+        ).delete()
+        versions = satellite_class.objects.filter(
+            hub_entity_id__in=batch, state_date_end__gt=now
+        ).values_list("hub_entity_id", "pk", "state_date_start", "state_date_end")
+        CurrentSatellite.objects.bulk_create(
+            CurrentSatellite(
+                satellite_table=satellite_table,
+                hub_id=hub_id,
+                satellite_id=satellite_id,
+                state_date_start=state_date_start,
+                state_date_end=state_date_end,
+            )
+            for hub_id, satellite_id, state_date_start, state_date_end in versions
+        )
+
+
+def rebuild_current_satellites(satellite_class: type[MontrekSatelliteBaseABC]):
+    """Refresh the current satellites of all hubs of the satellite class."""
+    CurrentSatellite.objects.filter(
+        satellite_table=satellite_class._meta.db_table
+    ).delete()
+    hub_ids = satellite_class.objects.values_list("hub_entity_id", flat=True)
+    refresh_current_satellites(satellite_class, hub_ids.distinct())
@@ -15,6 +15,12 @@ from baseclasses.models import (
 from baseclasses.repositories.db.db_creator_cache import DbCreatorCache
 from baseclasses.repositories.db.db_staller import DbStaller
 from baseclasses.repositories.db.satellite_creator import SatelliteCreator
+from baseclasses.repositories.db.satellite_differ import (
+    HUB_VALUE_DATE_ID_COLUMN,
+    SatelliteDiff,
+    SatelliteDiffer,
+    SatelliteState,
+)
 from baseclasses.repositories.db.typing import DataDict, SatelliteDict
 from django.db.models import JSONField, Q, QuerySet
 from django.utils import timezone
@@ -47,25 +53,54 @@ class DbCreator:
         self.satellite_creator = SatelliteCreator()
         self.cache: DbCreatorCache | None = None
         self._hub_fields_cache: dict[type, set[str]] = {}
+        # Decisions of DbBatchCreator for whole batches; row is the position
+        # of the current data in them
+        self.satellite_diffs: dict[type[MontrekSatelliteABC], SatelliteDiff] = {}
+        self.row = 0
 
     def create(self, data: DataDict):
+        self.prepare_data(data)
+        self.create_hub()
+        self.create_dependents()
+
+    def prepare_data(self, data: DataDict):
         self.data = data
         self._enrich_data()
+
+    def create_hub(self):
+        """Resolve hub, static satellites and hub value date of the data."""
         self._get_hub_from_data()
         self._create_static_satellites()
         self._stall_hub()
         self._set_static_satellites_hub()
         self._set_value_date_list()
         self._stall_hub_value_date()
+
+    def create_dependents(self):
+        """Create time series satellites and links of the resolved hub."""
         self._create_ts_satellites()
         self._create_links()
 
+    def resume(
+        self,
+        data: DataDict,
+        hub: MontrekHubABC,
+        hub_value_date: HubValueDate,
+    ):
+        """Continue with data whose hub was resolved by an earlier create_hub."""
+        self.data = data
+        self.hub = hub
+        self.hub_value_date = hub_value_date
+
     def _enrich_data(self):
         self.data["created_by_id"] = self.user_id
         self._upfront_formats()
 
     def _create_static_satellites(self):
         for sat_class in self.db_staller.get_static_satellite_classes():
+            if sat_class in self.satellite_diffs:
+                self._create_satellite_from_diff(sat_class)
+                continue
             existing_sat = self._get_previous_static_satellite(sat_class)
             sat = self.satellite_creator.create_static_satellite(
                 sat_class,
@@ -81,6 +116,9 @@ class DbCreator:
 
     def _create_ts_satellites(self):
         for sat_class in self.db_staller.get_ts_satellite_classes():
+            if sat_class in self.satellite_diffs:
+                self._create_satellite_from_diff(sat_class)
+                continue
             existing_sat = self._get_previous_ts_satellite(sat_class)
             sat = self.satellite_creator.create_ts_satellite(
                 sat_class,
@@ -94,6 +132,42 @@ class DbCreator:
                 continue
             self._process_ts_satellite(sat)
 
+    def _create_satellite_from_diff(self, sat_class: type[MontrekSatelliteABC]):
+        diff = self.satellite_diffs[sat_class]
+        state = diff.states[self.row]
+        if state == SatelliteState.EMPTY:
+            return
+        existing_sat = diff.existing_satellites[self.row]
+        if state == SatelliteState.UNCHANGED:
+            self._set_hub_from_existing_satellite(existing_sat)
+            self.existing_satellites[sat_class] = existing_sat
+            return
+        if sat_class.is_timeseries:
+            sat = self.satellite_creator.create_ts_satellite(
+                sat_class,
+                self.data,
+                self.creation_date,
+                self.hub_value_date,
+                existing_sat=self._get_previous_ts_satellite(sat_class),
+                strict_none_semantics=self.strict_none_semantics,
+            )
+        else:
+            sat = self.satellite_creator.create_static_satellite(
+                sat_class,
+                self.data,
+                self.creation_date,
+                self.hub,
+                existing_sat=self._get_previous_static_satellite(sat_class),
+                strict_none_semantics=self.strict_none_semantics,
+            )
+        if state == SatelliteState.UPDATED:
+            self._set_hub_from_existing_satellite(existing_sat)
+            self._renew_satellite(sat, existing_sat)
+            return
+        self._stall_new_satellite(sat)
+        if not sat_class.is_timeseries:
+            self._close_existing_sat_if_hub_is_forced(sat)
+
     def _get_previous_static_satellite(
         self, sat_class: type[MontrekSatelliteABC]
     ) -> MontrekSatelliteABC | None:
@@ -277,14 +351,22 @@ class DbCreator:
     def _updated_satellite(
         self, sat: MontrekSatelliteABC, existing_sat: MontrekSatelliteABC
     ):
+        self._set_hub_from_existing_satellite(existing_sat)
+        if existing_sat.hash_value == sat.get_hash_value:
+            self.existing_satellites[existing_sat.__class__] = existing_sat
+            return
+        self._renew_satellite(sat, existing_sat)
+
+    def _set_hub_from_existing_satellite(self, existing_sat: MontrekSatelliteABC):
         if existing_sat.is_timeseries:
             self.hub = existing_sat.hub_value_date.hub
         else:
             self.hub = existing_sat.hub_entity
         self._raise_error_if_existing_hub_does_not_match(existing_sat)
-        if existing_sat.hash_value == sat.get_hash_value:
-            self.existing_satellites[existing_sat.__class__] = existing_sat
-            return
+
+    def _renew_satellite(
+        self, sat: MontrekSatelliteABC, existing_sat: MontrekSatelliteABC
+    ):
         existing_sat.state_date_end = self.creation_date
         sat.state_date_start = self.creation_date
         self._stall_new_satellite(sat)
@@ -478,6 +560,10 @@ class DbCreator:
 
 
 class DbBatchCreator:
+    # Rows that are diffed together before the stalled objects are moved into
+    # column-wise storage
+    chunk_size: int = 1_000
+
     def __init__(self, db_creator: DbCreator, df: pd.DataFrame):
         self.db_creator = db_creator
         self.data_collection: list[DataDict] = []
@@ -503,10 +589,80 @@ class DbBatchCreator:
         self.cache_data()
 
         logger.debug("Stall data in DbStaller")
-        for data in self.data_collection:
-            self.db_creator.create(data)
-            self.hubs.append(self.db_creator.hub)
-            self.db_creator.clean()
+        differs = self._get_satellite_differs()
+        for start in range(0, len(self.data_collection), self.chunk_size):
+            chunk = self.data_collection[start : start + self.chunk_size]
+            self._create_chunk(chunk, differs)
+            self.db_creator.db_staller.compact()
+
+    def _create_chunk(
+        self,
+        chunk: list[DataDict],
+        differs: dict[type[MontrekSatelliteABC], SatelliteDiffer],
+    ):
+        db_creator = self.db_creator
+        for data in chunk:
+            db_creator.prepare_data(data)
+        data_frame = pd.DataFrame(
+            {key: [data[key] for data in chunk] for key in chunk[0]}, dtype=object
+        )
+
+        # Static satellites decide on the hub, time series satellites need it
+        db_creator.satellite_diffs = self._diff_satellites(
+            differs, data_frame, is_timeseries=False
+        )
+        resolved = []
+        for row, data in enumerate(chunk):
+            db_creator.row = row
+            db_creator.data = data
+            db_creator.create_hub()
+            resolved.append((db_creator.hub, db_creator.hub_value_date))
+            db_creator.clean()
+
+        data_frame[HUB_VALUE_DATE_ID_COLUMN] = [
+            hub_value_date.pk for _, hub_value_date in resolved
+        ]
+        db_creator.satellite_diffs = self._diff_satellites(
+            differs, data_frame, is_timeseries=True
+        )
+        for row, (data, (hub, hub_value_date)) in enumerate(
+            zip(chunk, resolved, strict=True)
+        ):
+            db_creator.row = row
+            db_creator.resume(data, hub, hub_value_date)
+            db_creator.create_dependents()
+            self.hubs.append(db_creator.hub)
+            db_creator.clean()
+        db_creator.satellite_diffs = {}
+
+    def _get_satellite_differs(
+        self,
+    ) -> dict[type[MontrekSatelliteABC], SatelliteDiffer]:
+        if self.db_creator.strict_none_semantics or self.db_creator.cache is None:
+            return {}
+        db_staller = self.db_creator.db_staller
+        columns = set(self.columns)
+        differs = {}
+        for sat_class in (
+            db_staller.get_static_satellite_classes()
+            + db_staller.get_ts_satellite_classes()
+        ):
+            differ = SatelliteDiffer(sat_class, self.db_creator.cache)
+            if differ.can_diff(columns):
+                differs[sat_class] = differ
+        return differs
+
+    def _diff_satellites(
+        self,
+        differs: dict[type[MontrekSatelliteABC], SatelliteDiffer],
+        data_frame: pd.DataFrame,
+        is_timeseries: bool,
+    ) -> dict[type[MontrekSatelliteABC], SatelliteDiff]:
+        return {
+            sat_class: differ.diff(data_frame)
+            for sat_class, differ in differs.items()
+            if sat_class.is_timeseries == is_timeseries
+        }
 
     def cache_data(self) -> None:
         cache = DbCreatorCache(self.db_creator.db_staller)
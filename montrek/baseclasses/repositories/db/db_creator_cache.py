@@ -6,9 +6,11 @@ from enum import Enum
 from typing import cast
 from collections.abc import Iterable
 
+import pandas as pd
 from baseclasses.models import MontrekLinkABC, MontrekSatelliteABC, ValueDateList
 from baseclasses.repositories.db.db_staller import DbStallerProtocol
 from baseclasses.repositories.db.satellite_creator import SatelliteCreator
+from baseclasses.repositories.db.satellite_hasher import SatelliteHasher
 from baseclasses.repositories.db.typing import (
     DataDict,
     HashSatMap,
@@ -20,7 +22,7 @@ from baseclasses.repositories.db.typing import (
     TValueDateCacheType,
 )
 from baseclasses.typing import HubValueDateProtocol, MontrekHubProtocol
-from baseclasses.utils import datetime_to_montrek_time, to_date
+from baseclasses.utils import to_date
 from django.db.models import ManyToManyField, Q
 from django.utils import timezone
 
@@ -229,18 +231,18 @@ class DbCreatorCache:
         sat_hashes: SatHashesDict = {}
 
         # Static satellites: hash from identifier fields in each row
+        data = list(data)
         for sat_class in self.db_staller.get_static_satellite_classes():
-            hashes: list[str] = []
-            for data_item in data:
-                identifier_parts: list[str] = []
-                for id_field in sat_class.identifier_fields:
-                    value = data_item.get(id_field, "")
-                    if isinstance(value, datetime.datetime):
-                        value = datetime_to_montrek_time(value)
-                    identifier_parts.append(str(value))
-                identifier_string = "".join(identifier_parts)
-                hashes.append(sat_class.convert_string_to_hash(identifier_string))
-            sat_hashes[sat_class] = hashes
+            identifier_frame = pd.DataFrame(
+                {
+                    id_field: [data_item.get(id_field, "") for data_item in data]
+                    for id_field in sat_class.identifier_fields
+                },
+                index=pd.RangeIndex(len(data)),
+                dtype=object,
+            )
+            hasher = SatelliteHasher(sat_class)
+            sat_hashes[sat_class] = hasher.hash_identifiers(identifier_frame).tolist()
 
         # Timeseries satellites: hash from hub_value_date.id
         for sat_class in self.db_staller.get_ts_satellite_classes():
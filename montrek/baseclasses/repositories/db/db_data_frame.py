@@ -10,13 +10,18 @@ HubsList = list[MontrekHubABC]
 
 
 class DbDataFrame:
-    def __init__(self, annotator: Annotator, user_id: int):
+    def __init__(
+        self,
+        annotator: Annotator,
+        user_id: int,
+        db_writer_class: type[DbWriter] = DbWriter,
+    ):
         self.annotator = annotator
         self.user_id = user_id
         self.hubs: HubsList = []
         self.data_frame: pd.DataFrame = pd.DataFrame()
         self.db_staller = DbStaller(self.annotator)
-        self.db_writer = DbWriter(self.db_staller)
+        self.db_writer = db_writer_class(self.db_staller)
         self.messages = []
         self.link_columns = []
 
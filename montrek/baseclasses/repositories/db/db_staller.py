@@ -7,6 +7,7 @@ from baseclasses.models import (
     MontrekSatelliteABC,
 )
 from baseclasses.repositories.annotator import Annotator
+from baseclasses.repositories.db.staged_rows import HubPool, SlotPool, StagedRows
 from baseclasses.typing import HubValueDateProtocol, MontrekHubProtocol
 from django.utils import timezone
 
@@ -22,6 +23,7 @@ StalledObject = MontrekSatelliteABC | MontrekHubABC | HubValueDate | MontrekLink
 StalledDicts = (
     StalledSatelliteDict | StalledHubDict | StalledHubValueDateDict | StalledLinksDict
 )
+StagedRowsDict = dict[type[StalledObject], StagedRows]
 
 
 class DbStallerProtocol(Protocol):
@@ -53,6 +55,11 @@ class DbStaller:
             link_class: [] for link_class in annotator.annotated_link_classes
         }
         self.creation_date = timezone.now()
+        # New hubs addressed by slot from the staged rows below
+        self.hub_pool = HubPool()
+        self.staged_hub_value_dates: StagedRowsDict = {}
+        self.staged_satellites: StagedRowsDict = {}
+        self.staged_links: StagedRowsDict = {}
 
     def __repr__(self):
         return f"""new satellites:\t{self.new_satellites}\n
@@ -64,6 +71,7 @@ class DbStaller:
 
     def stall_hub(self, new_hub: MontrekHubABC):
         self._add_stalled_object(new_hub, self.hubs)
+        self.hub_pool.add(new_hub)
 
     def stall_updated_hub(self, new_hub: MontrekHubABC):
         self._add_stalled_object(new_hub, self.updated_hubs)
@@ -106,6 +114,55 @@ class DbStaller:
     def get_updated_links(self) -> StalledLinksDict:
         return self.updated_links
 
+    def get_staged_hub_value_dates(self) -> StagedRowsDict:
+        return self.staged_hub_value_dates
+
+    def get_staged_satellites(self) -> StagedRowsDict:
+        return self.staged_satellites
+
+    def get_staged_links(self) -> StagedRowsDict:
+        return self.staged_links
+
+    def get_new_satellite_ids(self) -> dict[type[MontrekSatelliteABC], list[int]]:
+        satellite_ids = {
+            sat_class: [sat.pk for sat in sats]
+            for sat_class, sats in self.new_satellites.items()
+        }
+        for sat_class, staged_rows in self.staged_satellites.items():
+            satellite_ids.setdefault(sat_class, []).extend(staged_rows.pks)
+        return satellite_ids
+
+    def compact(self):
+        """
+        Move the stalled new hub value dates, satellites and links into
+        column-wise StagedRows, so they no longer need a model instance each.
+
+        Objects that cannot be written from their columns alone, e.g. because
+        they refer to an unsaved object outside of this staller, are kept as
+        model instances.
+        """
+        staged_slots: dict[int, tuple[SlotPool, int]] = {}
+        for stalled_dict, staged_dict in (
+            (self.hub_value_dates, self.staged_hub_value_dates),
+            (self.new_satellites, self.staged_satellites),
+            (self.links, self.staged_links),
+        ):
+            for object_type, objs in stalled_dict.items():
+                if not objs:
+                    continue
+                if object_type not in staged_dict:
+                    staged_dict[object_type] = StagedRows(object_type)
+                staged_rows = staged_dict[object_type]
+                kept_objs = []
+                for obj in objs:
+                    references = self._get_references(obj, staged_slots)
+                    if references is None:
+                        kept_objs.append(obj)
+                        continue
+                    staged_slots[id(obj)] = (staged_rows, len(staged_rows))
+                    staged_rows.append(obj, references)
+                objs[:] = kept_objs
+
     def get_static_satellite_classes(self) -> list[type[MontrekSatelliteABC]]:
         static_hub_classes = [
             sat_class
@@ -133,6 +190,28 @@ class DbStaller:
         self.hubs: StalledHubDict = {self.hub_class: []}
         self.updated_hubs: StalledHubDict = {self.hub_class: []}
 
+    def _get_references(
+        self, obj: StalledObject, staged_slots: dict[int, tuple[SlotPool, int]]
+    ) -> dict[str, tuple[SlotPool, int]] | None:
+        # Objects loaded from the database may be referenced elsewhere as well
+        if not obj._state.adding or obj.pk is not None:
+            return None
+        references = {}
+        for field in obj._meta.concrete_fields:
+            if not field.is_relation or not field.is_cached(obj):
+                continue
+            related = getattr(obj, field.name)
+            if related is None or related.pk is not None:
+                continue
+            hub_slot = self.hub_pool.get_slot(related)
+            if hub_slot is not None:
+                references[field.attname] = (self.hub_pool, hub_slot)
+            elif id(related) in staged_slots:
+                references[field.attname] = staged_slots[id(related)]
+            else:
+                return None
+        return references
+
     def _add_stalled_object(
         self, new_object: StalledObject, stalled_list: StalledDicts
     ):
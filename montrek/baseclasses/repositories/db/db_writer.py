@@ -1,11 +1,33 @@
+import csv
+import io
+from collections import defaultdict
+
+from baseclasses.models import MontrekSatelliteBaseABC
+from baseclasses.repositories.db.current_satellites import (
+    keeps_current_state,
+    refresh_current_satellites,
+)
 from baseclasses.repositories.db.db_staller import (
     DbStaller,
+    StagedRowsDict,
     StalledDicts,
+    StalledObject,
+)
+from baseclasses.repositories.db.latest_hub_value_dates import (
+    keeps_latest_value_date,
+    refresh_latest_hub_value_dates,
 )
-from django.db import transaction
+from baseclasses.repositories.db.satellite_hasher import SatelliteHasher
+from baseclasses.repositories.query_result_cache import bump_data_versions
+from django.db import connections, router, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Model
 
 
 class DbWriter:
+    # Number of staged rows turned into model instances at a time
+    write_batch_size: int = 10_000
+
     def __init__(self, db_staller: DbStaller):
         self.db_staller = db_staller
 
@@ -18,6 +40,8 @@ class DbWriter:
         self.write_updated_satellites()
         self.write_links()
         self.write_updated_links()
+        self.write_current_satellites()
+        self.invalidate_query_results()
 
     def write_hubs(self):
         new_hubs = self.db_staller.get_hubs()
@@ -31,6 +55,7 @@ class DbWriter:
         new_satellites = self.db_staller.get_new_satellites()
         self._set_sat_hashes(new_satellites)
         self._bulk_create(new_satellites)
+        self._write_staged_rows(self.db_staller.get_staged_satellites())
 
     def write_updated_satellites(self):
         updated_satellites = self.db_staller.get_updated_satellites()
@@ -39,20 +64,74 @@ class DbWriter:
     def write_hub_value_dates(self):
         new_hub_value_dates = self.db_staller.get_hub_value_dates()
         self._bulk_create(new_hub_value_dates)
+        staged_hub_value_dates = self.db_staller.get_staged_hub_value_dates()
+        self._write_staged_rows(staged_hub_value_dates)
+        hub_ids = defaultdict(list)
+        for hub_value_date_class, hub_value_dates in new_hub_value_dates.items():
+            if keeps_latest_value_date(hub_value_date_class):
+                hub_ids[hub_value_date_class].extend(
+                    hub_value_date.hub_id for hub_value_date in hub_value_dates
+                )
+        for hub_value_date_class, staged_rows in staged_hub_value_dates.items():
+            if keeps_latest_value_date(hub_value_date_class):
+                hub_ids[hub_value_date_class].extend(staged_rows.get_column("hub_id"))
+        for hub_value_date_class, class_hub_ids in hub_ids.items():
+            refresh_latest_hub_value_dates(hub_value_date_class, class_hub_ids)
 
     def write_links(self):
         links = self.db_staller.get_links()
         self._bulk_create(links)
+        self._write_staged_rows(self.db_staller.get_staged_links())
 
     def write_updated_links(self):
         updated_links = self.db_staller.get_updated_links()
         self._bulk_update(updated_links)
 
+    def write_current_satellites(self):
+        hub_ids = defaultdict(list)
+        for satellites in (
+            self.db_staller.get_new_satellites(),
+            self.db_staller.get_updated_satellites(),
+        ):
+            for sat_class, sats in satellites.items():
+                if keeps_current_state(sat_class):
+                    hub_ids[sat_class].extend(sat.hub_entity_id for sat in sats)
+        for sat_class, staged_rows in self.db_staller.get_staged_satellites().items():
+            if keeps_current_state(sat_class):
+                hub_ids[sat_class].extend(staged_rows.get_column("hub_entity_id"))
+        for sat_class, sat_hub_ids in hub_ids.items():
+            refresh_current_satellites(sat_class, sat_hub_ids)
+
+    def invalidate_query_results(self):
+        hub_classes = [self.db_staller.hub_class]
+        for links in (
+            self.db_staller.get_links(),
+            self.db_staller.get_updated_links(),
+            self.db_staller.get_staged_links(),
+        ):
+            for link_class in links:
+                hub_classes.append(link_class.get_related_hub_class("hub_in"))
+                hub_classes.append(link_class.get_related_hub_class("hub_out"))
+        bump_data_versions(hub_classes)
+        # Other connections may cache results read before the commit
+        transaction.on_commit(lambda: bump_data_versions(hub_classes))
+
     def _bulk_create(self, new_objects: StalledDicts):
         for obj_type, objs in new_objects.items():
             unsaved_objects = [obj for obj in objs if obj.pk is None]
             obj_type.objects.bulk_create(unsaved_objects)
 
+    def _write_staged_rows(self, staged_rows_dict: StagedRowsDict):
+        for obj_type, staged_rows in staged_rows_dict.items():
+            for start in range(0, len(staged_rows), self.write_batch_size):
+                stop = min(start + self.write_batch_size, len(staged_rows))
+                objs = staged_rows.materialise(start, stop)
+                if issubclass(obj_type, MontrekSatelliteBaseABC):
+                    # Relations are resolved already, so hash without _set_sat_hashes
+                    SatelliteHasher(obj_type).hash_satellites(objs)
+                self._bulk_create({obj_type: objs})
+                staged_rows.set_pks(start, [obj.pk for obj in objs])
+
     def _bulk_update(self, new_objects: StalledDicts):
         for obj_type, objs in new_objects.items():
             obj_type.objects.bulk_update(
@@ -70,5 +149,84 @@ class DbWriter:
                     sat.hub_value_date_id = sat.hub_value_date.id
                 else:
                     sat.hub_entity_id = sat.hub_entity.id
-                sat.get_hash_identifier
-                sat.get_hash_value
+            if sats:
+                SatelliteHasher(sat_class).hash_satellites(sats)
+
+
+class CopyDbWriter(DbWriter):
+    """
+    DbWriter that streams new objects into PostgreSQL with COPY FROM STDIN.
+
+    Primary keys are reserved from the table's sequence before copying, so the
+    dependent stages (hubs -> hub value dates -> satellites -> links) can
+    reference the new rows. Other database backends fall back to bulk_create.
+    """
+
+    def _bulk_create(self, new_objects: StalledDicts):
+        for obj_type, objs in new_objects.items():
+            unsaved_objects = [obj for obj in objs if obj.pk is None]
+            if not unsaved_objects:
+                continue
+            connection = connections[router.db_for_write(obj_type)]
+            if not self._can_copy(obj_type, connection):
+                obj_type.objects.bulk_create(unsaved_objects)
+                continue
+            self._copy_objects(obj_type, unsaved_objects, connection)
+
+    def _can_copy(self, obj_type: type[Model], connection: BaseDatabaseWrapper) -> bool:
+        opts = obj_type._meta
+        return (
+            connection.vendor == "postgresql"
+            and opts.auto_field is not None
+            and opts.pk == opts.auto_field
+            and not opts.parents
+        )
+
+    def _copy_objects(
+        self,
+        obj_type: type[Model],
+        objs: list[StalledObject],
+        connection: BaseDatabaseWrapper,
+    ):
+        opts = obj_type._meta
+        fields = [field for field in opts.concrete_fields if not field.generated]
+        quote_name = connection.ops.quote_name
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            for obj, pk in zip(
+                objs, self._reserve_pks(obj_type, len(objs), cursor), strict=True
+            ):
+                obj._prepare_related_fields_for_save(operation_name="bulk_create")
+                obj.pk = pk
+            buffer = io.StringIO()
+            # None is written unquoted, which COPY reads as NULL
+            writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+            for obj in objs:
+                writer.writerow(
+                    [self._get_copy_value(obj, field, connection) for field in fields]
+                )
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {quote_name(opts.db_table)} ({columns}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = connection.alias
+
+    def _reserve_pks(self, obj_type: type[Model], count: int, cursor) -> list[int]:
+        opts = obj_type._meta
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+            "FROM generate_series(1, %s)",
+            [opts.db_table, opts.pk.column, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def _get_copy_value(self, obj: Model, field, connection: BaseDatabaseWrapper):
+        value = field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+        # JSON values come back wrapped in a psycopg adapter
+        if hasattr(value, "adapted") and hasattr(value, "dumps"):
+            return value.dumps(value.adapted)
+        return value
@@ -0,0 +1,68 @@
+import itertools
+from collections.abc import Iterable
+
+from baseclasses.models import HubValueDate, LatestHubValueDate
+from django.db.models import Exists, F, OuterRef, Subquery
+
+# Hubs refreshed per query, below the parameter limit of every database
+REFRESH_BATCH_SIZE = 500
+
+
+def keeps_latest_value_date(hub_value_date_class: type[HubValueDate]) -> bool:
+    return hub_value_date_class.keep_latest_value_date
+
+
+def latest_hub_value_date_exists(hub_value_date_class: type[HubValueDate]) -> Exists:
+    """Semi-join of the outer hub value date onto its LatestHubValueDate row."""
+    return Exists(
+        LatestHubValueDate.objects.filter(
+            hub_value_date_table=hub_value_date_class._meta.db_table,
+            hub_value_date_id=OuterRef("id"),
+        )
+    )
+
+
+def refresh_latest_hub_value_dates(
+    hub_value_date_class: type[HubValueDate], hub_ids: Iterable[int | None]
+):
+    """
+    Point each of the hubs to its hub value date with the latest value date,
+    or to the one without value date if the hub has no other.
+    """
+    if not keeps_latest_value_date(hub_value_date_class):
+        return
+    hub_value_date_table = hub_value_date_class._meta.db_table
+    hub_class = hub_value_date_class._meta.get_field("hub").related_model
+    latest_hub_value_date = (
+        hub_value_date_class.objects.filter(hub_id=OuterRef("pk"))
+        .order_by(F("value_date_list__value_date").desc(nulls_last=True))
+        .values("pk")[:1]
+    )
+    hub_ids = sorted({hub_id for hub_id in hub_ids if hub_id is not None})
+    for batch in itertools.batched(hub_ids, REFRESH_BATCH_SIZE):
+        LatestHubValueDate.objects.filter(
+            hub_value_date_table=hub_value_date_table, hub_id__in=batch
+        ).delete()
+        pointers = (
+            hub_class.objects.filter(pk__in=batch)
+            .annotate(latest_hub_value_date_id=Subquery(latest_hub_value_date))
+            .exclude(latest_hub_value_date_id=None)
+            .values_list("pk", "latest_hub_value_date_id")
+        )
+        LatestHubValueDate.objects.bulk_create(
+            LatestHubValueDate(
+                hub_value_date_table=hub_value_date_table,
+                hub_id=hub_id,
+                hub_value_date_id=hub_value_date_id,
+            )
+            for hub_id, hub_value_date_id in pointers
+        )
+
+
+def rebuild_latest_hub_value_dates(hub_value_date_class: type[HubValueDate]):
+    """Refresh the latest hub value dates of all hubs of the class."""
+    LatestHubValueDate.objects.filter(
+        hub_value_date_table=hub_value_date_class._meta.db_table
+    ).delete()
+    hub_ids = hub_value_date_class.objects.values_list("hub_id", flat=True)
+    refresh_latest_hub_value_dates(hub_value_date_class, hub_ids.distinct())
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from enum import IntEnum
+
+import numpy as np
+import pandas as pd
+from baseclasses.models import MontrekSatelliteABC
+from baseclasses.repositories.db.db_creator_cache import DbCreatorCache
+from baseclasses.repositories.db.satellite_hasher import SatelliteHasher
+
+HUB_VALUE_DATE_ID_COLUMN = "hub_value_date_id"
+
+
+class SatelliteState(IntEnum):
+    EMPTY = 0
+    NEW = 1
+    UNCHANGED = 2
+    UPDATED = 3
+
+
+@dataclass
+class SatelliteDiff:
+    states: np.ndarray
+    existing_satellites: list[MontrekSatelliteABC | None]
+
+
+class SatelliteDiffer:
+    """
+    Decide for a whole batch of rows whether a satellite is new, updated or
+    unchanged.
+
+    The incoming rows are joined to the cached existing satellites on
+    hash_identifier and their hash_value is compared column-wise. Rows whose
+    hashes depend on the hub resolved per row, or on fields carried over from
+    a previous satellite, cannot be diffed upfront; see can_diff.
+    """
+
+    def __init__(self, sat_class: type[MontrekSatelliteABC], cache: DbCreatorCache):
+        self.sat_class = sat_class
+        self.hasher = SatelliteHasher(sat_class)
+        existing_satellites = [
+            sat
+            for (cached_class, _), sat in cache.cached_satellites.items()
+            if cached_class is sat_class
+        ]
+        self.existing_satellites = pd.DataFrame(
+            {
+                "hash_value": [sat.hash_value for sat in existing_satellites],
+                "satellite": existing_satellites,
+            },
+            index=pd.Index([sat.hash_identifier for sat in existing_satellites]),
+            dtype=object,
+        )
+
+    def can_diff(self, columns: set[str]) -> bool:
+        identifier_fields = self.sat_class.identifier_fields
+        if "hub_entity_id" in identifier_fields:
+            return False
+        if self.sat_class.is_timeseries:
+            columns = columns | {HUB_VALUE_DATE_ID_COLUMN}
+        exclude_fields = self.sat_class.exclude_from_hash_value()
+        hashed_fields = list(identifier_fields) + [
+            field
+            for field in self.sat_class.get_value_field_names()
+            if field not in exclude_fields
+        ]
+        return set(hashed_fields).issubset(columns)
+
+    def diff(self, data_frame: pd.DataFrame) -> SatelliteDiff:
+        hash_identifiers = self.hasher.hash_identifiers(data_frame).to_numpy()
+        hash_values = self.hasher.hash_values(data_frame).to_numpy()
+        existing = self.existing_satellites.reindex(hash_identifiers)
+        is_new = existing["satellite"].isna().to_numpy()
+        is_unchanged = existing["hash_value"].to_numpy() == hash_values
+        states = np.select(
+            [self._is_empty(data_frame), is_new, is_unchanged],
+            [SatelliteState.EMPTY, SatelliteState.NEW, SatelliteState.UNCHANGED],
+            default=SatelliteState.UPDATED,
+        )
+        existing_satellites = [
+            None if new else sat
+            for new, sat in zip(is_new, existing["satellite"], strict=True)
+        ]
+        return SatelliteDiff(states=states, existing_satellites=existing_satellites)
+
+    def _is_empty(self, data_frame: pd.DataFrame) -> np.ndarray:
+        # Same fields as SatelliteCreator.is_sat_data_empty
+        columns = [
+            field
+            for field in self.sat_class.get_value_field_names()
+            if field in data_frame.columns and field not in ("comment", "value_date")
+        ]
+        return data_frame[columns].isna().all(axis=1).to_numpy()
@@ -0,0 +1,92 @@
+import datetime
+from collections.abc import Sequence
+
+import pandas as pd
+from baseclasses.models import MontrekSatelliteBaseABC
+from baseclasses.utils import datetime_to_montrek_time
+
+# Inferred dtypes of object columns that may hold datetime values
+DATETIME_INFERRED_TYPES = {"datetime", "datetime64", "date", "mixed", "mixed-integer"}
+
+
+class SatelliteHasher:
+    """
+    Compute satellite hashes for many rows at once.
+
+    The hashes are identical to MontrekSatelliteBaseABC._get_hash_identifier and
+    _get_hash_value, but the hashed strings are built column by column instead of
+    field by field on every satellite instance.
+    """
+
+    def __init__(self, sat_class: type[MontrekSatelliteBaseABC]):
+        self.sat_class = sat_class
+
+    def hash_identifiers(self, data_frame: pd.DataFrame) -> pd.Series:
+        return self._hash_fields(data_frame, self.sat_class.identifier_fields)
+
+    def hash_values(self, data_frame: pd.DataFrame) -> pd.Series:
+        exclude_fields = self.sat_class.exclude_from_hash_value()
+        value_fields = [
+            field
+            for field in self.sat_class.get_value_field_names()
+            if field not in exclude_fields
+        ]
+        return self._hash_fields(data_frame, value_fields)
+
+    def hash_satellites(self, satellites: Sequence[MontrekSatelliteBaseABC]):
+        """Set hash_identifier and hash_value on all satellites of sat_class."""
+        if len(self.sat_class.identifier_fields) == 0:
+            raise AttributeError(
+                f"Satellite {self.sat_class.__name__} must have property identifier_fields"
+            )
+        fields = dict.fromkeys(
+            self.sat_class.identifier_fields + self.sat_class.get_value_field_names()
+        )
+        data_frame = pd.DataFrame(
+            {
+                field: [getattr(satellite, field) for satellite in satellites]
+                for field in fields
+            },
+            dtype=object,
+        )
+        hash_identifiers = self.hash_identifiers(data_frame)
+        hash_values = self.hash_values(data_frame)
+        for satellite, hash_identifier, hash_value in zip(
+            satellites, hash_identifiers, hash_values, strict=True
+        ):
+            satellite.hash_identifier = hash_identifier
+            satellite.hash_value = hash_value
+
+    def _hash_fields(self, data_frame: pd.DataFrame, fields: list[str]) -> pd.Series:
+        # Fields missing in the data frame contribute an empty string
+        strings = pd.Series("", index=data_frame.index, dtype=object)
+        for field in fields:
+            if field in data_frame.columns:
+                strings = strings + self._to_strings(data_frame[field])
+        convert_string_to_hash = self.sat_class.convert_string_to_hash
+        return pd.Series(
+            [convert_string_to_hash(string) for string in strings],
+            index=data_frame.index,
+            dtype=object,
+        )
+
+    @staticmethod
+    def _to_strings(column: pd.Series) -> pd.Series:
+        values = column.astype(object)
+        if column.dtype != object:
+            values = values.where(column.notna(), None)
+        inferred_type = pd.api.types.infer_dtype(values, skipna=True)
+        if inferred_type in DATETIME_INFERRED_TYPES:
+            values = pd.Series(
+                [
+                    (
+                        datetime_to_montrek_time(value)
+                        if isinstance(value, datetime.datetime)
+                        else value
+                    )
+                    for value in values
+                ],
+                index=values.index,
+                dtype=object,
+            )
+        return values.astype(str)
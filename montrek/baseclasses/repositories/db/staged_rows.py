@@ -0,0 +1,109 @@
+from typing import Protocol
+
+from django.db.models import Field, Model
+
+
+class SlotPool(Protocol):
+    def get_pk(self, slot: int) -> int | None: ...
+
+
+class HubPool:
+    """New hubs of a DbStaller, addressed by integer slots."""
+
+    def __init__(self):
+        self.hubs: list[Model] = []
+        self._slots: dict[int, int] = {}
+
+    def add(self, hub: Model) -> int:
+        # Hubs stay referenced by the pool, so their id() cannot be reused
+        slot = self._slots.get(id(hub))
+        if slot is None:
+            slot = len(self.hubs)
+            self._slots[id(hub)] = slot
+            self.hubs.append(hub)
+        return slot
+
+    def get_slot(self, hub: Model) -> int | None:
+        return self._slots.get(id(hub))
+
+    def get_pk(self, slot: int) -> int | None:
+        return self.hubs[slot].pk
+
+
+class StagedRows:
+    """
+    Column-wise staging of new objects of one model class.
+
+    Field values are kept in one list per column instead of one model instance
+    per row. Relations to objects that are not written yet are kept as integer
+    slots into the pool holding them and resolved when the rows are written.
+    """
+
+    def __init__(self, model_class: type[Model]):
+        self.model_class = model_class
+        self.fields: list[Field] = [
+            field
+            for field in model_class._meta.concrete_fields
+            if not field.primary_key and not field.generated
+        ]
+        self.columns: dict[str, list] = {field.attname: [] for field in self.fields}
+        self.slots: dict[str, list[int | None]] = {}
+        self.pools: dict[str, SlotPool] = {}
+        self.pks: list[int | None] = []
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def append(self, obj: Model, references: dict[str, tuple[SlotPool, int]]):
+        """Stage obj, with unsaved related objects given as (pool, slot) by attname."""
+        row = len(self.pks)
+        for field in self.fields:
+            attname = field.attname
+            if attname in references:
+                pool, slot = references[attname]
+                self._get_slots(attname, pool)[row] = slot
+                self.columns[attname].append(None)
+                continue
+            value = getattr(obj, attname)
+            if field.is_relation and field.is_cached(obj):
+                related = getattr(obj, field.name)
+                value = None if related is None else related.pk
+            self.columns[attname].append(value)
+            if attname in self.slots:
+                self.slots[attname].append(None)
+        self.pks.append(None)
+
+    def get_pk(self, slot: int) -> int | None:
+        return self.pks[slot]
+
+    def set_pks(self, start: int, pks: list[int | None]):
+        self.pks[start : start + len(pks)] = pks
+
+    def get_column(self, attname: str, start: int = 0, stop: int | None = None):
+        """Values of a column with slots resolved to primary keys."""
+        values = self.columns[attname][start:stop]
+        if attname not in self.slots:
+            return values
+        pool = self.pools[attname]
+        return [
+            value if slot is None else pool.get_pk(slot)
+            for value, slot in zip(values, self.slots[attname][start:stop], strict=True)
+        ]
+
+    def materialise(self, start: int, stop: int) -> list[Model]:
+        columns = {
+            field.attname: self.get_column(field.attname, start, stop)
+            for field in self.fields
+        }
+        return [
+            self.model_class(**dict(zip(columns, values, strict=True)))
+            for values in zip(*columns.values(), strict=True)
+        ]
+
+    def _get_slots(self, attname: str, pool: SlotPool) -> list[int | None]:
+        if attname not in self.slots:
+            self.slots[attname] = [None] * (len(self.pks) + 1)
+            self.pools[attname] = pool
+        elif len(self.slots[attname]) == len(self.pks):
+            self.slots[attname].append(None)
+        return self.slots[attname]
@@ -0,0 +1,138 @@
+import importlib
+import pkgutil
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+from baseclasses.models import (
+    POINT_IN_TIME_INDEX_FIELDS,
+    HubValueDate,
+    MontrekLinkABC,
+    MontrekSatelliteABC,
+    MontrekTimeSeriesSatelliteABC,
+)
+from baseclasses.repositories.montrek_repository import MontrekRepository
+from django.apps import apps
+from django.db import connections, models
+from django.utils import timezone
+
+
+@dataclass
+class IndexRecommendation:
+    table: str
+    columns: tuple[str, ...]
+    repositories: list[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f"{self.table}_{self.columns[0]}_pit_idx"[-63:]
+
+    def get_sql(self, using: str = "default") -> str:
+        quote_name = connections[using].ops.quote_name
+        columns = ", ".join(quote_name(column) for column in self.columns)
+        return (
+            f"CREATE INDEX {quote_name(self.name)} "
+            f"ON {quote_name(self.table)} ({columns});"
+        )
+
+
+def get_repository_classes() -> list[type[MontrekRepository]]:
+    """Import the repositories of all apps and return the concrete ones."""
+    for app_config in apps.get_app_configs():
+        try:
+            package = importlib.import_module(f"{app_config.name}.repositories")
+        except ImportError:
+            continue
+        for module_info in pkgutil.walk_packages(
+            getattr(package, "__path__", []), f"{package.__name__}."
+        ):
+            if ".tests" not in module_info.name:
+                importlib.import_module(module_info.name)
+    repository_classes = []
+    subclasses = MontrekRepository.__subclasses__()
+    while subclasses:
+        repository_class = subclasses.pop()
+        subclasses.extend(repository_class.__subclasses__())
+        if not repository_class.hub_class._meta.abstract:
+            repository_classes.append(repository_class)
+    return sorted(
+        set(repository_classes), key=lambda cls: (cls.__module__, cls.__qualname__)
+    )
+
+
+def get_point_in_time_indexes(model: type[models.Model]) -> list[tuple[str, ...]]:
+    """Columns of the indexes serving reads of the model at a reference date."""
+    if issubclass(model, MontrekSatelliteABC):
+        hub_fields = ["hub_entity"]
+    elif issubclass(model, MontrekTimeSeriesSatelliteABC):
+        hub_fields = ["hub_value_date"]
+    elif issubclass(model, MontrekLinkABC):
+        hub_fields = ["hub_in", "hub_out"]
+    elif issubclass(model, HubValueDate):
+        return [
+            (model._meta.get_field(name).column,) for name in ("hub", "value_date_list")
+        ]
+    else:
+        return []
+    return [
+        tuple(
+            model._meta.get_field(name).column
+            for name in POINT_IN_TIME_INDEX_FIELDS[hub_field]
+        )
+        for hub_field in hub_fields
+    ]
+
+
+def get_models_in_sql(sql: str, using: str = "default") -> list[type[models.Model]]:
+    quote_name = connections[using].ops.quote_name
+    return [
+        model for model in apps.get_models() if quote_name(model._meta.db_table) in sql
+    ]
+
+
+def get_existing_indexes(table: str, using: str = "default") -> list[tuple[str, ...]]:
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return [
+        tuple(constraint["columns"])
+        for constraint in constraints.values()
+        if constraint["index"] or constraint["unique"] or constraint["primary_key"]
+    ]
+
+
+def is_covered(columns: tuple[str, ...], indexes: Iterable[tuple[str, ...]]) -> bool:
+    return any(index[: len(columns)] == columns for index in indexes)
+
+
+def get_repository_sql(
+    repository_class: type[MontrekRepository], using: str = "default"
+) -> str:
+    repository = repository_class({})
+    queryset = repository.query_builder.build_queryset(
+        timezone.now(), repository.order_fields(), apply_filter=False
+    )
+    return queryset.query.get_compiler(using=using).as_sql()[0]
+
+
+def recommend_indexes(
+    sql_by_repository: Mapping[str, str], using: str = "default"
+) -> list[IndexRecommendation]:
+    """
+    Return the point-in-time indexes missing on the tables read by the
+    queries of the repositories, see get_repository_sql.
+    """
+    recommendations: dict[tuple[str, tuple[str, ...]], IndexRecommendation] = {}
+    existing_indexes: dict[str, list[tuple[str, ...]]] = {}
+    for repository_name, sql in sql_by_repository.items():
+        for model in get_models_in_sql(sql, using):
+            table = model._meta.db_table
+            if table not in existing_indexes:
+                existing_indexes[table] = get_existing_indexes(table, using)
+            for columns in get_point_in_time_indexes(model):
+                if is_covered(columns, existing_indexes[table]):
+                    continue
+                recommendation = recommendations.setdefault(
+                    (table, columns), IndexRecommendation(table, columns)
+                )
+                recommendation.repositories.append(repository_name)
+    return list(recommendations.values())
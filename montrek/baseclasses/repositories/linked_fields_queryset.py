@@ -0,0 +1,121 @@
+import itertools
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from django.db.models import Model, QuerySet
+from django.db.models.query import ModelIterable
+
+# Rows per query resolving the linked fields, below the parameter limit of
+# every supported database
+LINKED_FIELDS_BATCH_SIZE = 500
+
+
+@dataclass
+class LinkedFieldBatch:
+    """
+    Resolves linked fields for a batch of hubs.
+
+    get_query returns rows holding the id of the hub they belong to as
+    _source_hub_id; columns maps each linked field to its key in the rows.
+    """
+
+    get_query: Callable[[list[int]], Iterable[dict[str, Any]]]
+    columns: dict[str, str]
+
+
+class LinkedFieldsQuerySet(QuerySet):
+    """
+    Queryset whose linked fields are aliases instead of annotations.
+
+    The main query only resolves a linked field if it is filtered or ordered
+    by. The linked fields of the fetched rows are resolved by their
+    LinkedFieldBatch, one flat query over the link and satellite tables per
+    batch of hubs, and set on them; values() and values_list() select them
+    inline again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.linked_fields: list[str] = []
+        self.linked_field_batches: list[LinkedFieldBatch] = []
+
+    def with_linked_fields(
+        self, linked_fields: dict[str, Any], batch: LinkedFieldBatch
+    ) -> "LinkedFieldsQuerySet":
+        queryset = self.alias(**linked_fields)
+        queryset.linked_fields = self.linked_fields + list(linked_fields)
+        queryset.linked_field_batches = [*self.linked_field_batches, batch]
+        return queryset
+
+    def values(self, *fields: str, **expressions: Any) -> QuerySet:
+        return super(LinkedFieldsQuerySet, self._select_linked_fields(fields)).values(
+            *fields, **expressions
+        )
+
+    def values_list(self, *fields: str, **kwargs: Any) -> QuerySet:
+        return super(
+            LinkedFieldsQuerySet, self._select_linked_fields(fields)
+        ).values_list(*fields, **kwargs)
+
+    def iterator(self, chunk_size: int | None = None) -> Iterator:
+        rows = super().iterator(chunk_size)
+        if not self._resolves_linked_fields():
+            yield from rows
+            return
+        for batch in itertools.batched(rows, chunk_size or LINKED_FIELDS_BATCH_SIZE):
+            self._set_linked_fields(batch)
+            yield from batch
+
+    def _clone(self) -> "LinkedFieldsQuerySet":
+        queryset = super()._clone()
+        queryset.linked_fields = self.linked_fields
+        queryset.linked_field_batches = self.linked_field_batches
+        return queryset
+
+    def _fetch_all(self):
+        fetch = self._result_cache is None
+        super()._fetch_all()
+        if fetch and self._resolves_linked_fields():
+            self._set_linked_fields(self._result_cache)
+
+    def _resolves_linked_fields(self) -> bool:
+        return bool(self.linked_fields) and issubclass(
+            self._iterable_class, ModelIterable
+        )
+
+    def _select_linked_fields(self, fields: Sequence[str]) -> QuerySet:
+        names = [name for name in self.linked_fields if not fields or name in fields]
+        if not names:
+            return self
+        queryset = self._chain()
+        queryset.query.append_annotation_mask(names)
+        queryset.linked_fields = [
+            name for name in self.linked_fields if name not in names
+        ]
+        return queryset
+
+    def _set_linked_fields(self, rows: Sequence[Model]):
+        for batch in itertools.batched(rows, LINKED_FIELDS_BATCH_SIZE):
+            values_by_hub = self._get_linked_values(list({row.hub_id for row in batch}))
+            for row in batch:
+                for name in self.linked_fields:
+                    setattr(row, name, values_by_hub[name].get(row.hub_id))
+
+    def _get_linked_values(self, hub_ids: list[int]) -> dict[str, dict[int, Any]]:
+        values_by_hub: dict[str, dict[int, Any]] = {
+            name: {} for name in self.linked_fields
+        }
+        for linked_field_batch in self.linked_field_batches:
+            columns = {
+                name: column
+                for name, column in linked_field_batch.columns.items()
+                if name in values_by_hub
+            }
+            if not columns:
+                continue
+            for linked_row in linked_field_batch.get_query(hub_ids):
+                hub_id = linked_row["_source_hub_id"]
+                for name, column in columns.items():
+                    values_by_hub[name].setdefault(hub_id, linked_row[column])
+        return values_by_hub
@@ -1,9 +1,10 @@
 import datetime
+import itertools
 import logging
 import warnings
 from dataclasses import dataclass
 from typing import Any, cast
-from collections.abc import Mapping
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
 
 import pandas as pd
 from baseclasses.errors.montrek_user_error import MontrekError
@@ -16,11 +17,18 @@ from baseclasses.models import (
     MontrekTimeSeriesSatelliteABC,
 )
 from baseclasses.repositories.annotator import Annotator
+from baseclasses.repositories.db.current_satellites import (
+    refresh_current_satellites,
+)
 from baseclasses.repositories.db.db_creator import DataDict, DbCreator
 from baseclasses.repositories.db.db_data_frame import DbDataFrame
 from baseclasses.repositories.db.db_staller import DbStaller
 from baseclasses.repositories.db.db_writer import DbWriter
-from baseclasses.repositories.query_builder import QueryBuilder
+from baseclasses.repositories.query_builder import QueryBuilder, estimate_row_count
+from baseclasses.repositories.query_result_cache import (
+    QueryResultCache,
+    bump_data_versions,
+)
 from baseclasses.repositories.subquery_builder import (
     CrossSatelliteFilter,
     LinkedHubIdSubqueryBuilder,
@@ -47,9 +55,16 @@ from django.db.models import F, Q, QuerySet
 from django.db.models.fields.related import ManyToManyRel
 from django.utils import timezone
 from django_pandas.io import read_frame
+from django_pandas.utils import update_with_verbose
 
 logger = logging.getLogger(__name__)
 
+# Rows per chunk when streaming data frames from the database
+DF_CHUNK_SIZE = 10_000
+# Hubs closed per UPDATE by delete_many, below the parameter limit of every
+# database
+DELETE_BATCH_SIZE = 5_000
+
 
 @dataclass
 class TSQueryContainer:
@@ -67,6 +82,26 @@ class MontrekRepository:
     display_field_names: Mapping[str, str] = {}
     field_help_texts: Mapping[str, str] = {}
     consider_session_dates: bool = False
+    # "subquery" resolves every annotated field with its own correlated
+    # subquery; "join" reads all fields of a satellite from one LEFT JOIN.
+    query_engine: str = "subquery"
+    # Resolve linked fields of static satellites for the fetched rows with one
+    # flat query over link and satellite per batch of hubs instead of nesting
+    # their link subqueries into every row of the main query. Ignored for
+    # repositories with a view model.
+    prefetch_linked_fields: bool = False
+    # CopyDbWriter loads new rows with COPY FROM STDIN on PostgreSQL
+    db_writer_class: type[DbWriter] = DbWriter
+    # Seconds for which counts, pages and data frames read from this
+    # repository are cached until one of the hubs they are read from is
+    # written; None disables the cache. Only enable it if the results depend
+    # on nothing but the request path, filter, dates and order fields.
+    result_cache_timeout: int | None = None
+    # Seconds for which row counts are cached, defaults to result_cache_timeout
+    count_cache_timeout: int | None = None
+    # Above this number of rows, receive_count returns the planner's estimate
+    # instead of counting the rows; None always counts them exactly.
+    count_estimate_threshold: int | None = None
 
     update: bool = (
         True  # If this is true only the passed fields will be updated, otherwise empty fields will be set to None
@@ -76,12 +111,17 @@ class MontrekRepository:
         self.annotator = Annotator(self.hub_class)
         self._ts_queryset_containers = []
         self.session_data = session_data if session_data is not None else {}
+        self._window_start_date: timezone.datetime | None = None
+        self._window_end_date: timezone.datetime | None = None
         self.query_builder = QueryBuilder(
             self.annotator,
             self.session_data,
             self.latest_ts,
             self.session_start_date,
             self.session_end_date,
+            query_engine=self.query_engine,
+            prefetch_linked_fields=self.prefetch_linked_fields
+            and self.view_model is None,
         )
         self._reference_date = None
         self.messages = []
@@ -89,6 +129,7 @@ class MontrekRepository:
         self.linked_fields: list[str] = []
         self.set_annotations()
         self._order_fields: tuple[str] | None = None
+        self._requested_fields: tuple[str, ...] | None = None
         self._db_staller: DbStaller | None = None
         self.view_model_repository = ViewModelRepository(self.view_model)
 
@@ -111,7 +152,7 @@ class MontrekRepository:
             db_staller, self.session_user_id, strict_none_semantics=True
         )
         db_creator.create(data)
-        db_writer = DbWriter(db_staller)
+        db_writer = self.db_writer_class(db_staller)
         db_writer.write()
         self.save_db_staller(db_staller)
         self.store_in_view_model(db_staller)
@@ -123,7 +164,9 @@ class MontrekRepository:
         self._raise_for_anonymous_user()
         self._debug_logging("Get DbDataFrame")
         data_frame = self.skim_data_frame(data_frame)
-        db_data_frame = DbDataFrame(self.annotator, self.session_user_id)
+        db_data_frame = DbDataFrame(
+            self.annotator, self.session_user_id, self.db_writer_class
+        )
         self._debug_logging("Write to DB")
         db_data_frame.create(data_frame)
         self.messages += db_data_frame.messages
@@ -133,13 +176,21 @@ class MontrekRepository:
         self._debug_logging("Wrote data frame to DB")
         return db_data_frame.hubs
 
-    def store_in_view_model(self, db_staller: DbStaller | None = None):
+    def store_in_view_model(
+        self, db_staller: DbStaller | None = None, incremental: bool = False
+    ):
         if not self.view_model:
             return
 
         # When storing in the view model, we want to include all data without applying filters,
         # so we explicitly set apply_filter=False.
         query = self.receive_raw(update_view_model=True, apply_filter=False)
+        if incremental:
+            # Only recompute hubs changed since the last refresh
+            self.view_model_repository.store_changed_in_view_model(
+                query, self.annotator
+            )
+            return
         self.view_model_repository.store_in_view_model(
             db_staller, query, self.hub_class
         )
@@ -161,6 +212,87 @@ class MontrekRepository:
     def receive(self, apply_filter: bool = True) -> QuerySet:
         return self.receive_raw(apply_filter, False).select_related("hub")
 
+    def receive_count(self, apply_filter: bool = True) -> int:
+        """
+        Count the rows of receive without building its annotations, unless
+        the filter needs them.
+        """
+        return self._get_cached_result(
+            "count",
+            lambda: self._count(apply_filter),
+            apply_filter,
+            timeout=self.count_cache_timeout,
+        )
+
+    def _count(self, apply_filter: bool) -> int:
+        if self.view_model and "reference_date" not in self.session_data:
+            query = self.get_view_model_query(apply_filter=apply_filter)
+        else:
+            query = self.query_builder.build_count_queryset(
+                self.reference_date, apply_filter=apply_filter
+            )
+        if self.count_estimate_threshold is not None:
+            estimate = estimate_row_count(query)
+            if estimate is not None and estimate > self.count_estimate_threshold:
+                return estimate
+        return query.count()
+
+    def receive_page(
+        self, offset: int, limit: int, apply_filter: bool = True
+    ) -> list[models.Model]:
+        return self._get_cached_result(
+            "page",
+            lambda: list(self.receive(apply_filter)[offset : offset + limit]),
+            apply_filter,
+            offset,
+            limit,
+        )
+
+    def get_result_cache(
+        self, apply_filter: bool = True, timeout: int | None = None
+    ) -> QueryResultCache | None:
+        timeout = self.result_cache_timeout if timeout is None else timeout
+        if timeout is None:
+            return None
+        repository_class = type(self)
+        context = (
+            f"{repository_class.__module__}.{repository_class.__qualname__}",
+            self.session_data.get("request_path", ""),
+            str(self.query_builder.query_filter) if apply_filter else None,
+            # Without an explicit reference date the results are read for now
+            self._reference_date or self.session_data.get("reference_date"),
+            self.session_start_date,
+            self.session_end_date,
+            self.order_fields(),
+            self._requested_fields,
+        )
+        return QueryResultCache(context, self._get_read_hub_classes(), timeout)
+
+    def _get_cached_result(
+        self,
+        name: str,
+        compute: Callable[[], Any],
+        apply_filter: bool,
+        *args: Any,
+        timeout: int | None = None,
+    ) -> Any:
+        result_cache = self.get_result_cache(apply_filter, timeout)
+        if result_cache is None:
+            return compute()
+        return result_cache.get_or_compute(name, compute, *args)
+
+    def _get_read_hub_classes(self) -> set[type[MontrekHubABC]]:
+        hub_classes = {self.hub_class}
+        for satellite_class in (
+            self.annotator.get_satellite_classes()
+            + self.annotator.get_linked_satellite_classes()
+        ):
+            hub_classes.add(satellite_class.get_related_hub_class())
+        for link_class in self.annotator.get_link_classes():
+            hub_classes.add(link_class.get_related_hub_class("hub_in"))
+            hub_classes.add(link_class.get_related_hub_class("hub_out"))
+        return hub_classes
+
     def filter_by_linked_hub(
         self,
         queryset: QuerySet,
@@ -211,7 +343,12 @@ class MontrekRepository:
         ):
             return self.get_view_model_query(apply_filter=apply_filter)
         query = self.query_builder.build_queryset(
-            self.reference_date, self.order_fields(), apply_filter=apply_filter
+            self.reference_date,
+            self.order_fields(),
+            apply_filter=apply_filter,
+            # View models are stored from the full queryset
+            fields=None if self.view_model else self._requested_fields,
+            current_state=self._reads_current_state(),
         )
         if self.view_model and not update_view_model:
             self.view_model_repository.store_query_in_view_model(query, "all")
@@ -244,8 +381,68 @@ class MontrekRepository:
             satellite_class.objects.filter(**filter_kwargs).update(
                 state_date_end=closing_date
             )
+            refresh_current_satellites(satellite_class, [obj.pk])
         self.delete_from_view_model(obj)
         self._delete_links(obj, closing_date)
+        bump_data_versions(
+            [type(obj)]
+            + [
+                link_class.get_related_hub_class(field_name)
+                for link_class, _ in self._get_link_fields_for_hub(type(obj))
+                for field_name in ("hub_in", "hub_out")
+            ]
+        )
+
+    def delete_many(self, hubs: Iterable[int] | QuerySet):
+        """
+        Close the hubs, their satellites and their links with one UPDATE per
+        table and batch of hubs, and remove them from the view model.
+
+        hubs are hub ids, a queryset of hubs or a queryset received from this
+        repository. Satellites and links closed already keep their end date.
+        """
+        hub_ids = self._get_hub_ids(hubs)
+        if not hub_ids:
+            return
+        closing_date = timezone.now()
+        satellite_classes = self.annotator.get_satellite_classes()
+        link_fields = self._get_link_fields_for_hub(self.hub_class)
+        for batch in itertools.batched(hub_ids, DELETE_BATCH_SIZE):
+            self.hub_class.objects.filter(
+                pk__in=batch, state_date_end__gt=closing_date
+            ).update(state_date_end=closing_date)
+            for satellite_class in satellite_classes:
+                if satellite_class.is_timeseries:
+                    hub_field = "hub_value_date__hub_id"
+                else:
+                    hub_field = "hub_entity_id"
+                satellite_class.objects.filter(
+                    **{f"{hub_field}__in": batch},
+                    state_date_end__gt=closing_date,
+                ).update(state_date_end=closing_date)
+                refresh_current_satellites(satellite_class, batch)
+            for link_class, field_names in link_fields:
+                link_filter = Q()
+                for field_name in field_names:
+                    link_filter |= Q(**{f"{field_name}_id__in": batch})
+                link_class.objects.filter(
+                    link_filter, state_date_end__gt=closing_date
+                ).update(state_date_end=closing_date)
+            self.view_model_repository.delete_hubs_from_view_model(batch)
+        bump_data_versions(
+            [self.hub_class]
+            + [
+                link_class.get_related_hub_class(field_name)
+                for link_class, _ in link_fields
+                for field_name in ("hub_in", "hub_out")
+            ]
+        )
+
+    def _get_hub_ids(self, hubs: Iterable[int] | QuerySet) -> list[int]:
+        if isinstance(hubs, QuerySet):
+            hub_field = "pk" if issubclass(hubs.model, MontrekHubABC) else "hub_id"
+            hubs = hubs.order_by().values_list(hub_field, flat=True).distinct()
+        return sorted({hub_id for hub_id in hubs if hub_id is not None})
 
     def _get_link_fields_for_hub(
         self, hub_class: type[MontrekHubABC]
@@ -290,6 +487,24 @@ class MontrekRepository:
     def set_order_fields(self, fields: tuple[str]):
         self._order_fields = fields
 
+    def set_requested_fields(self, fields: Collection[str] | None):
+        """
+        Only annotate these fields, and those needed by the filter and order
+        fields, on the querysets received from now on. None annotates all.
+        """
+        self._requested_fields = None if fields is None else tuple(fields)
+
+    def receive_only(
+        self, fields: Collection[str], apply_filter: bool = True
+    ) -> QuerySet:
+        """Receive the queryset with only the given fields annotated."""
+        requested_fields = self._requested_fields
+        self.set_requested_fields(fields)
+        try:
+            return self.receive(apply_filter)
+        finally:
+            self._requested_fields = requested_fields
+
     @property
     def annotations(self):
         return self.annotator.annotations
@@ -307,14 +522,38 @@ class MontrekRepository:
             return reference_date
         return self._reference_date
 
+    def _reads_current_state(self) -> bool:
+        return self._reference_date is None and not self.session_data.get(
+            "reference_date"
+        )
+
+    def set_value_date_window(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+    ):
+        """
+        Only read the value dates between start_date and end_date from now on,
+        whether or not the session dates are considered. None falls back to
+        the session date.
+        """
+        self._window_start_date = start_date
+        self._window_end_date = end_date
+        self.query_builder.session_start_date = self.session_start_date
+        self.query_builder.session_end_date = self.session_end_date
+
     @property
     def session_end_date(self) -> timezone.datetime:
+        if self._window_end_date is not None:
+            return self._ensure_aware_datetime(self._window_end_date)
         if self.consider_session_dates:
             return self._get_session_date("end_date", timezone.datetime.max)
         return self._ensure_aware_datetime(timezone.datetime.max)
 
     @property
     def session_start_date(self) -> timezone.datetime:
+        if self._window_start_date is not None:
+            return self._ensure_aware_datetime(self._window_start_date)
         if self.consider_session_dates:
             return self._get_session_date("start_date", timezone.datetime.min)
         return self._ensure_aware_datetime(timezone.datetime.min)
@@ -618,7 +857,7 @@ class MontrekRepository:
         raise_for_unmapped_values: bool = True,
     ) -> list[MontrekHubABC | None]:
         filter_kwargs = {f"{by_repository_field}__in": values}
-        queryset = self.receive().filter(**filter_kwargs)
+        queryset = self.receive_only([by_repository_field]).filter(**filter_kwargs)
         value_to_hub_map = {}
         unmapped_values = set()
         multiple_hub_values = set()
@@ -703,20 +942,92 @@ class MontrekRepository:
         apply_filter: bool = True,
         columns: list[str] | None = None,
         no_category_columns: list[str] | None = None,
+        chunk_size: int | None = None,
     ) -> pd.DataFrame:
-        query = self.receive(apply_filter)
-        return self.get_df_from_queryset(
-            query,
-            columns=columns,
-            no_category_columns=no_category_columns,
+        """
+        Return the repository data as a typed DataFrame.
+
+        If ``chunk_size`` is given, the rows are streamed in chunks (see
+        ``iter_df``) and only the typed chunks are held in memory while the
+        frame is assembled. The frame is cached if ``result_cache_timeout`` is set.
+        """
+        return self._get_cached_result(
+            "df",
+            lambda: self.get_df_from_queryset(
+                self._receive_columns(apply_filter, columns),
+                columns=columns,
+                no_category_columns=no_category_columns,
+                chunk_size=chunk_size,
+            ),
+            apply_filter,
+            columns,
+            no_category_columns,
         )
 
+    def iter_df(
+        self,
+        chunk_size: int = DF_CHUNK_SIZE,
+        apply_filter: bool = True,
+        columns: list[str] | None = None,
+        no_category_columns: list[str] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield the repository data as typed DataFrames of at most ``chunk_size`` rows.
+
+        The rows are streamed with ``QuerySet.iterator`` (a server-side cursor on
+        PostgreSQL), so the full result never has to fit into memory. Columns are
+        typed with ``get_df_dtypes``; category columns are built per chunk, so
+        their categories can differ between chunks.
+        """
+        query = self._receive_columns(apply_filter, columns)
+        query, dtypes = self._get_df_query(query, columns, no_category_columns)
+        for df in self._iter_frames(query, chunk_size):
+            yield self._set_df_dtypes(df, dtypes)
+
+    def _receive_columns(
+        self, apply_filter: bool, columns: list[str] | None
+    ) -> QuerySet:
+        if columns is None:
+            return self.receive(apply_filter)
+        return self.receive_only(columns, apply_filter)
+
     def get_df_from_queryset(
         self,
         query: QuerySet,
         columns: list[str] | None = None,
         no_category_columns: list[str] | None = None,
+        chunk_size: int | None = None,
     ) -> pd.DataFrame:
+        query, dtypes = self._get_df_query(query, columns, no_category_columns)
+        if chunk_size is None:
+            df = self._set_df_dtypes(read_frame(query), dtypes)
+        else:
+            # Categories are only known for the whole frame
+            chunk_dtypes = {
+                col: "object" if dtype == "category" else dtype
+                for col, dtype in dtypes.items()
+            }
+            chunks = [
+                self._set_df_dtypes(df, chunk_dtypes)
+                for df in self._iter_frames(query, chunk_size)
+            ]
+            if chunks:
+                df = pd.concat(chunks, ignore_index=True)
+            else:
+                df = self._set_df_dtypes(read_frame(query.none()), chunk_dtypes)
+            del chunks
+            df = df.astype(dtypes, copy=False)
+        df = self._apply_category_dtype(
+            df, no_category_columns=no_category_columns, copy=False
+        )
+        return df
+
+    def _get_df_query(
+        self,
+        query: QuerySet,
+        columns: list[str] | None,
+        no_category_columns: list[str] | None,
+    ) -> tuple[QuerySet, dict[str, str]]:
         columns = (
             self.get_all_annotated_fields() + ["id", "value_date_list_id"]
             if columns is None
@@ -724,12 +1035,26 @@ class MontrekRepository:
         )
         dtypes = self.get_df_dtypes(no_category_columns)
         dtypes = {k: v for k, v in dtypes.items() if k in columns}
-        query = query.values(*columns)
-        df = read_frame(query)
-        df = self._normalize_min_dates(df, dtypes)
-        df = df.astype(dtypes)
-        df = self._apply_category_dtype(df, no_category_columns=no_category_columns)
-        return df
+        return query.values(*columns), dtypes
+
+    def _iter_frames(self, query: QuerySet, chunk_size: int) -> Iterator[pd.DataFrame]:
+        # Mirrors read_frame for values querysets, one chunk at a time
+        select_names = list(query.query.values_select)
+        annotation_names = list(query.query.annotation_select)
+        fieldnames = select_names + annotation_names
+        fields = [
+            None if "__" in name else query.model._meta.get_field(name)
+            for name in select_names
+        ] + [None] * len(annotation_names)
+        rows = query.values_list(*fieldnames).iterator(chunk_size=chunk_size)
+        for chunk in itertools.batched(rows, chunk_size):
+            df = pd.DataFrame.from_records(chunk, columns=fieldnames)
+            update_with_verbose(df, fieldnames, fields)
+            yield df
+
+    def _set_df_dtypes(self, df: pd.DataFrame, dtypes: dict[str, str]) -> pd.DataFrame:
+        df = self._normalize_min_dates(df, dtypes, copy=False)
+        return df.astype(dtypes, copy=False)
 
     def skim_data_frame(self, data_frame: pd.DataFrame) -> pd.DataFrame:
         columns = self.get_all_annotated_fields() + self.get_link_names()
@@ -741,8 +1066,10 @@ class MontrekRepository:
         df: pd.DataFrame,
         threshold: float = 0.10,
         no_category_columns: list[str] | None = None,
+        copy: bool = True,
     ) -> pd.DataFrame:
-        df = df.copy()
+        if copy:
+            df = df.copy()
 
         no_category_columns = [] if no_category_columns is None else no_category_columns
 
@@ -774,9 +1101,10 @@ class MontrekRepository:
         return n >= 100 and (k / n) < threshold
 
     def _normalize_min_dates(
-        self, df: pd.DataFrame, dtypes: dict[str, str]
+        self, df: pd.DataFrame, dtypes: dict[str, str], copy: bool = True
     ) -> pd.DataFrame:
-        df = df.copy()
+        if copy:
+            df = df.copy()
         datetime_cols = [
             col for col, ty in dtypes.items() if self._is_datetime_dtype(ty)
         ]
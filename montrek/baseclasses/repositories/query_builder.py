@@ -1,3 +1,8 @@
+import functools
+import inspect
+import json
+from collections.abc import Collection
+from enum import Enum
 from typing import Any
 
 from baseclasses.dataclasses.montrek_message import (
@@ -5,11 +10,59 @@ from baseclasses.dataclasses.montrek_message import (
     MontrekMessageError,
 )
 from django.core.exceptions import FieldError
-from baseclasses.repositories.annotator import Annotator
+from baseclasses.repositories.annotator import (
+    Annotator,
+    FieldProjection,
+    LinkedFieldProjection,
+    SatelliteAlias,
+)
+from baseclasses.repositories.db.latest_hub_value_dates import (
+    keeps_latest_value_date,
+    latest_hub_value_date_exists,
+)
 from baseclasses.repositories.filter_decoder import FilterDecoder
-from django.db.models import Q, QuerySet, OuterRef, Exists
+from baseclasses.repositories.linked_fields_queryset import (
+    LinkedFieldBatch,
+    LinkedFieldsQuerySet,
+)
+from baseclasses.repositories.subquery_builder import (
+    LinkedSatelliteSubqueryBuilderBase,
+    SatelliteSubqueryBuilderABC,
+)
+from django.db import connections
+from django.db.models import FilteredRelation, Q, QuerySet, OuterRef, Exists
+from django.db.models.constants import LOOKUP_SEP
 from django.utils import timezone
 
+# The value_date annotation resolved on the ValueDateList itself
+VALUE_DATE_LIST_FIELD = "value_date_list__value_date"
+# Annotated even if not requested, the row filters and links rely on them
+ALWAYS_ANNOTATED_FIELDS = ("value_date", "hub_entity_id")
+
+
+def estimate_row_count(queryset: QuerySet) -> int | None:
+    """
+    Return the planner's estimate of the number of rows of the queryset, or
+    None if the database backend offers no estimate.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class QueryEngineEnum(Enum):
+    # One correlated subquery per annotated field.
+    SUBQUERY = "subquery"
+    # One LEFT JOIN per satellite alias, all of its fields read from the join.
+    JOIN = "join"
+
 
 class QueryBuilder:
     def __init__(
@@ -19,8 +72,12 @@ class QueryBuilder:
         latest_ts: bool = False,
         session_start_date: timezone.datetime | None = None,
         session_end_date: timezone.datetime | None = None,
+        query_engine: str = QueryEngineEnum.SUBQUERY.value,
+        prefetch_linked_fields: bool = False,
     ):
         self.annotator = annotator
+        self.query_engine = QueryEngineEnum(query_engine)
+        self.prefetch_linked_fields = prefetch_linked_fields
         self.hub_class = annotator.hub_class
         self.session_data = session_data
         self.messages: list[MontrekMessage] = []
@@ -52,60 +109,383 @@ class QueryBuilder:
         reference_date: timezone.datetime,
         order_fields: tuple[str, ...] = (),
         apply_filter: bool = True,
+        fields: Collection[str] | None = None,
+        current_state: bool = False,
     ) -> QuerySet:
-        queryset = self.hub_value_date.objects.filter(
-            Q(hub__state_date_start__lte=reference_date),
-            Q(hub__state_date_end__gt=reference_date),
+        """
+        Build the annotated queryset of the hub value dates valid at the
+        reference date.
+
+        If fields is given, only these annotations and those needed by the
+        filter and the order fields are added; all others are skipped. With
+        prefetch_linked_fields, the linked fields are resolved for the fetched
+        rows only, see LinkedFieldsQuerySet. current_state reads satellites
+        keeping their current state from CurrentSatellite; only set it if the
+        reference date is now.
+        """
+        queryset, query_filter = self._select_rows(reference_date, apply_filter)
+        annotated_fields = self._get_annotated_fields(
+            fields, order_fields, query_filter
         )
         if self.latest_ts:
             queryset = self._filter_ts_rows(queryset)
+        queryset, join_names = self._alias_satellites(
+            queryset, reference_date, annotated_fields, current_state
+        )
+        queryset = self._annotate_fields(
+            queryset, reference_date, annotated_fields, join_names
+        )
+        if apply_filter:
+            queryset = self._apply_filter(queryset, query_filter)
+        if not self.latest_ts:
+            queryset = self._filter_ts_rows(queryset)
+        queryset = self._apply_order(queryset, order_fields)
+        return queryset
+
+    def _select_rows(
+        self, reference_date: timezone.datetime, apply_filter: bool
+    ) -> tuple[QuerySet, Q]:
+        """
+        Select the hub value dates of the hubs valid at the reference date,
+        with the filter pushed down to the satellites where possible.
+
+        Returns the queryset and the rest of the filter, which still has to be
+        applied to the annotations.
+        """
+        queryset = self._get_base_queryset().filter(
+            Q(hub__state_date_start__lte=reference_date),
+            Q(hub__state_date_end__gt=reference_date),
+        )
+        # Restrict the rows to the session dates before any annotation, so
+        # the time series subqueries only run for dates inside the window
+        queryset = self._filter_session_data(queryset, VALUE_DATE_LIST_FIELD)
+        if not apply_filter:
+            return queryset, Q()
+        return self._push_down_filter(queryset, reference_date)
+
+    def _alias_satellites(
+        self,
+        queryset: QuerySet,
+        reference_date: timezone.datetime,
+        annotated_fields: set[str] | None,
+        current_state: bool,
+    ) -> tuple[QuerySet, dict[str, str]]:
+        """
+        Alias the satellites the annotated fields are read from.
+
+        Returns the queryset and the join names of the satellites that are
+        joined instead of read through subqueries.
+        """
+        used_alias_names = {
+            projection.satellite_alias.alias_name
+            for projection in self.annotator.field_projections
+            if annotated_fields is None or projection.outfield in annotated_fields
+        }
+        used_linked_alias_names = {
+            projection.linked_satellite_alias.alias_name
+            for projection in self.annotator.linked_field_projections
+            if annotated_fields is None or projection.outfield in annotated_fields
+        }
         satellite_aliases_dict: dict[str, Any] = {}
+        join_names: dict[str, str] = {}
         for satellite_alias in self.annotator.satellite_aliases:
+            if satellite_alias.alias_name not in used_alias_names:
+                continue
+            join = self._build_satellite_join(satellite_alias, reference_date)
+            if join is not None:
+                join_name = self._get_join_name(satellite_alias.alias_name)
+                join_names[satellite_alias.alias_name] = join_name
+                satellite_aliases_dict[join_name] = join
+                continue
             satellite_aliases_dict[satellite_alias.alias_name] = (
-                satellite_alias.subquery_builder.build_alias(reference_date)
+                self._build_satellite_alias(
+                    satellite_alias, reference_date, current_state
+                )
             )
         for linked_satellite_alias in self.annotator.linked_satellite_aliases:
+            if linked_satellite_alias.alias_name not in used_linked_alias_names:
+                continue
             satellite_aliases_dict[linked_satellite_alias.alias_name] = (
                 linked_satellite_alias.subquery_builder.build_alias(reference_date)
             )
         if satellite_aliases_dict:
             queryset = queryset.alias(**satellite_aliases_dict)
-        field_projections = self.annotator.field_projections_to_subqueries()
+        return queryset, join_names
+
+    @staticmethod
+    def _build_satellite_alias(
+        satellite_alias: SatelliteAlias,
+        reference_date: timezone.datetime,
+        current_state: bool,
+    ) -> Any:
+        alias = None
+        if current_state:
+            alias = satellite_alias.subquery_builder.build_current_alias(reference_date)
+        if alias is None:
+            alias = satellite_alias.subquery_builder.build_alias(reference_date)
+        return alias
+
+    def _annotate_fields(
+        self,
+        queryset: QuerySet,
+        reference_date: timezone.datetime,
+        annotated_fields: set[str] | None,
+        join_names: dict[str, str],
+    ) -> QuerySet:
+        field_projections = self.annotator.field_projections_to_subqueries(
+            join_names, fields=annotated_fields
+        )
         linked_field_projections = (
-            self.annotator.linked_field_projections_to_subqueries()
+            self.annotator.linked_field_projections_to_subqueries(
+                fields=annotated_fields
+            )
+        )
+        if self.prefetch_linked_fields:
+            queryset = queryset.annotate(**field_projections)
+        else:
+            queryset = queryset.annotate(
+                **field_projections, **linked_field_projections
+            )
+        annotations = self.annotator.build(
+            reference_date,
+            queryset=queryset,
+            prefer_joins=self.query_engine == QueryEngineEnum.JOIN,
+            fields=annotated_fields,
         )
-        queryset = queryset.annotate(**field_projections, **linked_field_projections)
-        queryset = queryset.annotate(
-            **self.annotator.build(reference_date, queryset=queryset)
+        if self.prefetch_linked_fields:
+            queryset = self._defer_linked_fields(
+                queryset, reference_date, linked_field_projections, annotations
+            )
+        return queryset.annotate(**annotations)
+
+    def _defer_linked_fields(
+        self,
+        queryset: LinkedFieldsQuerySet,
+        reference_date: timezone.datetime,
+        linked_field_projections: dict[str, Any],
+        annotations: dict[str, Any],
+    ) -> QuerySet:
+        """
+        Resolve the linked fields in batches of the fetched rows instead of in
+        the main query, see LinkedFieldsQuerySet.
+
+        Linked fields which cannot be resolved in batches stay subqueries and
+        are annotated to the queryset; the deferred ones are popped from
+        annotations.
+        """
+        inline_projections = {}
+        projections_by_alias: dict[str, list[LinkedFieldProjection]] = {}
+        for projection in self.annotator.linked_field_projections:
+            if projection.outfield not in linked_field_projections:
+                continue
+            linked_satellite_alias = projection.linked_satellite_alias
+            if linked_satellite_alias.subquery_builder.can_build_batch():
+                projections_by_alias.setdefault(
+                    linked_satellite_alias.alias_name, []
+                ).append(projection)
+            else:
+                inline_projections[projection.outfield] = linked_field_projections[
+                    projection.outfield
+                ]
+        queryset = queryset.annotate(**inline_projections)
+        for projections in projections_by_alias.values():
+            subquery_builder = projections[0].linked_satellite_alias.subquery_builder
+            columns = {
+                projection.outfield: projection.field for projection in projections
+            }
+            queryset = queryset.with_linked_fields(
+                {outfield: linked_field_projections[outfield] for outfield in columns},
+                LinkedFieldBatch(
+                    functools.partial(
+                        subquery_builder.build_batch_fields,
+                        reference_date,
+                        fields=list(dict.fromkeys(columns.values())),
+                    ),
+                    columns,
+                ),
+            )
+        for field, subquery_builder in self.annotator.annotations.items():
+            if (
+                field not in annotations
+                or not isinstance(subquery_builder, LinkedSatelliteSubqueryBuilderBase)
+                or not subquery_builder.can_build_batch()
+            ):
+                continue
+            queryset = queryset.with_linked_fields(
+                {field: annotations.pop(field)},
+                LinkedFieldBatch(
+                    functools.partial(subquery_builder.build_batch, reference_date),
+                    {field: subquery_builder.field + "agg"},
+                ),
+            )
+        return queryset
+
+    def _get_base_queryset(self) -> QuerySet:
+        if self.prefetch_linked_fields:
+            return LinkedFieldsQuerySet(self.hub_value_date)
+        return self.hub_value_date.objects.all()
+
+    def _get_annotated_fields(
+        self,
+        fields: Collection[str] | None,
+        order_fields: tuple[str, ...],
+        query_filter: Q,
+    ) -> set[str] | None:
+        if fields is None:
+            return None
+        annotated_fields = set(fields) | set(ALWAYS_ANNOTATED_FIELDS)
+        for order_field in order_fields:
+            annotated_fields |= self._get_field_paths(order_field.removeprefix("-"))
+        for key in self._get_filter_keys(query_filter):
+            annotated_fields |= self._get_field_paths(key)
+        for field, subquery_builder in self.annotator.annotations.items():
+            # These builders may read any field from the projected queryset
+            if (
+                field in annotated_fields
+                and "queryset" in inspect.signature(subquery_builder.build).parameters
+            ):
+                return None
+        return annotated_fields
+
+    @staticmethod
+    def _get_field_paths(key: str) -> set[str]:
+        # Any prefix of a lookup may be the name of an annotation
+        parts = key.split(LOOKUP_SEP)
+        return {LOOKUP_SEP.join(parts[:i]) for i in range(1, len(parts) + 1)}
+
+    def _get_filter_keys(self, query_filter: Q | tuple[str, Any]) -> list[str]:
+        if not isinstance(query_filter, Q):
+            return [query_filter[0]]
+        keys = []
+        for child in query_filter.children:
+            keys.extend(self._get_filter_keys(child))
+        return keys
+
+    def build_count_queryset(
+        self, reference_date: timezone.datetime, apply_filter: bool = True
+    ) -> QuerySet:
+        """
+        Return a queryset with the same rows as build_queryset, but without
+        the annotations that are not needed to select them.
+
+        The rows are selected on the bare hub value dates, unless the filter
+        cannot be pushed down to the satellites. Then they are counted on the
+        full queryset, from which count() drops all annotations the filter
+        does not refer to.
+        """
+        queryset = self.hub_value_date.objects.filter(
+            Q(hub__state_date_start__lte=reference_date),
+            Q(hub__state_date_end__gt=reference_date),
         )
         if apply_filter:
-            queryset = self._apply_filter(queryset)
-        queryset = self._filter_session_data(queryset)
-        if not self.latest_ts:
-            queryset = self._filter_ts_rows(queryset)
-        queryset = self._apply_order(queryset, order_fields)
-        return queryset
+            queryset, query_filter = self._push_down_filter(queryset, reference_date)
+            if query_filter:
+                return self.build_queryset(reference_date, apply_filter=True)
+        queryset = self._filter_session_data(queryset, VALUE_DATE_LIST_FIELD)
+        return self._filter_ts_rows(queryset, VALUE_DATE_LIST_FIELD)
 
-    def _apply_filter(self, queryset: QuerySet) -> QuerySet:
+    def _build_satellite_join(
+        self, satellite_alias: SatelliteAlias, reference_date: timezone.datetime
+    ) -> FilteredRelation | None:
+        if self.query_engine != QueryEngineEnum.JOIN:
+            return None
+        return satellite_alias.subquery_builder.build_join(reference_date)
+
+    @staticmethod
+    def _get_join_name(alias_name: str) -> str:
+        # Joined relations are referenced as "<join_name>__<field>", so the
+        # name itself must not contain the lookup separator.
+        return alias_name.replace("__", "_") + "_join"
+
+    def _apply_filter(
+        self, queryset: QuerySet, query_filter: Q | None = None
+    ) -> QuerySet:
+        query_filter = self.query_filter if query_filter is None else query_filter
         try:
-            queryset = queryset.filter(self.query_filter)
+            queryset = queryset.filter(query_filter)
         except (FieldError, ValueError) as e:
             self.messages.append(MontrekMessageError(str(e)))
         return queryset
 
+    def _push_down_filter(
+        self, queryset: QuerySet, reference_date: timezone.datetime
+    ) -> tuple[QuerySet, Q]:
+        """
+        Apply the lookups of the filter that target a single satellite field
+        as semi-joins on the satellite table, before any annotation is added.
+
+        Returns the filtered queryset and the rest of the filter, which still
+        has to be applied to the annotations.
+        """
+        query_filter = self.query_filter
+        if query_filter.negated or query_filter.connector != Q.AND:
+            return queryset, query_filter
+        remaining_filter = []
+        for child in query_filter.children:
+            exists = self._get_satellite_exists(child, reference_date)
+            if exists is None:
+                remaining_filter.append(child)
+            else:
+                queryset = queryset.filter(exists)
+        return queryset, Q(*remaining_filter)
+
+    def _get_satellite_exists(
+        self, child: Q | tuple[str, Any], reference_date: timezone.datetime
+    ) -> Exists | None:
+        while isinstance(child, Q):
+            if child.negated or len(child.children) != 1:
+                return None
+            child = child.children[0]
+        key, value = child
+        # Rows without a satellite have null fields and would match these,
+        # while a semi-join requires a satellite
+        if value is None or key.endswith(f"{LOOKUP_SEP}isnull"):
+            return None
+        field_projection = self._get_field_projection(key)
+        if field_projection is None:
+            return None
+        subquery_builder = field_projection.satellite_alias.subquery_builder
+        if not isinstance(subquery_builder, SatelliteSubqueryBuilderABC):
+            return None
+        satellite_filter = {
+            field_projection.field + key.removeprefix(field_projection.outfield): value
+        }
+        try:
+            return subquery_builder.build_exists(reference_date, satellite_filter)
+        except (FieldError, ValueError):
+            # Reported when the filter is applied to the annotations
+            return None
+
+    def _get_field_projection(self, key: str) -> FieldProjection | None:
+        matches = [
+            field_projection
+            for field_projection in self.annotator.field_projections
+            if key == field_projection.outfield
+            or key.startswith(field_projection.outfield + LOOKUP_SEP)
+        ]
+        return max(matches, key=lambda match: len(match.outfield), default=None)
+
     def _apply_order(
         self, queryset: QuerySet, order_fields: tuple[str, ...]
     ) -> QuerySet:
         return queryset.order_by(*order_fields)
 
-    def _filter_ts_rows(self, queryset: QuerySet) -> QuerySet:
+    def _filter_ts_rows(
+        self, queryset: QuerySet, value_date_field: str = "value_date"
+    ) -> QuerySet:
         # Use hub_id (direct FK column) instead of the hub_entity_id annotation
         # (which is itself a subquery) to avoid unnecessary nesting.
         non_null_value_date_exists = self.hub_value_date.objects.filter(
             hub_id=OuterRef("hub_id"),
             value_date_list__value_date__isnull=False,
         ).exclude(id=OuterRef("id"))
-        if self.latest_ts:
+        if self.latest_ts and keeps_latest_value_date(self.hub_value_date):
+            # The maintained pointer selects the same row without scanning
+            # the other value dates of the hub.
+            filtered_query = queryset.filter(
+                latest_hub_value_date_exists(self.hub_value_date)
+            )
+        elif self.latest_ts:
             # Build from the bare model (no annotations) to avoid dragging all
             # annotation subqueries into this inner query.  Compare value_date_list_id
             # integers directly instead of going through the value_date annotation.
@@ -125,16 +505,24 @@ class QueryBuilder:
             filtered_query = queryset.filter(value_date_list__value_date__isnull=True)
         else:
             filtered_query = queryset.filter(
-                Q(value_date__isnull=False) | ~Exists(non_null_value_date_exists)
+                Q(**{f"{value_date_field}__isnull": False})
+                | ~Exists(non_null_value_date_exists)
             )
         return filtered_query
 
-    def _filter_session_data(self, queryset: QuerySet) -> QuerySet:
+    def _filter_session_data(
+        self, queryset: QuerySet, value_date_field: str = "value_date"
+    ) -> QuerySet:
         if not self.annotator.get_ts_satellite_classes():
             return queryset
         end_date = self.session_end_date
         start_date = self.session_start_date
         return queryset.filter(
-            (Q(value_date__lte=end_date) & Q(value_date__gte=start_date))
-            | Q(value_date__isnull=True)
+            Q(
+                **{
+                    f"{value_date_field}__lte": end_date,
+                    f"{value_date_field}__gte": start_date,
+                }
+            )
+            | Q(**{f"{value_date_field}__isnull": True})
         )
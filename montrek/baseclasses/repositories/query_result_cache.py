@@ -0,0 +1,84 @@
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, TypeVar
+
+from django.core.cache import caches
+from django.db import models
+
+QUERY_RESULT_CACHE_ALIAS = "query_results"
+DATA_VERSION_KEY_PREFIX = "montrek:data_version:"
+QUERY_RESULT_KEY_PREFIX = "montrek:query_result:"
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+def get_data_version_key(hub_class: type[models.Model]) -> str:
+    return DATA_VERSION_KEY_PREFIX + hub_class._meta.label_lower
+
+
+def get_data_versions(hub_classes: Iterable[type[models.Model]]) -> list[int]:
+    cache = caches[QUERY_RESULT_CACHE_ALIAS]
+    keys = sorted({get_data_version_key(hub_class) for hub_class in hub_classes})
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key in versions:
+            continue
+        # A fresh version never matches results cached before the version
+        # was evicted from the cache
+        cache.add(key, time.time_ns(), timeout=None)
+        versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_data_versions(hub_classes: Iterable[type[models.Model]]):
+    """Invalidate all cached results read from one of the hub classes."""
+    cache = caches[QUERY_RESULT_CACHE_ALIAS]
+    for key in {get_data_version_key(hub_class) for hub_class in hub_classes}:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+class QueryResultCache:
+    """
+    Cache for results read from a repository.
+
+    Results are keyed by the query context (repository, reference date,
+    decoded filter, order fields, ...) and the data versions of all hub
+    classes they are read from, so a write to one of these hubs makes them
+    unreachable. The timeout bounds the staleness of results that change
+    without a write, e.g. when a state date passes.
+    """
+
+    def __init__(
+        self,
+        context: tuple[Any, ...],
+        hub_classes: Iterable[type[models.Model]],
+        timeout: int,
+    ):
+        self.context = context
+        self.hub_classes = list(hub_classes)
+        self.timeout = timeout
+        self.cache = caches[QUERY_RESULT_CACHE_ALIAS]
+
+    def get_or_compute(self, name: str, compute: Callable[[], T], *args: Any) -> T:
+        key = self.get_key(name, *args)
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = compute()
+            self.cache.set(key, result, self.timeout)
+        return result
+
+    def get_key(self, name: str, *args: Any) -> str:
+        key_parts = (
+            self.context,
+            get_data_versions(self.hub_classes),
+            name,
+            args,
+        )
+        digest = hashlib.sha256(repr(key_parts).encode()).hexdigest()
+        return QUERY_RESULT_KEY_PREFIX + digest
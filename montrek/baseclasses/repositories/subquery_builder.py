@@ -3,9 +3,10 @@ from enum import Enum
 from typing import Any, Protocol
 from collections.abc import Callable
 
-from django.db.models.expressions import BaseExpression
+from django.db.models.expressions import BaseExpression, ResolvedOuterRef
 
 from baseclasses.models import (
+    CurrentSatellite,
     LinkTypeEnum,
     MontrekHubABC,
     MontrekLinkABC,
@@ -14,17 +15,21 @@ from baseclasses.models import (
     MontrekSatelliteABC,
     ValueDateList,
 )
+from baseclasses.repositories.db.current_satellites import keeps_current_state
 from django.conf import settings
 from django.db import models
 from django.db.models import (
     BooleanField,
     Case,
     CharField,
+    Exists,
     F,
     ExpressionWrapper,
+    FilteredRelation,
     FloatField,
     Func,
     IntegerField,
+    Min,
     OuterRef,
     Q,
     QuerySet,
@@ -98,10 +103,23 @@ class SubqueryBuilder:
         """
         ...
 
+    def build_join_field(self) -> BaseExpression | None:
+        """Return a plain column reference that replaces :meth:`build` when the
+        query builder runs with ``query_engine="join"``.
+
+        Builders whose value can be read from a relation the outer queryset
+        already joins return an ``F`` expression here; all others return
+        ``None`` and keep their correlated subquery.
+        """
+        return None
+
 
 class SatelliteSubqueryBuilderABC(SubqueryBuilder):
     lookup_field: str = ""
     outer_ref: str = ""
+    # Path from the outer HubValueDate row to the model owning lookup_field's
+    # reverse relation (the hub for static satellites, the row itself for TS).
+    join_prefix: str = ""
 
     def __init__(
         self,
@@ -141,6 +159,10 @@ class SatelliteSubqueryBuilderABC(SubqueryBuilder):
     def build_alias(self, reference_date: timezone.datetime) -> Subquery:
         return self.satellite_subquery(reference_date)
 
+    def build_current_alias(self, reference_date: timezone.datetime) -> Subquery | None:
+        """Return the alias read from CurrentSatellite, or None if not kept."""
+        return None
+
     def build_subquery(
         self,
         alias_name: str,
@@ -149,10 +171,72 @@ class SatelliteSubqueryBuilderABC(SubqueryBuilder):
         sat_query = self.satellite_class.objects.filter(Q(pk=OuterRef(alias_name)))
         return Subquery(sat_query.values(field))
 
+    def build_exists(
+        self, reference_date: timezone.datetime, satellite_filter: dict[str, Any]
+    ) -> Exists | None:
+        """Return a semi-join onto the satellite valid at ``reference_date``
+        that matches ``satellite_filter``.
+
+        Filtering the bare outer queryset with it selects the same rows as
+        filtering on the projected satellite fields, without computing them.
+        Filtered aliases (``hub_satellite_filter``) pick the latest of several
+        matches and return ``None``.
+        """
+        if self.hub_satellite_filter:
+            return None
+        return Exists(
+            self.satellite_class.objects.filter(
+                **self.subquery_filter(reference_date), **satellite_filter
+            )
+        )
+
+    def join_relation_name(self) -> str:
+        lookup_field = self.satellite_class._meta.get_field(self.lookup_field)
+        return f"{self.join_prefix}{lookup_field.related_query_name()}"
+
+    def build_join(self, reference_date: timezone.datetime) -> FilteredRelation | None:
+        """Return a LEFT JOIN onto the satellite valid at ``reference_date``.
+
+        All fields of the satellite are then read from this single join via
+        :meth:`build_join_subquery` instead of one correlated subquery each.
+        Filtered aliases (``hub_satellite_filter``) may correlate on arbitrary
+        outer columns and pick the latest match, so they cannot be expressed
+        as a join and return ``None``.
+        """
+        if self.hub_satellite_filter:
+            return None
+        relation_name = self.join_relation_name()
+        return FilteredRelation(
+            relation_name,
+            condition=Q(
+                **{
+                    f"{relation_name}__state_date_start__lte": reference_date,
+                    f"{relation_name}__state_date_end__gt": reference_date,
+                }
+            ),
+        )
+
+    def build_join_subquery(self, join_name: str, field: str) -> F:
+        return F(f"{join_name}__{field}")
+
 
 class SatelliteSubqueryBuilder(SatelliteSubqueryBuilderABC):
     lookup_field: str = "hub_entity"
     outer_ref: str = "hub_id"
+    join_prefix: str = "hub__"
+
+    def build_current_alias(self, reference_date: timezone.datetime) -> Subquery | None:
+        # Valid for any date after the hub's satellites were last written
+        if self.hub_satellite_filter or not keeps_current_state(self.satellite_class):
+            return None
+        return Subquery(
+            CurrentSatellite.objects.filter(
+                satellite_table=self.satellite_class._meta.db_table,
+                hub_id=OuterRef(self.outer_ref),
+                state_date_start__lte=reference_date,
+                state_date_end__gt=reference_date,
+            ).values("satellite_id")[:1]
+        )
 
 
 class TSSatelliteSubqueryBuilder(SatelliteSubqueryBuilderABC):
@@ -201,6 +285,9 @@ class ValueDateSubqueryBuilder(SubqueryBuilder):
             "value_date"
         )
 
+    def build_join_field(self) -> F:
+        return F("value_date_list__value_date")
+
 
 class HubDirectFieldSubqueryBuilder(SubqueryBuilder):
     field: str = ""
@@ -214,6 +301,9 @@ class HubDirectFieldSubqueryBuilder(SubqueryBuilder):
             self.hub_class.objects.filter(pk=OuterRef("hub")).values(self.field)
         )
 
+    def build_join_field(self) -> F:
+        return F(f"hub__{self.field}")
+
 
 class HubEntityIdSubqueryBuilder(HubDirectFieldSubqueryBuilder):
     field = "id"
@@ -828,6 +918,86 @@ class LinkedSatelliteSubqueryBuilderBase(
             .values("_lsat_pk")[:1]
         )
 
+    def can_build_batch(self) -> bool:
+        """Whether the field can be resolved for a batch of hubs at once: only
+        static satellites whose filters do not refer to the outer row. Counts
+        stay subqueries, as they give 0 instead of None for links without a
+        valid satellite, which the batch query drops."""
+        is_count = self.agg_func == LinkAggFunctionEnum.COUNT
+        return (
+            not self.satellite_class.is_timeseries
+            and not (is_count and self._is_multiple_allowed(self._hub_field_to))
+            and not self.value_date_scope_path
+            and not self.link_hub_value_date_filter
+            and not refers_to_outer_query(self.link_satellite_filter)
+            and not any(
+                refers_to_outer_query(Q(**csf.filter_dict))
+                for csf in self.cross_satellite_filters
+            )
+        )
+
+    def build_batch_query(
+        self, reference_date: timezone.datetime, hub_ids: list[int]
+    ) -> QuerySet:
+        """Return the satellites linked to the hubs, joined through the link
+        table, with the id of the hub they are linked to as _source_hub_id."""
+        hub_db_field_name, parent_link_strings = (
+            self._get_parent_db_name_und_link_string(self._hub_field_from)
+        )
+        link_path = f"hub_entity__{self.link_db_name}"
+        link_filter = {
+            f"{link_path}__{hub_db_field_name}__in": hub_ids,
+            f"{link_path}__state_date_start__lte": reference_date,
+            f"{link_path}__state_date_end__gt": reference_date,
+            f"{link_path}__{hub_db_field_name}__state_date_start__lte": reference_date,
+            f"{link_path}__{hub_db_field_name}__state_date_end__gt": reference_date,
+        }
+        parent_link_filters = self._get_parent_link_filters(
+            reference_date, parent_link_strings
+        )
+        for key, value in parent_link_filters.items():
+            link_filter[f"{link_path}__{key}"] = value
+        # The link conditions share one filter call, and thereby one join, which
+        # _source_hub_id reuses; cross satellite filters get their own joins
+        return (
+            self.satellite_class.objects.filter(
+                self.link_satellite_filter,
+                state_date_start__lte=reference_date,
+                state_date_end__gt=reference_date,
+                **self._build_cross_satellite_filter_dict(reference_date),
+            )
+            .filter(**link_filter)
+            .annotate(_source_hub_id=F(f"{link_path}__{hub_db_field_name}"))
+        )
+
+    def build_batch(
+        self, reference_date: timezone.datetime, hub_ids: list[int]
+    ) -> QuerySet:
+        """Return the aggregated field per hub as _source_hub_id and <field>agg
+        rows, grouped by the hub instead of aggregated in a subquery per row."""
+        query = self.build_batch_query(reference_date, hub_ids).annotate(
+            **{self.field + "sub": F(self.field)}
+        )
+        if not self._is_multiple_allowed(self._hub_field_to):
+            query = query.annotate(**{self.field + "agg": F(self.field + "sub")})
+        elif self.agg_func == LinkAggFunctionEnum.LATEST:
+            query = query.values("_source_hub_id")
+            # The subquery takes the first value in ascending order
+            query = query.annotate(**{self.field + "agg": Min(self.field + "sub")})
+        else:
+            query = self._annotate_agg_field(
+                self._hub_field_to, query.values("_source_hub_id")
+            )
+        return query.values("_source_hub_id", self.field + "agg")
+
+    def build_batch_fields(
+        self, reference_date: timezone.datetime, hub_ids: list[int], fields: list[str]
+    ) -> QuerySet:
+        """Return the fields of the scalar linked satellite per hub."""
+        return self.build_batch_query(reference_date, hub_ids).values(
+            "_source_hub_id", *fields
+        )
+
     def _get_subquery(
         self, hub_a: str, hub_b: str, reference_date: timezone.datetime
     ) -> Subquery:
@@ -997,6 +1167,23 @@ class LinkedHubPairedJsonSubqueryBuilder(LinkedSatelliteSubqueryBuilderBase):
         return Subquery(query)
 
 
+def refers_to_outer_query(value: Any) -> bool:
+    """Whether a filter or expression references a column of an outer query."""
+    if isinstance(value, Q):
+        return any(
+            refers_to_outer_query(child[1] if isinstance(child, tuple) else child)
+            for child in value.children
+        )
+    if isinstance(value, OuterRef | ResolvedOuterRef):
+        return True
+    if hasattr(value, "get_source_expressions"):
+        return any(
+            refers_to_outer_query(expression)
+            for expression in value.get_source_expressions()
+        )
+    return False
+
+
 class StringAgg(Func):
     function = "STRING_AGG"
 
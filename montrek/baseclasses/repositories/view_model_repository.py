@@ -1,12 +1,20 @@
 import datetime
 import logging
 import time
+from collections.abc import Collection
 from copy import deepcopy
 from typing import Any
 
-from baseclasses.models import MontrekHubABC, MontrekSatelliteBaseABC
-from baseclasses.repositories.db.db_staller import DbStaller, StalledSatelliteDict
-from django.db import models, transaction
+from baseclasses.models import (
+    MontrekHubABC,
+    MontrekSatelliteBaseABC,
+    ViewModelRefresh,
+)
+from baseclasses.repositories.annotator import Annotator
+from baseclasses.repositories.db.db_staller import DbStaller
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models, router, transaction
+from django.db.models import Q
 from django.db.utils import IntegrityError
 from django.utils import timezone
 from psycopg2.errors import UniqueViolation
@@ -16,6 +24,9 @@ logger = logging.getLogger(__name__)
 
 class ViewModelRepository:
     MAX_RETRIES = 3
+    # Backends that can populate the view model server side; all others
+    # round-trip the rows through Python.
+    INSERT_FROM_SELECT_VENDORS = {"postgresql", "sqlite"}
 
     def __init__(self, view_model: None | type[models.Model]):
         self.view_model = view_model
@@ -87,6 +98,38 @@ class ViewModelRepository:
         query_update = query.filter(hub_entity_id__in=updated_hub_ids)
         self.store_query_in_view_model(query_update, "update")
 
+    def store_changed_in_view_model(self, query: models.QuerySet, annotator: Annotator):
+        """Recompute only the rows of hubs whose data changed since the last refresh.
+
+        A hub counts as changed if the hub itself, one of its satellites, one of
+        its links or a linked hub's satellite was written after the last refresh
+        or crossed a state date boundary since then. Falls back to a full
+        refresh if no refresh has been recorded yet or if the annotations reach
+        other hubs via more than one link. Hard-deleted satellites and links are
+        only picked up by a full refresh.
+        """
+        if not self.view_model:
+            return
+        last_refresh = ViewModelRefresh.objects.filter(
+            view_model_table=self.view_model._meta.db_table
+        ).first()
+        refresh_start = timezone.now()
+        hub_ids = None
+        if last_refresh is not None:
+            hub_ids = self._collect_changed_hub_ids(
+                annotator, last_refresh.refreshed_at, refresh_start
+            )
+        if hub_ids is None:
+            self.store_query_in_view_model(query)
+            return
+        self._debug_logging(f"Refresh {len(hub_ids)} changed hubs")
+        with transaction.atomic():
+            self.view_model.objects.filter(hub_entity_id__in=hub_ids).delete()
+            self.store_query_in_view_model(
+                query.filter(hub_entity_id__in=hub_ids), "create"
+            )
+        self._set_refreshed_at(refresh_start)
+
     # ───────────────────────────────────────────────
     # Private helpers
     # ───────────────────────────────────────────────
@@ -100,7 +143,7 @@ class ViewModelRepository:
         """Gather hub IDs that are newly created or belong to new satellites."""
         hub_ids = [hub.pk for hub in db_staller.get_hubs().get(hub_class, [])]
 
-        hub_ids += self._get_satellite_hub_ids(db_staller.get_new_satellites())
+        hub_ids += self._get_satellite_hub_ids(db_staller.get_new_satellite_ids())
         return hub_ids
 
     def _delete_updated_hubs(
@@ -118,12 +161,19 @@ class ViewModelRepository:
         hub_ids = []
 
         # Satellites
-        hub_ids += self._get_satellite_hub_ids(db_staller.get_updated_satellites())
+        updated_satellite_ids = {
+            sat_class: [sat.id for sat in satellites]
+            for sat_class, satellites in db_staller.get_updated_satellites().items()
+        }
+        hub_ids += self._get_satellite_hub_ids(updated_satellite_ids)
 
         # Links (both existing and updated)
         for link_source in [db_staller.links, db_staller.updated_links]:
             for link_class, link_objs in link_source.items():
                 hub_ids += self._collect_link_hub_ids(link_class, link_objs, hub_class)
+        for link_class, staged_rows in db_staller.get_staged_links().items():
+            hub_field = self._get_link_hub_field(link_class, hub_class)
+            hub_ids += staged_rows.get_column(f"{hub_field}_id")
 
         return hub_ids
 
@@ -134,16 +184,105 @@ class ViewModelRepository:
         hub_class: type["MontrekHubABC"],
     ) -> list[int]:
         """Extract hub primary keys from a link class for the relevant hub_class."""
+        hub_field = self._get_link_hub_field(link_class, hub_class)
+        return [getattr(link, hub_field).pk for link in link_instances]
+
+    def _get_link_hub_field(
+        self, link_class: type[models.Model], hub_class: type["MontrekHubABC"]
+    ) -> str:
         # Determine whether the link’s `hub_in` or `hub_out` relates to the given hub_class
         hub_in_model = link_class.hub_in.field.related_model
-        hub_field = "hub_in" if hub_in_model == hub_class else "hub_out"
+        return "hub_in" if hub_in_model == hub_class else "hub_out"
 
-        return [getattr(link, hub_field).pk for link in link_instances]
+    def _collect_changed_hub_ids(
+        self,
+        annotator: Annotator,
+        since: datetime.datetime,
+        until: datetime.datetime,
+    ) -> set[int] | None:
+        """Collect IDs of hubs whose view model rows may be stale, or None if
+        the changes cannot be traced back to the hubs."""
+        changed = self._changed_since(since, until)
+        hub_class = annotator.hub_class
+        hub_ids = set(hub_class.objects.filter(changed).values_list("pk", flat=True))
+        hub_ids |= self._get_changed_satellite_hub_ids(
+            annotator.get_satellite_classes(), changed
+        )
+        linked_hub_classes = set()
+        for link_class in set(annotator.get_link_classes()):
+            for hub_field, other_field in [
+                ("hub_in", "hub_out"),
+                ("hub_out", "hub_in"),
+            ]:
+                if link_class.get_related_hub_class(hub_field) != hub_class:
+                    continue
+                other_hub_class = link_class.get_related_hub_class(other_field)
+                linked_hub_classes.add(other_hub_class)
+                other_hub_ids = self._get_changed_linked_hub_ids(
+                    annotator, other_hub_class, changed
+                )
+                link_query = link_class.objects.filter(
+                    changed | Q(**{f"{other_field}_id__in": other_hub_ids})
+                )
+                hub_ids |= set(link_query.values_list(f"{hub_field}_id", flat=True))
+        for satellite_class in annotator.get_linked_satellite_classes():
+            if satellite_class.get_related_hub_class() not in linked_hub_classes:
+                # Reached via parent links: changes are not traced through
+                # intermediate hubs.
+                return None
+        return hub_ids
 
-    def _get_satellite_hub_ids(self, sat_dict: StalledSatelliteDict) -> list[int]:
+    def _get_changed_linked_hub_ids(
+        self,
+        annotator: Annotator,
+        linked_hub_class: type[MontrekHubABC],
+        changed: Q,
+    ) -> set[int]:
+        hub_ids = set(
+            linked_hub_class.objects.filter(changed).values_list("pk", flat=True)
+        )
+        satellite_classes = [
+            satellite_class
+            for satellite_class in annotator.get_linked_satellite_classes()
+            if satellite_class.get_related_hub_class() == linked_hub_class
+        ]
+        hub_ids |= self._get_changed_satellite_hub_ids(satellite_classes, changed)
+        return hub_ids
+
+    def _get_changed_satellite_hub_ids(
+        self, satellite_classes: list[type[MontrekSatelliteBaseABC]], changed: Q
+    ) -> set[int]:
+        hub_ids = set()
+        for sat_class in satellite_classes:
+            hub_str = (
+                "hub_value_date__hub_id" if sat_class.is_timeseries else "hub_entity_id"
+            )
+            hub_ids |= set(
+                sat_class.objects.filter(changed).values_list(hub_str, flat=True)
+            )
+        return hub_ids
+
+    @staticmethod
+    def _changed_since(since: datetime.datetime, until: datetime.datetime) -> Q:
+        # Rows that were written, or whose validity started or ended, between
+        # the last refresh and now.
+        return (
+            Q(updated_at__gt=since)
+            | Q(state_date_start__gt=since, state_date_start__lte=until)
+            | Q(state_date_end__gt=since, state_date_end__lte=until)
+        )
+
+    def _set_refreshed_at(self, refreshed_at: datetime.datetime):
+        ViewModelRefresh.objects.update_or_create(
+            view_model_table=self.view_model._meta.db_table,
+            defaults={"refreshed_at": refreshed_at},
+        )
+
+    def _get_satellite_hub_ids(
+        self, sat_ids_dict: dict[type[MontrekSatelliteBaseABC], list[int]]
+    ) -> list[int]:
         hub_ids = []
-        for sat_class, satellites in sat_dict.items():
-            sat_ids = [sat.id for sat in satellites]
+        for sat_class, sat_ids in sat_ids_dict.items():
             sat_query = sat_class.objects.filter(id__in=sat_ids)
             hub_str = (
                 "hub_value_date__hub_id" if sat_class.is_timeseries else "hub_entity_id"
@@ -153,6 +292,7 @@ class ViewModelRepository:
 
     def store_query_in_view_model(self, query: models.QuerySet, mode: str = "all"):
         self._debug_logging("Start store_query_in_view_model")
+        refresh_start = timezone.now()
         for attempt in range(self.MAX_RETRIES):
             try:
                 with transaction.atomic():
@@ -164,8 +304,55 @@ class ViewModelRepository:
                         "Maximum number of retries exceeded when storing to the view model due to repeated integrity errors."
                     ) from err
                 time.sleep(0.1)  # brief backoff
+        if mode == "all":
+            self._set_refreshed_at(refresh_start)
 
     def _try_store_query_in_view_model(self, query: models.QuerySet, mode: str = "all"):
+        if mode == "all":
+            self.view_model.objects.all().delete()
+        elif mode in {"create", "update"}:
+            self.view_model.objects.filter(
+                pk__in=query.order_by().values("pk")
+            ).delete()
+        if self._can_insert_from_select(query):
+            self._insert_from_select(query)
+        else:
+            self._bulk_create_from_query(query)
+        self._debug_logging("End store_query_in_view_model")
+
+    def _can_insert_from_select(self, query: models.QuerySet) -> bool:
+        db = router.db_for_write(self.view_model)
+        return (
+            query.db == db and connections[db].vendor in self.INSERT_FROM_SELECT_VENDORS
+        )
+
+    def _insert_from_select(self, query: models.QuerySet):
+        """Populate the view model with a single INSERT INTO ... SELECT, so that
+        the rows never pass through Python."""
+        db = router.db_for_write(self.view_model)
+        quote_name = connections[db].ops.quote_name
+        source_names = {field.attname for field in query.model._meta.concrete_fields}
+        source_names |= set(query.query.annotation_select)
+        fields = [
+            field
+            for field in self.view_model._meta.concrete_fields
+            if field.attname in source_names
+        ]
+        source_query = query.order_by().values(*[field.attname for field in fields])
+        try:
+            source_sql, params = source_query.query.get_compiler(db).as_sql()
+        except EmptyResultSet:
+            return
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        source_columns = ", ".join(quote_name(field.attname) for field in fields)
+        sql = (
+            f"INSERT INTO {quote_name(self.view_model._meta.db_table)} ({columns}) "
+            f"SELECT {source_columns} FROM ({source_sql}) AS {quote_name('source')}"
+        )
+        with connections[db].cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def _bulk_create_from_query(self, query: models.QuerySet):
         data = list(query.values())
         for row in data:
             if row["value_date"]:
@@ -174,19 +361,7 @@ class ViewModelRepository:
                     timezone.get_current_timezone(),
                 )
         instances = [self.view_model(**item) for item in data]
-        if mode == "all":
-            self.view_model.objects.all().delete()
-            self.view_model.objects.bulk_create(instances, batch_size=1000)
-        elif mode in {"create", "update"}:
-            if instances:
-                self.view_model.objects.filter(
-                    pk__in=[inst.pk for inst in instances]
-                ).delete()
-            self.view_model.objects.bulk_create(
-                instances,
-                batch_size=1000,
-            )
-        self._debug_logging("End store_query_in_view_model")
+        self.view_model.objects.bulk_create(instances, batch_size=1000)
 
     def delete_from_view_model(self, obj: MontrekHubABC):
         if not self.view_model:
@@ -194,5 +369,10 @@ class ViewModelRepository:
         deleted_object = self.view_model.objects.filter(hub_entity_id=obj.pk)
         deleted_object.delete()
 
+    def delete_hubs_from_view_model(self, hub_ids: Collection[int]):
+        if not self.view_model:
+            return
+        self.view_model.objects.filter(hub_entity_id__in=hub_ids).delete()
+
     def _debug_logging(self, msg: str):
         logger.debug("%s: %s", self.__class__.__name__, msg)
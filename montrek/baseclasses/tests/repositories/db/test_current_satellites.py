@@ -0,0 +1,95 @@
+from io import StringIO
+from unittest.mock import patch
+
+from baseclasses.models import (
+    CurrentSatellite,
+    TestMontrekHub,
+    TestMontrekSatellite,
+)
+from baseclasses.repositories.annotator import Annotator
+from baseclasses.repositories.db.current_satellites import (
+    rebuild_current_satellites,
+    refresh_current_satellites,
+)
+from baseclasses.repositories.db.db_staller import DbStaller
+from baseclasses.repositories.db.db_writer import DbWriter
+from baseclasses.repositories.query_builder import QueryBuilder
+from baseclasses.repositories.subquery_builder import SatelliteSubqueryBuilder
+from baseclasses.tests.factories.baseclass_factories import (
+    TestMontrekSatelliteFactory,
+)
+from baseclasses.utils import montrek_time
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+
+@patch.object(TestMontrekSatellite, "keep_current_state", True)
+class TestCurrentSatellites(TestCase):
+    def _build_queryset(self, reference_date, current_state):
+        annotator = Annotator(TestMontrekHub)
+        annotator.subquery_builder_to_annotations(
+            ["test_name"], TestMontrekSatellite, SatelliteSubqueryBuilder
+        )
+        query_builder = QueryBuilder(annotator, {})
+        return query_builder.build_queryset(reference_date, current_state=current_state)
+
+    def test_refresh_keeps_versions_not_closed(self):
+        old_sat = TestMontrekSatelliteFactory.create(
+            test_name="Old", state_date_end=montrek_time(2024, 11, 7)
+        )
+        new_sat = TestMontrekSatelliteFactory.create(
+            hub_entity=old_sat.hub_entity,
+            test_name="New",
+            state_date_start=montrek_time(2024, 11, 7),
+        )
+        refresh_current_satellites(TestMontrekSatellite, [old_sat.hub_entity_id])
+        current_sats = CurrentSatellite.objects.all()
+        self.assertEqual(len(current_sats), 1)
+        self.assertEqual(current_sats[0].satellite_id, new_sat.pk)
+        self.assertEqual(current_sats[0].hub_id, new_sat.hub_entity_id)
+
+    def test_refresh_skipped_without_keep_current_state(self):
+        sat = TestMontrekSatelliteFactory.create(test_name="Name")
+        with patch.object(TestMontrekSatellite, "keep_current_state", False):
+            refresh_current_satellites(TestMontrekSatellite, [sat.hub_entity_id])
+        self.assertFalse(CurrentSatellite.objects.exists())
+
+    def test_db_writer_refreshes_current_satellites(self):
+        annotator = Annotator(TestMontrekHub)
+        annotator.annotated_satellite_classes = [TestMontrekSatellite]
+        db_staller = DbStaller(annotator)
+        new_hub = TestMontrekHub()
+        new_sat = TestMontrekSatellite(
+            hub_entity=new_hub, test_name="Name", test_date=montrek_time(2023, 6, 1)
+        )
+        db_staller.stall_hub(new_hub)
+        db_staller.stall_new_satellite(new_sat)
+        DbWriter(db_staller).write()
+        current_sat = CurrentSatellite.objects.get()
+        self.assertEqual(current_sat.satellite_id, new_sat.pk)
+        self.assertEqual(current_sat.hub_id, new_hub.pk)
+
+    def test_current_state_matches_history(self):
+        sat = TestMontrekSatelliteFactory.create(
+            test_name="Old", state_date_end=montrek_time(2024, 11, 7)
+        )
+        TestMontrekSatelliteFactory.create(
+            hub_entity=sat.hub_entity,
+            test_name="New",
+            state_date_start=montrek_time(2024, 11, 7),
+        )
+        rebuild_current_satellites(TestMontrekSatellite)
+        reference_date = timezone.now()
+        current_query = self._build_queryset(reference_date, current_state=True)
+        history_query = self._build_queryset(reference_date, current_state=False)
+        self.assertIn("baseclasses_currentsatellite", str(current_query.query))
+        self.assertEqual(current_query.get().test_name, "New")
+        self.assertEqual(history_query.get().test_name, "New")
+
+    def test_rebuild_command(self):
+        TestMontrekSatelliteFactory.create(test_name="Name")
+        stdout = StringIO()
+        call_command("rebuild_current_satellites", stdout=stdout)
+        self.assertEqual(CurrentSatellite.objects.count(), 1)
+        self.assertIn("baseclasses.TestMontrekSatellite", stdout.getvalue())
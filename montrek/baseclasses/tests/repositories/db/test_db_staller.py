@@ -1,7 +1,14 @@
 from django.test import TestCase
+from django.utils import timezone
 from baseclasses.repositories.db.db_staller import DbStaller
 
-from baseclasses.models import TestMontrekHub, TestMontrekSatellite
+from baseclasses.models import (
+    TestHubValueDate,
+    TestMontrekHub,
+    TestMontrekSatellite,
+    TestMontrekTimeSeriesSatellite,
+    ValueDateList,
+)
 from baseclasses.repositories.annotator import Annotator
 
 
@@ -46,3 +53,96 @@ class TestDbStallerNewHub(TestCase):
         db_staller_new_hubs = db_staller.get_hubs()[new_hub.__class__]
         self.assertEqual(len(db_staller_new_hubs), 1)
         self.assertEqual(db_staller_new_hubs[0], new_hub)
+
+
+class TestDbStallerCompact(TestCase):
+    def setUp(self):
+        self.db_staller = DbStaller(MockAnnotator(TestMontrekHub))
+        self.value_date_list = ValueDateList.objects.create(value_date=None)
+
+    def stall_row(self, hub: TestMontrekHub) -> TestMontrekTimeSeriesSatellite:
+        hub_value_date = TestHubValueDate(hub=hub, value_date_list=self.value_date_list)
+        self.db_staller.stall_hub_value_date(hub_value_date)
+        self.db_staller.stall_new_satellite(
+            TestMontrekSatellite(hub_entity=hub, test_name="name")
+        )
+        ts_satellite = TestMontrekTimeSeriesSatellite(
+            hub_value_date=hub_value_date, test_decimal=1
+        )
+        self.db_staller.stall_new_satellite(ts_satellite)
+        return ts_satellite
+
+    def test_compact_moves_new_objects_to_staged_rows(self):
+        hub = TestMontrekHub()
+        self.db_staller.stall_hub(hub)
+        self.stall_row(hub)
+
+        self.db_staller.compact()
+
+        self.assertEqual(self.db_staller.get_hub_value_dates()[TestHubValueDate], [])
+        self.assertEqual(self.db_staller.get_new_satellites()[TestMontrekSatellite], [])
+        staged_hub_value_dates = self.db_staller.get_staged_hub_value_dates()[
+            TestHubValueDate
+        ]
+        staged_ts_satellites = self.db_staller.get_staged_satellites()[
+            TestMontrekTimeSeriesSatellite
+        ]
+        self.assertEqual(len(staged_hub_value_dates), 1)
+        self.assertEqual(len(staged_ts_satellites), 1)
+
+        hub.save()
+        staged_hub_value_dates.set_pks(0, [42])
+
+        self.assertEqual(staged_hub_value_dates.get_column("hub_id"), [hub.pk])
+        self.assertEqual(
+            self.db_staller.get_staged_satellites()[TestMontrekSatellite].get_column(
+                "hub_entity_id"
+            ),
+            [hub.pk],
+        )
+        self.assertEqual(staged_ts_satellites.get_column("hub_value_date_id"), [42])
+
+    def test_compact_keeps_objects_referring_to_unknown_unsaved_objects(self):
+        ts_satellite = self.stall_row(TestMontrekHub())
+
+        self.db_staller.compact()
+
+        self.assertEqual(
+            self.db_staller.get_new_satellites()[TestMontrekTimeSeriesSatellite],
+            [ts_satellite],
+        )
+        self.assertEqual(
+            len(self.db_staller.get_hub_value_dates()[TestHubValueDate]), 1
+        )
+        self.assertEqual(
+            len(self.db_staller.get_new_satellites()[TestMontrekSatellite]), 1
+        )
+
+    def test_compact_keeps_objects_loaded_from_db(self):
+        hub = TestMontrekHub.objects.create()
+        satellite = TestMontrekSatellite.objects.create(
+            hub_entity=hub, test_name="name", test_date=timezone.now()
+        )
+        satellite.pk = None
+        self.db_staller.stall_new_satellite(satellite)
+
+        self.db_staller.compact()
+
+        self.assertEqual(
+            self.db_staller.get_new_satellites()[TestMontrekSatellite], [satellite]
+        )
+
+    def test_get_new_satellite_ids(self):
+        hub = TestMontrekHub.objects.create()
+        self.db_staller.stall_new_satellite(
+            TestMontrekSatellite(hub_entity=hub, test_name="staged")
+        )
+        self.db_staller.compact()
+        self.db_staller.get_staged_satellites()[TestMontrekSatellite].set_pks(0, [7])
+        self.db_staller.stall_new_satellite(
+            TestMontrekSatellite(id=8, hub_entity=hub, test_name="instance")
+        )
+
+        self.assertEqual(
+            self.db_staller.get_new_satellite_ids()[TestMontrekSatellite], [8, 7]
+        )
@@ -1,6 +1,6 @@
 from django.test import TestCase
 from baseclasses.repositories.db.db_staller import DbStaller
-from baseclasses.repositories.db.db_writer import DbWriter
+from baseclasses.repositories.db.db_writer import CopyDbWriter, DbWriter
 from baseclasses.repositories.annotator import Annotator
 
 from baseclasses.models import TestMontrekSatellite, TestMontrekHub
@@ -30,3 +30,33 @@ class TestDbWriter(TestCase):
         new_sats = TestMontrekSatellite.objects.all()
         self.assertEqual(len(new_sats), 1)
         self.assertEqual(new_sats[0], new_sat)
+
+
+class TestCopyDbWriter(TestCase):
+    def setUp(self):
+        annotator = MockAnnotator(TestMontrekHub)
+        self.db_staller = DbStaller(annotator)
+
+    def test_copy_db_writer__write_new_hub_and_satellite(self):
+        new_hub = TestMontrekHub()
+        new_sat = TestMontrekSatellite(
+            hub_entity=new_hub,
+            test_name="test",
+            test_text="multi\nline, text",
+            test_date=montrek_time(2023, 6, 1),
+        )
+        self.db_staller.stall_hub(new_hub)
+        self.db_staller.stall_new_satellite(new_sat)
+        db_writer = CopyDbWriter(self.db_staller)
+        db_writer.write()
+        self.assertIsNotNone(new_hub.pk)
+        self.assertFalse(new_sat._state.adding)
+        new_sats = TestMontrekSatellite.objects.all()
+        self.assertEqual(len(new_sats), 1)
+        self.assertEqual(new_sats[0], new_sat)
+        self.assertEqual(new_sats[0].hub_entity, new_hub)
+        self.assertEqual(new_sats[0].test_text, "multi\nline, text")
+        self.assertIsNone(new_sats[0].test_value)
+        self.assertEqual(new_sats[0].hash_identifier, new_sat.get_hash_identifier)
+        # The sequence continues after the copied rows
+        self.assertGreater(TestMontrekHub.objects.create().pk, new_hub.pk)
@@ -0,0 +1,103 @@
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from baseclasses.models import (
+    LatestHubValueDate,
+    TestHubValueDate,
+    TestMontrekHub,
+    TestMontrekTimeSeriesSatellite,
+)
+from baseclasses.repositories.annotator import Annotator
+from baseclasses.repositories.db.db_staller import DbStaller
+from baseclasses.repositories.db.db_writer import DbWriter
+from baseclasses.repositories.db.latest_hub_value_dates import (
+    rebuild_latest_hub_value_dates,
+    refresh_latest_hub_value_dates,
+)
+from baseclasses.repositories.query_builder import QueryBuilder
+from baseclasses.repositories.subquery_builder import TSSatelliteSubqueryBuilder
+from baseclasses.tests.factories.baseclass_factories import (
+    TestHubValueDateFactory,
+    TestMontrekHubFactory,
+    TestMontrekTimeSeriesSatelliteFactory,
+)
+from baseclasses.tests.factories.montrek_factory_schemas import ValueDateListFactory
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+
+@patch.object(TestHubValueDate, "keep_latest_value_date", True)
+class TestLatestHubValueDates(TestCase):
+    def _build_queryset(self):
+        annotator = Annotator(TestMontrekHub)
+        annotator.subquery_builder_to_annotations(
+            ["test_decimal"], TestMontrekTimeSeriesSatellite, TSSatelliteSubqueryBuilder
+        )
+        return QueryBuilder(annotator, {}, latest_ts=True).build_queryset(
+            timezone.now()
+        )
+
+    def _create_hub_with_two_dates(self) -> TestHubValueDate:
+        sat_old = TestMontrekTimeSeriesSatelliteFactory.create(
+            value_date=datetime.date(2024, 1, 15)
+        )
+        vdl_new = ValueDateListFactory.create(value_date=datetime.date(2024, 1, 20))
+        hvd_new = TestHubValueDateFactory.create(
+            hub=sat_old.hub_value_date.hub, value_date_list=vdl_new
+        )
+        TestMontrekTimeSeriesSatelliteFactory.create(hub_value_date=hvd_new)
+        return hvd_new
+
+    def test_refresh_points_to_latest_value_date(self):
+        hvd_new = self._create_hub_with_two_dates()
+        refresh_latest_hub_value_dates(TestHubValueDate, [hvd_new.hub_id])
+        pointer = LatestHubValueDate.objects.get(hub_id=hvd_new.hub_id)
+        self.assertEqual(pointer.hub_value_date_id, hvd_new.pk)
+
+    def test_refresh_points_to_null_value_date_without_other(self):
+        hub = TestMontrekHubFactory.create()
+        refresh_latest_hub_value_dates(TestHubValueDate, [hub.pk])
+        pointer = LatestHubValueDate.objects.get(hub_id=hub.pk)
+        self.assertEqual(pointer.hub_value_date_id, hub.get_hub_value_date().pk)
+
+    def test_latest_ts_reads_pointer(self):
+        hvd_new = self._create_hub_with_two_dates()
+        hub = TestMontrekHubFactory.create()
+        rebuild_latest_hub_value_dates(TestHubValueDate)
+        queryset = self._build_queryset()
+        self.assertIn("baseclasses_latesthubvaluedate", str(queryset.query))
+        self.assertEqual(
+            queryset.get(hub=hvd_new.hub).value_date, datetime.date(2024, 1, 20)
+        )
+        self.assertIsNone(queryset.get(hub=hub).value_date)
+        with patch.object(TestHubValueDate, "keep_latest_value_date", False):
+            history_query = self._build_queryset()
+        self.assertEqual(
+            sorted(queryset.values_list("pk", flat=True)),
+            sorted(history_query.values_list("pk", flat=True)),
+        )
+
+    def test_db_writer_refreshes_pointer(self):
+        annotator = Annotator(TestMontrekHub)
+        db_staller = DbStaller(annotator)
+        new_hub = TestMontrekHub()
+        value_date_list = ValueDateListFactory.create(
+            value_date=datetime.date(2024, 1, 15)
+        )
+        new_hub_value_date = TestHubValueDate(
+            hub=new_hub, value_date_list=value_date_list
+        )
+        db_staller.stall_hub(new_hub)
+        db_staller.stall_hub_value_date(new_hub_value_date)
+        DbWriter(db_staller).write()
+        pointer = LatestHubValueDate.objects.get(hub_id=new_hub.pk)
+        self.assertEqual(pointer.hub_value_date_id, new_hub_value_date.pk)
+
+    def test_rebuild_command(self):
+        TestMontrekHubFactory.create()
+        stdout = StringIO()
+        call_command("rebuild_latest_hub_value_dates", stdout=stdout)
+        self.assertEqual(LatestHubValueDate.objects.count(), 1)
+        self.assertIn("baseclasses.TestHubValueDate", stdout.getvalue())
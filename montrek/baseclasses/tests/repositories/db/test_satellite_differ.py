@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pandas as pd
+from baseclasses.models import (
+    TestMontrekSatellite,
+    TestMontrekTimeSeriesSatellite,
+)
+from baseclasses.repositories.db.satellite_differ import (
+    SatelliteDiffer,
+    SatelliteState,
+)
+from baseclasses.utils import montrek_time
+from django.test import TestCase
+
+
+class TestSatelliteDiffer(TestCase):
+    def setUp(self):
+        self.test_date = montrek_time(2024, 1, 1)
+        self.existing_sat = TestMontrekSatellite(
+            test_name="existing",
+            test_value="value",
+            test_text="",
+            test_decimal=1,
+            test_date=self.test_date,
+        )
+        self.existing_sat.hash_identifier = self.existing_sat.get_hash_identifier
+        self.existing_sat.hash_value = self.existing_sat.get_hash_value
+        cache = SimpleNamespace(
+            cached_satellites={
+                (TestMontrekSatellite, self.existing_sat.hash_identifier): (
+                    self.existing_sat
+                )
+            }
+        )
+        self.differ = SatelliteDiffer(TestMontrekSatellite, cache)
+
+    def test_can_diff(self):
+        columns = {"test_name", "test_value", "test_text", "test_decimal"}
+        self.assertFalse(self.differ.can_diff(columns))
+        self.assertTrue(self.differ.can_diff(columns | {"test_date"}))
+
+    def test_can_diff_time_series(self):
+        differ = SatelliteDiffer(
+            TestMontrekTimeSeriesSatellite, SimpleNamespace(cached_satellites={})
+        )
+        self.assertTrue(differ.can_diff({"value_date", "test_decimal"}))
+        self.assertFalse(differ.can_diff({"test_decimal"}))
+
+    def test_diff(self):
+        data_frame = pd.DataFrame(
+            {
+                "test_name": ["existing", "existing", "new", None],
+                "test_value": ["value", "changed", "value", None],
+                "test_text": ["", "", "", None],
+                "test_decimal": [1, 1, 1, None],
+                "test_date": [self.test_date] * 3 + [None],
+                "comment": ["not hashed", "", "", "only a comment"],
+            },
+            dtype=object,
+        )
+
+        diff = self.differ.diff(data_frame)
+
+        self.assertEqual(
+            diff.states.tolist(),
+            [
+                SatelliteState.UNCHANGED,
+                SatelliteState.UPDATED,
+                SatelliteState.NEW,
+                SatelliteState.EMPTY,
+            ],
+        )
+        self.assertEqual(
+            diff.existing_satellites,
+            [self.existing_sat, self.existing_sat, None, None],
+        )
@@ -0,0 +1,101 @@
+import datetime
+from decimal import Decimal
+
+import pandas as pd
+from baseclasses.models import (
+    TestMontrekSatellite,
+    TestMontrekSatelliteNoIdFields,
+    TestMontrekTimeSeriesSatellite,
+)
+from baseclasses.repositories.db.satellite_hasher import SatelliteHasher
+from baseclasses.utils import montrek_time
+from django.test import TestCase
+
+
+class TestSatelliteHasher(TestCase):
+    def setUp(self):
+        self.satellites = [
+            TestMontrekSatellite(
+                hub_entity_id=1,
+                test_name="name",
+                test_value="value",
+                test_text="some text",
+                test_decimal=Decimal("1.5000"),
+                test_date=montrek_time(2024, 1, 1, 12, 30),
+            ),
+            TestMontrekSatellite(
+                hub_entity_id=2,
+                test_name="other",
+                test_value=None,
+                test_decimal=2.25,
+                test_date=datetime.datetime(2024, 2, 1, tzinfo=datetime.UTC),
+                comment="not hashed",
+            ),
+        ]
+
+    def test_hash_satellites_matches_instance_hashes(self):
+        expected = [
+            (satellite.get_hash_identifier, satellite.get_hash_value)
+            for satellite in self.satellites
+        ]
+        for satellite in self.satellites:
+            satellite.hash_identifier = ""
+            satellite.hash_value = ""
+
+        SatelliteHasher(TestMontrekSatellite).hash_satellites(self.satellites)
+
+        result = [
+            (satellite.hash_identifier, satellite.hash_value)
+            for satellite in self.satellites
+        ]
+        self.assertEqual(result, expected)
+
+    def test_hash_satellites_time_series(self):
+        satellites = [
+            TestMontrekTimeSeriesSatellite(
+                hub_value_date_id=i,
+                test_decimal=i,
+                value_date=datetime.date(2024, 1, i),
+            )
+            for i in range(1, 4)
+        ]
+        expected = [satellite.get_hash_identifier for satellite in satellites]
+
+        SatelliteHasher(TestMontrekTimeSeriesSatellite).hash_satellites(satellites)
+
+        self.assertEqual([s.hash_identifier for s in satellites], expected)
+
+    def test_hash_satellites_requires_identifier_fields(self):
+        with self.assertRaises(AttributeError):
+            SatelliteHasher(TestMontrekSatelliteNoIdFields).hash_satellites(
+                [TestMontrekSatelliteNoIdFields()]
+            )
+
+    def test_hash_identifiers_from_typed_data_frame(self):
+        data_frame = pd.DataFrame(
+            {
+                "test_name": ["name", None],
+                "test_date": pd.to_datetime(["2024-01-01 12:30", None]).tz_localize(
+                    "UTC"
+                ),
+            }
+        )
+        expected = [
+            TestMontrekSatellite(
+                test_name="name", test_date=montrek_time(2024, 1, 1, 12, 30)
+            ).get_hash_identifier,
+            TestMontrekSatellite(test_name=None, test_date=None).get_hash_identifier,
+        ]
+
+        result = SatelliteHasher(TestMontrekSatellite).hash_identifiers(data_frame)
+
+        self.assertEqual(result.tolist(), expected)
+
+    def test_missing_columns_hash_as_empty_string(self):
+        data_frame = pd.DataFrame({"test_name": ["name"]})
+
+        result = SatelliteHasher(TestMontrekSatellite).hash_identifiers(data_frame)
+
+        self.assertEqual(
+            result.tolist(), [TestMontrekSatellite.convert_string_to_hash("name")]
+        )
@@ -0,0 +1,87 @@
+from io import StringIO
+from unittest.mock import patch
+
+from baseclasses.repositories.index_advisor import (
+    get_existing_indexes,
+    get_point_in_time_indexes,
+    get_repository_classes,
+    get_repository_sql,
+    is_covered,
+    recommend_indexes,
+)
+from django.core.management import call_command
+from django.test import TestCase
+from montrek_example.models import example_models as me_models
+from montrek_example.repositories.hub_a_repository import HubARepository2
+from montrek_example.repositories.hub_c_repository import HubCRepository
+
+
+class TestIndexAdvisor(TestCase):
+    def test_point_in_time_indexes(self):
+        self.assertEqual(
+            get_point_in_time_indexes(me_models.SatC1),
+            [("hub_entity_id", "state_date_end", "state_date_start")],
+        )
+        self.assertEqual(
+            get_point_in_time_indexes(me_models.SatTSC2),
+            [("hub_value_date_id", "state_date_end", "state_date_start")],
+        )
+        self.assertEqual(
+            get_point_in_time_indexes(me_models.LinkHubAHubC),
+            [
+                ("hub_in_id", "state_date_end", "state_date_start"),
+                ("hub_out_id", "state_date_end", "state_date_start"),
+            ],
+        )
+        self.assertEqual(get_point_in_time_indexes(me_models.HubC), [])
+
+    def test_base_models_provide_point_in_time_indexes(self):
+        for model in (me_models.SatC1, me_models.SatTSC2, me_models.LinkHubAHubC):
+            existing_indexes = get_existing_indexes(model._meta.db_table)
+            for columns in get_point_in_time_indexes(model):
+                self.assertTrue(is_covered(columns, existing_indexes))
+
+    def test_is_covered(self):
+        indexes = [("hub_entity_id", "state_date_end", "state_date_start")]
+        self.assertTrue(is_covered(("hub_entity_id",), indexes))
+        self.assertFalse(is_covered(("state_date_end",), indexes))
+
+    def test_recommend_indexes(self):
+        sql_by_repository = {
+            "HubCRepository": get_repository_sql(HubCRepository),
+            "HubARepository2": get_repository_sql(HubARepository2),
+        }
+        self.assertEqual(recommend_indexes(sql_by_repository), [])
+
+        satc1_table = me_models.SatC1._meta.db_table
+        with patch(
+            "baseclasses.repositories.index_advisor.get_existing_indexes",
+            return_value=[("hub_entity_id",)],
+        ):
+            recommendations = recommend_indexes(sql_by_repository)
+        satc1_recommendation = next(
+            recommendation
+            for recommendation in recommendations
+            if recommendation.table == satc1_table
+        )
+        self.assertEqual(
+            satc1_recommendation.columns,
+            ("hub_entity_id", "state_date_end", "state_date_start"),
+        )
+        self.assertEqual(
+            satc1_recommendation.repositories, ["HubCRepository", "HubARepository2"]
+        )
+        self.assertIn(satc1_table, satc1_recommendation.get_sql())
+
+    def test_command(self):
+        with patch(
+            "baseclasses.management.commands.recommend_indexes.get_repository_classes",
+            return_value=[HubCRepository],
+        ):
+            stdout = StringIO()
+            call_command("recommend_indexes", stdout=stdout)
+        self.assertIn("No missing indexes found.", stdout.getvalue())
+
+    def test_repository_classes(self):
+        repository_classes = get_repository_classes()
+        self.assertIn(HubCRepository, repository_classes)
@@ -4,10 +4,17 @@ from django.db.models import Q
 from django.test import TestCase
 from django.utils import timezone
 
-from baseclasses.models import TestMontrekHub, TestMontrekSatellite
+from baseclasses.models import (
+    TestMontrekHub,
+    TestMontrekSatellite,
+    TestMontrekTimeSeriesSatellite,
+)
 from baseclasses.repositories.montrek_repository import MontrekRepository
 from baseclasses.tests.factories.baseclass_factories import TestMontrekSatelliteFactory
 from baseclasses.tests.factories.baseclass_factories import TestMontrekHubFactory
+from baseclasses.tests.factories.baseclass_factories import (
+    TestMontrekTimeSeriesSatelliteFactory,
+)
 
 
 class MockMontrekRepository(MontrekRepository):
@@ -29,6 +36,16 @@ class TestRepository(MontrekRepository):
         )
 
 
+class TestTSRepository(MontrekRepository):
+    hub_class = TestMontrekHub
+
+    def set_annotations(self):
+        self.add_satellite_fields_annotations(
+            TestMontrekTimeSeriesSatellite,
+            ["test_decimal"],
+        )
+
+
 class TestMontrekRepository(TestCase):
     def test_set_annotation_riases_error(self):
         with self.assertRaises(NotImplementedError) as cm:
@@ -121,6 +138,26 @@ class TestMontrekRepository(TestCase):
             ["MMM", "AAA", "ZZZ"],
         )
 
+    def test_set_value_date_window(self):
+        sat = TestMontrekTimeSeriesSatelliteFactory.create(
+            value_date=datetime.date(2024, 1, 15)
+        )
+        TestMontrekTimeSeriesSatelliteFactory.create(
+            hub_value_date__hub=sat.hub_value_date.hub,
+            value_date=datetime.date(2024, 3, 15),
+        )
+        repository = TestTSRepository()
+        self.assertEqual(repository.receive().count(), 2)
+        repository.set_value_date_window(
+            datetime.date(2024, 3, 1), datetime.date(2024, 3, 31)
+        )
+        self.assertEqual(
+            list(repository.receive().values_list("value_date", flat=True)),
+            [datetime.date(2024, 3, 15)],
+        )
+        repository.set_value_date_window()
+        self.assertEqual(repository.receive().count(), 2)
+
     def test_get_hub_from_data(self):
         test_hub = TestMontrekHubFactory.create()
         montrek_repo = TestRepository()
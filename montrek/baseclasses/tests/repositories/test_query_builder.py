@@ -1,5 +1,6 @@
 import datetime
 
+from django.db.models import Q
 from django.test import TestCase
 from django.utils import timezone
 
@@ -12,7 +13,7 @@ from baseclasses.models import (
 from baseclasses.repositories.annotator import (
     Annotator,
 )
-from baseclasses.repositories.query_builder import QueryBuilder
+from baseclasses.repositories.query_builder import QueryBuilder, estimate_row_count
 from baseclasses.repositories.subquery_builder import (
     LinkedSatelliteSubqueryBuilder,
     SatelliteSubqueryBuilder,
@@ -285,3 +286,317 @@ class TestQueryBuilderLatestTs(TestCase):
 
         self.assertEqual(hub_rows.count(), 1)
         self.assertIsNotNone(hub_rows.first().value_date)
+
+
+class TestQueryBuilderSessionDates(TestCase):
+    def test_session_dates_restrict_rows_before_annotation(self):
+        annotator = Annotator(TestMontrekHub)
+        annotator.subquery_builder_to_annotations(
+            ["test_decimal"], TestMontrekTimeSeriesSatellite, TSSatelliteSubqueryBuilder
+        )
+        sat = TestMontrekTimeSeriesSatelliteFactory.create(
+            value_date=datetime.date(2024, 1, 15)
+        )
+        TestMontrekTimeSeriesSatelliteFactory.create(
+            hub_value_date__hub=sat.hub_value_date.hub,
+            value_date=datetime.date(2024, 3, 15),
+        )
+        query_builder = QueryBuilder(
+            annotator,
+            {},
+            session_start_date=montrek_time(2024, 3, 1),
+            session_end_date=montrek_time(2024, 3, 31),
+        )
+        queryset = query_builder.build_queryset(timezone.now())
+        self.assertEqual(queryset.get().value_date, datetime.date(2024, 3, 15))
+        # The window is applied to the joined value date list column
+        self.assertIn(
+            '"baseclasses_valuedatelist"."value_date" >=', str(queryset.query)
+        )
+
+
+class TestQueryBuilderJoinEngine(TestCase):
+    def _build_queryset(self, query_engine, reference_date=None):
+        annotator = Annotator(TestMontrekHub)
+        annotator.subquery_builder_to_annotations(
+            ["test_name", "test_value"], TestMontrekSatellite, SatelliteSubqueryBuilder
+        )
+        annotator.subquery_builder_to_annotations(
+            ["test_decimal"], TestMontrekTimeSeriesSatellite, TSSatelliteSubqueryBuilder
+        )
+        query_builder = QueryBuilder(annotator, {}, query_engine=query_engine)
+        return query_builder.build_queryset(reference_date or timezone.now())
+
+    def test_join_engine_matches_subquery_engine(self):
+        sat = TestMontrekSatelliteFactory.create(test_name="Test Name", test_value=3)
+        TestMontrekTimeSeriesSatelliteFactory.create(
+            hub_value_date__hub=sat.hub_entity,
+            value_date=datetime.date(2024, 1, 15),
+            test_decimal=1.5,
+        )
+        fields = ["hub_id", "value_date", "test_name", "test_value", "test_decimal"]
+        subquery_rows = list(
+            self._build_queryset("subquery").order_by("value_date").values(*fields)
+        )
+        join_rows = list(
+            self._build_queryset("join").order_by("value_date").values(*fields)
+        )
+        self.assertEqual(len(join_rows), 1)
+        self.assertEqual(join_rows, subquery_rows)
+
+    def test_join_engine_uses_joins(self):
+        TestMontrekSatelliteFactory.create(test_name="Test Name")
+        sql = str(self._build_queryset("join").query)
+        self.assertIn("LEFT OUTER JOIN", sql)
+        self.assertNotIn('"test_name" FROM', sql)
+
+    def test_join_engine_respects_reference_date(self):
+        sat = TestMontrekSatelliteFactory.create(
+            test_name="Old Name", state_date_end=montrek_time(2024, 11, 7)
+        )
+        TestMontrekSatelliteFactory.create(
+            hub_entity=sat.hub_entity,
+            test_name="New Name",
+            state_date_start=montrek_time(2024, 11, 7),
+        )
+        old_query = self._build_queryset("join", montrek_time(2024, 11, 6))
+        new_query = self._build_queryset("join", montrek_time(2024, 11, 8))
+        self.assertEqual(old_query.get().test_name, "Old Name")
+        self.assertEqual(new_query.get().test_name, "New Name")
+
+    def test_join_engine_keeps_hubs_without_satellite(self):
+        hub = TestMontrekHubFactory.create()
+        test_query = self._build_queryset("join").filter(hub=hub)
+        self.assertEqual(test_query.count(), 1)
+        self.assertIsNone(test_query.first().test_name)
+
+    def test_unknown_query_engine_raises(self):
+        with self.assertRaises(ValueError):
+            QueryBuilder(Annotator(TestMontrekHub), {}, query_engine="lateral")
+
+
+class TestQueryBuilderCount(TestCase):
+    def setUp(self):
+        self.annotator = Annotator(TestMontrekHub)
+        self.annotator.subquery_builder_to_annotations(
+            ["test_name", "test_value"], TestMontrekSatellite, SatelliteSubqueryBuilder
+        )
+        self.annotator.subquery_builder_to_annotations(
+            ["test_decimal"], TestMontrekTimeSeriesSatellite, TSSatelliteSubqueryBuilder
+        )
+        self.reference_date = timezone.now()
+        sat = TestMontrekSatelliteFactory.create(test_name="Name 0", test_value=0)
+        for value_date in (datetime.date(2024, 1, 15), datetime.date(2024, 2, 15)):
+            TestMontrekTimeSeriesSatelliteFactory.create(
+                hub_value_date__hub=sat.hub_entity, value_date=value_date
+            )
+        TestMontrekSatelliteFactory.create(test_name="Name 1", test_value=1)
+        TestMontrekSatelliteFactory.create(
+            test_name="Closed", state_date_end=montrek_time(2024, 11, 7)
+        )
+
+    def assert_count_matches(self, query_builder: QueryBuilder):
+        self.assertEqual(
+            query_builder.build_count_queryset(self.reference_date).count(),
+            query_builder.build_queryset(self.reference_date).count(),
+        )
+
+    def test_count_matches_queryset(self):
+        self.assert_count_matches(QueryBuilder(self.annotator, {}))
+
+    def test_count_matches_queryset__latest_ts(self):
+        self.assert_count_matches(QueryBuilder(self.annotator, {}, latest_ts=True))
+
+    def test_count_matches_queryset__session_dates(self):
+        query_builder = QueryBuilder(
+            self.annotator,
+            {},
+            session_start_date=datetime.date(2024, 2, 1),
+            session_end_date=datetime.date(2024, 3, 1),
+        )
+        self.assert_count_matches(query_builder)
+
+    def test_count_matches_queryset__filter(self):
+        filter_dict = {
+            "filter": {
+                "": {"test_value__exact": {"filter_value": 0, "filter_negate": False}}
+            }
+        }
+        query_builder = QueryBuilder(self.annotator, filter_dict)
+        self.assert_count_matches(query_builder)
+        self.assertEqual(
+            query_builder.build_count_queryset(
+                self.reference_date, apply_filter=False
+            ).count(),
+            query_builder.build_queryset(
+                self.reference_date, apply_filter=False
+            ).count(),
+        )
+
+    def test_count_queryset_has_no_annotations(self):
+        query_builder = QueryBuilder(self.annotator, {})
+        count_queryset = query_builder.build_count_queryset(self.reference_date)
+        self.assertEqual(count_queryset.query.annotations, {})
+        self.assertNotIn("test_name", str(count_queryset.query))
+
+    def test_estimate_row_count(self):
+        query_builder = QueryBuilder(self.annotator, {})
+        estimate = estimate_row_count(
+            query_builder.build_count_queryset(self.reference_date)
+        )
+        self.assertIsInstance(estimate, int)
+
+
+class TestQueryBuilderFilterPushdown(TestCase):
+    def setUp(self):
+        self.annotator = Annotator(TestMontrekHub)
+        self.annotator.subquery_builder_to_annotations(
+            ["test_name", "test_value"],
+            TestMontrekSatellite,
+            SatelliteSubqueryBuilder,
+            rename_field_map={"test_value": "renamed_value"},
+        )
+        self.annotator.subquery_builder_to_annotations(
+            ["test_decimal"], TestMontrekTimeSeriesSatellite, TSSatelliteSubqueryBuilder
+        )
+        self.reference_date = timezone.now()
+        for i in range(3):
+            sat = TestMontrekSatelliteFactory.create(
+                test_name=f"Name {i}", test_value=i
+            )
+            TestMontrekTimeSeriesSatelliteFactory.create(
+                hub_value_date__hub=sat.hub_entity,
+                value_date=datetime.date(2024, 1, 15),
+                test_decimal=i,
+            )
+        TestMontrekSatelliteFactory.create(
+            test_name="Name 0",
+            test_value=0,
+            state_date_end=montrek_time(2024, 11, 7),
+        )
+        TestMontrekHubFactory.create()
+
+    def get_query_builder(self, filter_data: dict) -> QueryBuilder:
+        return QueryBuilder(self.annotator, {"filter": {"": filter_data}})
+
+    def get_names(self, filter_data: dict) -> list[str | None]:
+        query_builder = self.get_query_builder(filter_data)
+        queryset = query_builder.build_queryset(self.reference_date)
+        return sorted(queryset.values_list("test_name", flat=True), key=str)
+
+    def test_satellite_lookups_are_pushed_down(self):
+        query_builder = self.get_query_builder(
+            {
+                "renamed_value__gte": {"filter_value": 1, "filter_negate": False},
+                "test_decimal__lt": {"filter_value": 2, "filter_negate": False},
+            }
+        )
+        queryset, remaining_filter = query_builder._push_down_filter(
+            TestMontrekHub.hub_value_date.field.model.objects.all(),
+            self.reference_date,
+        )
+        self.assertEqual(remaining_filter, Q())
+        self.assertEqual(str(queryset.query).count("EXISTS"), 2)
+        self.assertEqual(
+            self.get_names(
+                {
+                    "renamed_value__gte": {"filter_value": 1, "filter_negate": False},
+                    "test_decimal__lt": {"filter_value": 2, "filter_negate": False},
+                }
+            ),
+            ["Name 1"],
+        )
+
+    def test_pushed_down_filter_respects_reference_date(self):
+        names = self.get_names(
+            {"test_name__exact": {"filter_value": "Name 0", "filter_negate": False}}
+        )
+        self.assertEqual(names, ["Name 0"])
+
+    def test_negated_and_null_lookups_stay_on_annotations(self):
+        filter_data = {
+            "test_name__exact": {"filter_value": "Name 0", "filter_negate": True},
+            "renamed_value__isnull": {"filter_value": True, "filter_negate": False},
+        }
+        query_builder = self.get_query_builder(filter_data)
+        _, remaining_filter = query_builder._push_down_filter(
+            TestMontrekHub.hub_value_date.field.model.objects.all(),
+            self.reference_date,
+        )
+        self.assertEqual(len(remaining_filter.children), 2)
+        filter_data.pop("test_name__exact")
+        self.assertEqual(self.get_names(filter_data), [None, None])
+
+    def test_or_filter_stays_on_annotations(self):
+        filter_data = {
+            "OR": {
+                "test_name__exact": {"filter_value": "Name 0", "filter_negate": False},
+                "renamed_value__exact": {"filter_value": 2, "filter_negate": False},
+            }
+        }
+        self.assertEqual(self.get_names(filter_data), ["Name 0", "Name 2"])
+
+    def test_invalid_filter_is_reported(self):
+        filter_data = {
+            "renamed_value__unknown": {"filter_value": 1, "filter_negate": False}
+        }
+        query_builder = self.get_query_builder(filter_data)
+        query_builder.build_queryset(self.reference_date)
+        self.assertEqual(len(query_builder.messages), 1)
+
+    def test_count_with_pushed_down_filter(self):
+        query_builder = self.get_query_builder(
+            {"test_name__exact": {"filter_value": "Name 2", "filter_negate": False}}
+        )
+        count_queryset = query_builder.build_count_queryset(self.reference_date)
+        self.assertEqual(count_queryset.query.annotations, {})
+        self.assertEqual(count_queryset.count(), 1)
+
+
+class TestQueryBuilderRequestedFields(TestCase):
+    def setUp(self):
+        self.annotator = Annotator(TestMontrekHub)
+        self.annotator.subquery_builder_to_annotations(
+            ["test_name", "test_value"], TestMontrekSatellite, SatelliteSubqueryBuilder
+        )
+        self.annotator.subquery_builder_to_annotations(
+            ["test_decimal"], TestMontrekTimeSeriesSatellite, TSSatelliteSubqueryBuilder
+        )
+        self.reference_date = timezone.now()
+        TestMontrekSatelliteFactory.create(test_name="Name", test_value="1")
+
+    def test_only_requested_fields_are_annotated(self):
+        query_builder = QueryBuilder(self.annotator, {})
+        queryset = query_builder.build_queryset(
+            self.reference_date, fields=["test_name"]
+        )
+        self.assertEqual(
+            set(queryset.query.annotation_select),
+            {"test_name", "value_date", "hub_entity_id"},
+        )
+        self.assertNotIn("testmontrektimeseriessatellite", str(queryset.query))
+        self.assertEqual(queryset.get().test_name, "Name")
+
+    def test_filter_and_order_fields_are_annotated(self):
+        filter_data = {
+            "OR": {
+                "test_value__exact": {"filter_value": "1", "filter_negate": False},
+                "test_decimal__gt": {"filter_value": 1, "filter_negate": False},
+            }
+        }
+        query_builder = QueryBuilder(self.annotator, {"filter": {"": filter_data}})
+        queryset = query_builder.build_queryset(
+            self.reference_date, order_fields=("-created_at",), fields=["test_name"]
+        )
+        self.assertEqual(
+            set(queryset.query.annotation_select),
+            {
+                "test_name",
+                "test_value",
+                "test_decimal",
+                "created_at",
+                "value_date",
+                "hub_entity_id",
+            },
+        )
+        self.assertEqual(queryset.get().test_name, "Name")
@@ -0,0 +1,44 @@
+from baseclasses.models import TestLinkHub, TestMontrekHub
+from baseclasses.repositories.query_result_cache import (
+    QUERY_RESULT_CACHE_ALIAS,
+    QueryResultCache,
+    bump_data_versions,
+    get_data_version_key,
+)
+from django.core.cache import caches
+from django.test import TestCase
+
+
+class TestQueryResultCache(TestCase):
+    def setUp(self):
+        caches[QUERY_RESULT_CACHE_ALIAS].clear()
+        self.calls = 0
+
+    def compute(self) -> int:
+        self.calls += 1
+        return self.calls
+
+    def test_results_are_cached_per_context_and_arguments(self):
+        result_cache = QueryResultCache(("context",), [TestMontrekHub], 60)
+
+        self.assertEqual(result_cache.get_or_compute("count", self.compute), 1)
+        self.assertEqual(result_cache.get_or_compute("count", self.compute), 1)
+        self.assertEqual(result_cache.get_or_compute("count", self.compute, 1), 2)
+        other_cache = QueryResultCache(("other",), [TestMontrekHub], 60)
+        self.assertEqual(other_cache.get_or_compute("count", self.compute), 3)
+
+    def test_bumping_a_read_hub_class_invalidates_results(self):
+        result_cache = QueryResultCache(("context",), [TestMontrekHub, TestLinkHub], 60)
+        result_cache.get_or_compute("count", self.compute)
+
+        bump_data_versions([TestLinkHub])
+
+        self.assertEqual(result_cache.get_or_compute("count", self.compute), 2)
+
+    def test_evicted_data_version_invalidates_results(self):
+        result_cache = QueryResultCache(("context",), [TestMontrekHub], 60)
+        result_cache.get_or_compute("count", self.compute)
+
+        caches[QUERY_RESULT_CACHE_ALIAS].delete(get_data_version_key(TestMontrekHub))
+
+        self.assertEqual(result_cache.get_or_compute("count", self.compute), 2)
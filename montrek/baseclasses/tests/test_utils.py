@@ -1,6 +1,7 @@
 import datetime
 
 from baseclasses.utils import (
+    CursorsMetaSessionDataElement,
     FilterCountMetaSessionDataElement,
     FilterMetaSessionDataElement,
     IsCompactFormatMetaSessionDataElement,
@@ -251,6 +252,36 @@ class TestPagesMetaSessionDataElement(TestCase):
         self.assertEqual(page_data["pages"], {})
 
 
+class TestCursorsMetaSessionDataElement(TestCase):
+    def setUp(self):
+        self.request = MockRequest()
+
+    def test_cursor_is_stored(self):
+        session_data = {"page": ["2"], "cursor": ["abc"]}
+        test_element = CursorsMetaSessionDataElement(session_data, self.request)
+
+        cursor_data = test_element.apply_data()
+
+        self.assertEqual(cursor_data["cursors"]["/test-path/"], ["abc"])
+
+    def test_cursor_is_restored(self):
+        session_data = {"cursors": {"/test-path/": ["abc"]}}
+        test_element = CursorsMetaSessionDataElement(session_data, self.request)
+
+        cursor_data = test_element.apply_data()
+
+        self.assertEqual(cursor_data["cursor"], ["abc"])
+
+    def test_page_without_cursor_drops_cursor(self):
+        session_data = {"cursors": {"/test-path/": ["abc"]}, "page": [1]}
+        test_element = CursorsMetaSessionDataElement(session_data, self.request)
+
+        cursor_data = test_element.apply_data()
+
+        self.assertEqual(cursor_data["cursors"], {})
+        self.assertNotIn("cursor", cursor_data)
+
+
 class TestFilterCountMetaSessionDataElement(TestCase):
     def setUp(self):
         self.request = MockRequest()
@@ -200,6 +200,21 @@ class FilterMetaSessionDataElement(TableMetaSessionDataElement):
         return filter_data
 
 
+class CursorsMetaSessionDataElement(TableMetaSessionDataElement):
+    field: str = "cursors"
+
+    def apply_data(self) -> SessionDataType:
+        cursors_data = {self.field: self.session_data.get(self.field, {})}
+        if "cursor" in self.session_data:
+            cursors_data[self.field][self.request_path] = self.session_data["cursor"]
+        elif "page" in self.session_data:
+            # A page requested without cursor is read by offset
+            cursors_data[self.field].pop(self.request_path, None)
+        elif self.request_path in cursors_data[self.field]:
+            cursors_data["cursor"] = cursors_data[self.field][self.request_path]
+        return cursors_data
+
+
 class PagesMetaSessionDataElement(TableMetaSessionDataElement):
     field: str = "pages"
 
@@ -264,6 +279,7 @@ class TableMetaSessionData:
     meta_session_data_elements: list[type[TableMetaSessionDataElement]] = [
         OrderFieldMetaSessionDataElement,
         FilterMetaSessionDataElement,
+        CursorsMetaSessionDataElement,
         PagesMetaSessionDataElement,
         FilterCountMetaSessionDataElement,
         PaginateByMetaSessionDataElement,
@@ -1,5 +1,6 @@
 import logging
 import os
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any, BinaryIO, Protocol
 
@@ -302,10 +303,9 @@ class MontrekListView(
         q = request.GET
         response = None
 
-        if q.get("gen_csv") == "true":
-            response = self.list_to_csv()
-        elif q.get("gen_excel") == "true":
-            response = self.list_to_excel()
+        download_method = self._get_download_method(q)
+        if download_method is not None:
+            response = download_method()
         elif q.get("gen_pdf") in ("true", "latex"):
             response = (
                 self.list_to_pdf_latex()
@@ -333,6 +333,17 @@ class MontrekListView(
 
         return response or super().get(request, *args, **kwargs)
 
+    def _get_download_method(self, q) -> Callable[[], HttpResponse] | None:
+        download_methods = {
+            "gen_csv": self.list_to_csv,
+            "gen_excel": self.list_to_excel,
+            "gen_parquet": self.list_to_parquet,
+        }
+        for param, download_method in download_methods.items():
+            if q.get(param) == "true":
+                return download_method
+        return None
+
     def get_queryset(self):
         return self.manager.get_table()
 
@@ -392,6 +403,14 @@ class MontrekListView(
         self.show_messages()
         return response
 
+    def list_to_parquet(self):
+        DownloadRegistryStorageManager(self.session_data).store_in_download_registry(
+            self.manager.document_name, DownloadType.PARQUET
+        )
+        response = self.manager.download_or_mail_parquet()
+        self.show_messages()
+        return response
+
     def list_to_rest_api(self):
         DownloadRegistryStorageManager(self.session_data).store_in_download_registry(
             self.manager.document_name, DownloadType.API
@@ -5,7 +5,7 @@ from django.db import models
 
 
 class ApiRegistrySatellite(DataImportRegistryBaseSatelliteABC):
-    class Meta:
+    class Meta(DataImportRegistryBaseSatelliteABC.Meta):
         abstract = True
 
     import_url = models.URLField(default="", blank=True, null=True)
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0003_testapiregistrysatellite"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="testapiregistrysatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="base_testap_hash_id_64e2c1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testapiregistrysatellite",
+            index=models.Index(
+                fields=["hash_value"], name="base_testap_hash_va_26943c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testapiregistrysatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="base_testap_hub_ent_72153f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testregistrysatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="base_testre_hash_id_029c3e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testregistrysatellite",
+            index=models.Index(
+                fields=["hash_value"], name="base_testre_hash_va_b4b5ea_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testregistrysatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="base_testre_hub_ent_74aaa9_idx",
+            ),
+        ),
+    ]
@@ -8,7 +8,7 @@ from process_pipeline.models.pipeline_registry_sat_models import (
 
 
 class DataImportRegistryBaseSatelliteABC(PipelineRegistrySatelliteABC):
-    class Meta:
+    class Meta(PipelineRegistrySatelliteABC.Meta):
         abstract = True
 
     class ImportStatus(models.TextChoices):
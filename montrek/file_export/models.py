@@ -12,7 +12,7 @@ class FileExportRegistryHubABC(PipelineRegistryHubABC):
 
 
 class FileExportRegistryStaticSatelliteABC(PipelineRegistrySatelliteABC):
-    class Meta:
+    class Meta(PipelineRegistrySatelliteABC.Meta):
         abstract = True
 
     class ExportStatus(models.TextChoices):
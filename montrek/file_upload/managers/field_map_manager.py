@@ -124,9 +124,9 @@ class FieldMapManagerABC(MontrekTableManager):
         self.exceptions = []
 
     def get_field_map(self, source_df: pd.DataFrame) -> pd.DataFrame:
-        field_maps = self.repository.receive().filter(
-            source_field__in=source_df.columns.to_list()
-        )
+        field_maps = self.repository.receive_only(
+            ["source_field", "database_field", "function_name", "function_parameters"]
+        ).filter(source_field__in=source_df.columns.to_list())
         return field_maps
 
     def apply_field_maps(self, source_df: pd.DataFrame) -> pd.DataFrame:
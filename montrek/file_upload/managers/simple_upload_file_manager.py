@@ -68,8 +68,7 @@ class SimpleFileUploadProcessor(FileUploadProcessorProtocol):
         try:
             if self.overwrite:
                 with transaction.atomic():
-                    for obj in self.target_repository.receive():
-                        self.target_repository.delete(obj.hub)
+                    self.target_repository.delete_many(self.target_repository.receive())
                     self.target_repository.create_objects_from_data_frame(self.input_df)
             else:
                 self.target_repository.create_objects_from_data_frame(self.input_df)
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_upload", "0018_alter_fileuploadregistrystaticsatellite_file_type"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="fileuploadfilestaticsatellite",
+            name="file_upload_hub_ent_51c421_idx",
+        ),
+        migrations.AddIndex(
+            model_name="fieldmapstaticsatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="file_upload_hash_id_3b8e08_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fieldmapstaticsatellite",
+            index=models.Index(
+                fields=["hash_value"], name="file_upload_hash_va_f01138_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fieldmapstaticsatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="file_upload_hub_ent_699e80_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fileuploadfilestaticsatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="file_upload_hub_ent_2850f3_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fileuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="file_upload_hash_id_a11d5e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fileuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_value"], name="file_upload_hash_va_851793_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fileuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="file_upload_hub_ent_df664d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkfileuploadregistryfilelogfile",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="file_upload_hub_in__8b3af1_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkfileuploadregistryfilelogfile",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="file_upload_hub_out_cb3fc8_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkfileuploadregistryfileuploadfile",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="file_upload_hub_in__b41b9f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkfileuploadregistryfileuploadfile",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="file_upload_hub_out_fcdd62_idx",
+            ),
+        ),
+    ]
@@ -16,7 +16,7 @@ class FileUploadRegistryHubABC(PipelineRegistryHubABC):
 
 
 class FileUploadRegistryStaticSatelliteABC(PipelineRegistrySatelliteABC):
-    class Meta:
+    class Meta(PipelineRegistrySatelliteABC.Meta):
         abstract = True
 
     class FileTypes(models.TextChoices):
@@ -121,7 +121,7 @@ class FieldMapHubABC(baseclass_models.MontrekHubABC):
 
 
 class FieldMapStaticSatelliteABC(baseclass_models.MontrekSatelliteABC):
-    class Meta:
+    class Meta(baseclass_models.MontrekSatelliteABC.Meta):
         abstract = True
 
     hub_entity = models.ForeignKey(FieldMapHubABC, on_delete=models.CASCADE)
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("info", "0009_alter_downloadregistrysatellite_download_type"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="downloadregistrysatellite",
+            name="info_downlo_hub_ent_39d9c8_idx",
+        ),
+        migrations.AddIndex(
+            model_name="downloadregistrysatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="info_downlo_hub_ent_9cad9e_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mailing", "0008_mailsatellite_mail_bcc"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="mailstatesatellite",
+            name="mailing_mai_hub_ent_facc3b_idx",
+        ),
+        migrations.AddIndex(
+            model_name="mailstatesatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="mailing_mai_hub_ent_df6f55_idx",
+            ),
+        ),
+    ]
@@ -219,6 +219,25 @@ DATABASES = {
 if db_engine == "postgres_ext":
     DATABASES["default"]["OPTIONS"] = {"sslmode": "require"}
 
+# Results of repositories with result_cache_timeout. The local memory backend
+# is only invalidated by writes of the same process, so deployments with
+# several processes should use Redis, e.g. the Celery broker.
+QUERY_RESULT_CACHE_URL = config("QUERY_RESULT_CACHE_URL", default="")
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "query_results": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": QUERY_RESULT_CACHE_URL,
+        }
+        if QUERY_RESULT_CACHE_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "query_results",
+        }
+    ),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -0,0 +1,394 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_upload", "0019_point_in_time_indexes"),
+        ("montrek_example", "0016_hubafileexportregistryhub_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="sata1",
+            name="montrek_exa_hub_ent_38ec32_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sata2",
+            name="montrek_exa_hub_ent_4cc1c1_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sata3",
+            name="montrek_exa_hub_ent_54cd83_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sata4",
+            name="montrek_exa_hub_ent_95c0d4_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sata5",
+            name="montrek_exa_hub_ent_afe7f8_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="satb1",
+            name="montrek_exa_hub_ent_bcb768_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="satb2",
+            name="montrek_exa_hub_ent_22f632_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="satc1",
+            name="montrek_exa_hub_ent_bb610e_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="satcboolean",
+            name="montrek_exa_hub_ent_4a3268_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="satd1",
+            name="montrek_exa_hub_ent_90eafa_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sate1",
+            name="montrek_exa_hub_ent_2b88b8_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sate2",
+            name="montrek_exa_hub_ent_49badb_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sattsc2",
+            name="montrek_exa_hub_val_71f711_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sattsc3",
+            name="montrek_exa_hub_val_68a8d7_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sattsc4",
+            name="montrek_exa_hub_val_90d541_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="sattsd2",
+            name="montrek_exa_hub_val_802351_idx",
+        ),
+        migrations.AddIndex(
+            model_name="hubaapiuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="montrek_exa_hash_id_3061a8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubaapiuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_value"], name="montrek_exa_hash_va_a5562f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubaapiuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_d2de04_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubafileexportregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="montrek_exa_hash_id_03ae74_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubafileexportregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_value"], name="montrek_exa_hash_va_98dbbb_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubafileexportregistrystaticsatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_ac6d99_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubafileuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="montrek_exa_hash_id_6eafcc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubafileuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hash_value"], name="montrek_exa_hash_va_324fa2_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hubafileuploadregistrystaticsatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_06de6f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubaapiuploadregistry",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__9fce78_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubaapiuploadregistry",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_260416_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubafileuploadregistry",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__8be2b7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubafileuploadregistry",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_7def4b_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubafileuploadregistryfilelogfile",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__be00e6_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubafileuploadregistryfilelogfile",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_7fcaab_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubafileuploadregistryfileuploadfile",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__1b05a4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubafileuploadregistryfileuploadfile",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_8802ac_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubahubb",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__67a823_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubahubb",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_e8da77_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubahubc",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__a42fec_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubahubc",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_78ae6e_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubbhubd",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__73b8b4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubbhubd",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_a1ab5d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubchubd",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__ea01db_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubchubd",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_7e16e4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubdhube",
+            index=models.Index(
+                fields=["hub_in", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_in__9159c9_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="linkhubdhube",
+            index=models.Index(
+                fields=["hub_out", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_out_7eff65_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata1",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_ff01b6_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata1fieldmapstaticsatellite",
+            index=models.Index(
+                fields=["hash_identifier"], name="montrek_exa_hash_id_fe6134_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata1fieldmapstaticsatellite",
+            index=models.Index(
+                fields=["hash_value"], name="montrek_exa_hash_va_dee36f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata1fieldmapstaticsatellite",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_65b655_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata2",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_d95798_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata3",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_7df3f6_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata4",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_3b2e85_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sata5",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_f5541f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="satb1",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_106eef_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="satb2",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_9ccb33_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="satc1",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_6951d3_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="satcboolean",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_65f6aa_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="satd1",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_067ecc_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sate1",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_4b5da8_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sate2",
+            index=models.Index(
+                fields=["hub_entity", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_ent_e25b50_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sattsc2",
+            index=models.Index(
+                fields=["hub_value_date", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_val_f4c5b7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sattsc3",
+            index=models.Index(
+                fields=["hub_value_date", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_val_494481_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sattsc4",
+            index=models.Index(
+                fields=["hub_value_date", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_val_f453f2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sattsd2",
+            index=models.Index(
+                fields=["hub_value_date", "state_date_end", "state_date_start"],
+                name="montrek_exa_hub_val_7d23d3_idx",
+            ),
+        ),
+    ]
@@ -1,14 +1,25 @@
+from io import BytesIO
+from unittest.mock import patch
+
+import pandas as pd
 from bs4 import BeautifulSoup
 from django.db import connections
 from django.test import TestCase
 from montrek_example.managers.montrek_example_managers import (
     CompactHubAManager,
+    HubAManager,
+    HubCManager,
     SatA5HistoryManager,
     SatA5Manager,
 )
 from montrek_example.models.example_models import SatA5
 from montrek_example.repositories.hub_a_repository import HubARepository5
-from montrek_example.tests.factories.montrek_example_factories import SatA5Factory
+from montrek_example.tests.factories.montrek_example_factories import (
+    SatA1Factory,
+    SatA2Factory,
+    SatA5Factory,
+    SatC1Factory,
+)
 
 
 def _read_raw_column(model, pk, field_name, using="default"):
@@ -61,6 +72,10 @@ class TestEncryptedFields(TestCase):
         self.assertNotIn("secret", tds)
         self.assertIn("******", tds)
 
+    def test_field_is_hidden_in_parquet(self):
+        df = pd.read_parquet(self.manager.to_parquet(BytesIO()))
+        self.assertEqual(df["Secret"].tolist(), ["******"])
+
 
 class TestEncryptedFieldsWithNone(TestCase):
     def setUp(self):
@@ -95,3 +110,156 @@ class TestManagerFunctionality(TestCase):
                 self.assertEqual(description, "Renamed Label")
             else:
                 self.assertEqual(description, field.replace("_", " ").title())
+
+    def test_receive_table_fields_only(self):
+        SatC1Factory.create(field_c1_str="c1")
+        manager = HubCManager()
+        manager.receive_table_fields_only = True
+        self.assertEqual(
+            manager.get_table_fields(), {"value_date", "field_c1_str", "field_c1_bool"}
+        )
+        self.assertEqual(manager.get_df()["C1 String"].tolist(), ["c1"])
+
+
+class TestParquetExport(TestCase):
+    def setUp(self):
+        for i in range(3):
+            sat_a1 = SatA1Factory.create(field_a1_str=f"a{i}", field_a1_int=i)
+            SatA2Factory.create(hub_entity=sat_a1.hub_entity, field_a2_float=i + 0.5)
+        self.manager = HubAManager({})
+        self.manager.repository.store_in_view_model()
+        self.manager.export_chunk_size = 2
+
+    def test_to_parquet_matches_csv_export(self):
+        df = pd.read_parquet(self.manager.to_parquet(BytesIO()))
+        expected_df = self.manager.get_df()
+        self.assertEqual(list(df.columns), list(expected_df.columns))
+        df = df.sort_values("A1 Int", ignore_index=True)
+        expected_df = expected_df.sort_values("A1 Int", ignore_index=True)
+        pd.testing.assert_frame_equal(df, expected_df, check_dtype=False)
+
+    def test_to_parquet_dtypes(self):
+        df = pd.read_parquet(self.manager.to_parquet(BytesIO()))
+        self.assertTrue(pd.api.types.is_integer_dtype(df["A1 Int"]))
+        self.assertTrue(pd.api.types.is_float_dtype(df["A2 Float"]))
+        self.assertTrue(pd.api.types.is_string_dtype(df["A1 String"]))
+        # Custom get_value is evaluated row by row
+        self.assertEqual(sorted(df["TestField"].tolist()), [1.0, 3.0, 5.0])
+
+    def test_to_parquet_empty(self):
+        manager = HubAManager({})
+        manager.repository.hub_class.objects.all().delete()
+        manager.repository.store_in_view_model()
+        df = pd.read_parquet(manager.to_parquet(BytesIO()))
+        self.assertEqual(len(df), 0)
+        self.assertIn("A1 String", df.columns)
+
+    def test_to_parquet_unescapes_html(self):
+        SatA1Factory.create(field_a1_str="x &amp; y", field_a1_int=3)
+        self.manager.repository.store_in_view_model()
+        df = pd.read_parquet(self.manager.to_parquet(BytesIO()))
+        self.assertIn("x & y", df["A1 String"].tolist())
+
+    def test_to_parquet_uses_table_hooks(self):
+        with patch.object(HubAManager, "_preload_container") as preload_mock:
+            list(self.manager.get_output_dfs())
+        preload_mock.assert_called_once()
+
+        class FirstRowHubAManager(HubAManager):
+            def get_df(self):
+                return super().get_df().head(1)
+
+        manager = FirstRowHubAManager({})
+        df = pd.read_parquet(manager.to_parquet(BytesIO()))
+        pd.testing.assert_frame_equal(df, manager.get_df(), check_dtype=False)
+
+    def test_download_parquet(self):
+        response = self.manager.download_or_mail_parquet()
+        self.assertEqual(response["Content-Type"], "application/vnd.apache.parquet")
+        self.assertRegex(
+            response["Content-Disposition"],
+            r'attachment; filename="hubamanager_\d{14}\.parquet"',
+        )
+        df = pd.read_parquet(BytesIO(response.content))
+        self.assertEqual(len(df), 3)
+
+
+class TestStreamingDownloads(TestCase):
+    def setUp(self):
+        for i in range(3):
+            sat_a1 = SatA1Factory.create(field_a1_str=f"a{i}", field_a1_int=i)
+            SatA2Factory.create(hub_entity=sat_a1.hub_entity, field_a2_float=i + 0.5)
+        self.manager = HubAManager({})
+        self.manager.repository.store_in_view_model()
+        self.manager.export_chunk_size = 2
+        self.manager.stream_downloads = True
+
+    def test_stream_csv(self):
+        response = self.manager.download_or_mail_csv()
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertRegex(
+            response["Content-Disposition"],
+            r'attachment; filename="hubamanager_\d{14}\.csv"',
+        )
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 2)
+        df = pd.read_csv(BytesIO(b"".join(chunks)))
+        expected_df = self.manager.get_df()
+        self.assertEqual(list(df.columns), list(expected_df.columns))
+        self.assertEqual(sorted(df["A1 Int"].tolist()), [0, 1, 2])
+
+    def test_stream_excel(self):
+        response = self.manager.download_or_mail_excel()
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Type"],
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+        self.assertRegex(
+            response["Content-Disposition"],
+            r'attachment; filename="hubamanager_\d{14}\.xlsx"',
+        )
+        df = pd.read_excel(BytesIO(b"".join(response.streaming_content)))
+        expected_df = self.manager.get_df()
+        self.assertEqual(list(df.columns), list(expected_df.columns))
+        self.assertEqual(sorted(df["A1 Int"].tolist()), [0, 1, 2])
+
+    def test_large_table_is_streamed_instead_of_mailed(self):
+        self.manager.is_large = True
+        with patch.object(self.manager.download_task, "delay") as mock_delay:
+            response = self.manager.download_or_mail_csv()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        mock_delay.assert_not_called()
+        self.assertEqual(self.manager.messages, [])
+
+    def test_large_table_is_mailed_without_streaming(self):
+        self.manager.is_large = True
+        self.manager.stream_downloads = False
+        with patch.object(self.manager.download_task, "delay") as mock_delay:
+            response = self.manager.download_or_mail_csv()
+        self.assertEqual(response.status_code, 302)
+        mock_delay.assert_called_once_with(
+            filetype="csv", session_data=self.manager.session_data
+        )
+
+    def test_stream_excel_closes_file_on_error(self):
+        with (
+            patch("reporting.managers.montrek_table_manager.tempfile") as mock_tempfile,
+            patch.object(
+                self.manager.excel_formatter_class,
+                "write_excel",
+                side_effect=ValueError("boom"),
+            ),
+            self.assertRaises(ValueError),
+        ):
+            self.manager.download_or_mail_excel()
+        mock_tempfile.TemporaryFile.return_value.close.assert_called_once_with()
+
+    def test_stream_empty_table(self):
+        self.manager.repository.hub_class.objects.all().delete()
+        self.manager.repository.store_in_view_model()
+        chunks = list(self.manager.iter_csv())
+        self.assertEqual(len(chunks), 1)
+        self.assertIn("A1 String", chunks[0])
@@ -5,17 +5,25 @@ from unittest.mock import patch
 import numpy as np
 import pandas as pd
 from baseclasses.errors.montrek_user_error import MontrekError
+from baseclasses.models import ViewModelRefresh
+from baseclasses.repositories.db.db_creator import DbBatchCreator
+from baseclasses.repositories.db.db_writer import CopyDbWriter, DbWriter
+from baseclasses.repositories.db.satellite_creator import SatelliteCreator
 from baseclasses.repositories.montrek_repository import MontrekRepository
+from baseclasses.repositories.query_result_cache import QUERY_RESULT_CACHE_ALIAS
 from baseclasses.repositories.subquery_builder import (
     CrossSatelliteFilter,
     ReverseLinkedSatelliteSubqueryBuilder,
 )
+from baseclasses.repositories.view_model_repository import ViewModelRepository
 from baseclasses.tests.factories.montrek_factory_schemas import ValueDateListFactory
 from baseclasses.utils import montrek_time
+from django.core.cache import caches
 from django.core.exceptions import PermissionDenied
-from django.db import models
+from django.db import connection, models
 from django.db.models import Q
 from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 from montrek_example.models import example_models as me_models
@@ -1479,6 +1487,73 @@ class TestDeleteObject(TestCase):
         self.assertEqual(link.state_date_end, already_closed_date)
 
 
+class TestDeleteMany(TestCase):
+    def setUp(self):
+        self.user = MontrekUserFactory()
+
+    def _delete_many_queries(self, n_hubs: int) -> int:
+        sats_b = me_factories.SatB1Factory.create_batch(n_hubs)
+        for sat_b in sats_b:
+            sat_b.hub_entity.link_hub_b_hub_d.add(me_factories.HubDFactory())
+        repository = HubBRepository(session_data={"user_id": self.user.id})
+        with CaptureQueriesContext(connection) as queries:
+            repository.delete_many([sat_b.hub_entity_id for sat_b in sats_b])
+        return len(queries)
+
+    def test_delete_many_from_receive(self):
+        repository = HubARepository(session_data={"user_id": self.user.id})
+        repository.std_create_object({"field_a1_int": 5, "field_a1_str": "test"})
+        repository.std_create_object({"field_a1_int": 6, "field_a1_str": "test2"})
+        repository.delete_many(repository.receive())
+        self.assertEqual(me_models.SatA1.objects.count(), 2)
+        self.assertEqual(
+            me_models.SatA1.objects.filter(state_date_end__gt=timezone.now()).count(),
+            0,
+        )
+        self.assertEqual(
+            me_models.HubA.objects.filter(state_date_end__gt=timezone.now()).count(),
+            0,
+        )
+        self.assertEqual(len(repository.receive()), 0)
+
+    def test_delete_many_closes_only_given_hubs_and_their_links(self):
+        hub_b1 = me_factories.HubBFactory()
+        hub_b2 = me_factories.HubBFactory()
+        hub_d = me_factories.HubDFactory()
+        hub_b1.link_hub_b_hub_d.add(hub_d)
+        hub_b2.link_hub_b_hub_d.add(hub_d)
+
+        repository = HubBRepository(session_data={"user_id": self.user.id})
+        repository.delete_many(me_models.HubB.objects.filter(pk=hub_b1.pk))
+
+        hub_b1.refresh_from_db()
+        hub_b2.refresh_from_db()
+        self.assertLessEqual(hub_b1.state_date_end, timezone.now())
+        self.assertGreater(hub_b2.state_date_end, timezone.now())
+        closed_link = me_models.LinkHubBHubD.objects.get(hub_in=hub_b1)
+        open_link = me_models.LinkHubBHubD.objects.get(hub_in=hub_b2)
+        self.assertLessEqual(closed_link.state_date_end, timezone.now())
+        self.assertGreater(open_link.state_date_end, timezone.now())
+
+    def test_delete_many_does_not_reopen_already_closed_satellites(self):
+        sat_a = me_factories.SatA1Factory()
+        already_closed_date = timezone.now() - datetime.timedelta(days=1)
+        me_factories.SatA1Factory(
+            hub_entity=sat_a.hub_entity, state_date_end=already_closed_date
+        )
+
+        HubARepository(session_data={"user_id": self.user.id}).delete_many(
+            [sat_a.hub_entity_id]
+        )
+
+        self.assertTrue(
+            me_models.SatA1.objects.filter(state_date_end=already_closed_date).exists()
+        )
+
+    def test_delete_many_query_count_does_not_grow_with_hubs(self):
+        self.assertEqual(self._delete_many_queries(2), self._delete_many_queries(5))
+
+
 class TestreceiveLinkedHubIds(TestCase):
     def test_get_linked_hub_without_sat(self):
         # Consider a scenario, where two hubs are linked, but one has no
@@ -2181,6 +2256,368 @@ class TestCreateDataWithLinks(TestCase):
         self.assertEqual(queryset[0].field_d1_str, "test1,test2")
 
 
+class TestCopyDbWriter(TestCase):
+    def setUp(self) -> None:
+        user = MontrekUserFactory()
+        self.session_data = {"user_id": user.id}
+
+    def test_create_static_and_ts_data_with_links(self):
+        class HubCCopyRepository(HubCRepository):
+            db_writer_class = CopyDbWriter
+
+        sat_d = me_factories.SatD1Factory(field_d1_str="Test D")
+        repository = HubCCopyRepository(session_data=self.session_data)
+        repository.create_by_data_frame(
+            pd.DataFrame(
+                {
+                    "field_c1_str": ["c1", "c1", "c2"],
+                    "field_c1_bool": [True, True, False],
+                    "value_date": ["2024-01-01", "2024-01-02", "2024-01-01"],
+                    "field_tsc2_float": [1.5, 2.5, 3.5],
+                    "field_tsc3_int": [1, 2, None],
+                    "field_tsc3_str": ["a", 'b,"quoted"', ""],
+                    "link_hub_c_hub_d": [sat_d.hub_entity] * 3,
+                }
+            )
+        )
+        self.assertEqual(me_models.HubC.objects.count(), 2)
+        self.assertEqual(me_models.SatC1.objects.count(), 2)
+        self.assertEqual(me_models.SatTSC2.objects.count(), 3)
+        self.assertEqual(me_models.LinkHubCHubD.objects.count(), 2)
+        sat_tsc3 = me_models.SatTSC3.objects.order_by("field_tsc3_str")
+        self.assertEqual(
+            [(s.field_tsc3_str, s.field_tsc3_int) for s in sat_tsc3],
+            [("", None), ("a", 1), ('b,"quoted"', 2)],
+        )
+        self.assertEqual(sat_tsc3[2].field_tsc3_int_times_two, 4)
+        sat_c1 = me_models.SatC1.objects.get(field_c1_str="c1")
+        self.assertTrue(sat_c1.field_c1_bool)
+        self.assertEqual(sat_c1.hash_identifier, sat_c1.get_hash_identifier)
+        self.assertEqual(sat_c1.hash_value, sat_c1.get_hash_value)
+        self.assertIsNotNone(sat_c1.created_at)
+        queryset = repository.receive().filter(value_date="2024-01-02")
+        self.assertEqual(queryset.get().field_tsc2_float, 2.5)
+        self.assertEqual(json.loads(queryset.get().field_d1_str), ["Test D"])
+
+        # Updating existing data keeps the history intact
+        repository.create_by_data_frame(
+            pd.DataFrame({"field_c1_str": ["c1"], "field_c1_bool": [False]})
+        )
+        self.assertEqual(me_models.HubC.objects.count(), 2)
+        self.assertEqual(me_models.SatC1.objects.count(), 3)
+
+    def test_create_json_data(self):
+        class HubAJsonCopyRepository(HubAJsonRepository):
+            db_writer_class = CopyDbWriter
+
+        repository = HubAJsonCopyRepository(session_data=self.session_data)
+        repository.std_create_object(
+            {"field_a3_str": "json", "field_a3_json": {"a": [1, "b"]}}
+        )
+        sat_a3 = me_models.SatA3.objects.get()
+        self.assertEqual(sat_a3.field_a3_json, {"a": [1, "b"]})
+
+
+class TestCreateFromStagedRows(TestCase):
+    def setUp(self) -> None:
+        user = MontrekUserFactory()
+        self.session_data = {"user_id": user.id}
+
+    @patch.object(DbBatchCreator, "chunk_size", 2)
+    @patch.object(DbWriter, "write_batch_size", 2)
+    def test_create_static_and_ts_data_with_links(self):
+        existing_sat = me_factories.SatC1Factory(field_c1_str="c0")
+        sat_d = me_factories.SatD1Factory(field_d1_str="Test D")
+        repository = HubCRepository(session_data=self.session_data)
+        repository.create_by_data_frame(
+            pd.DataFrame(
+                {
+                    "field_c1_str": ["c0", "c1", "c1", "c2", "c3"],
+                    "value_date": [
+                        "2024-01-01",
+                        "2024-01-01",
+                        "2024-01-02",
+                        "2024-01-01",
+                        "2024-01-02",
+                    ],
+                    "field_tsc2_float": [0.5, 1.5, 2.5, 3.5, 4.5],
+                    "link_hub_c_hub_d": [sat_d.hub_entity] * 5,
+                }
+            )
+        )
+        db_staller = repository.get_db_staller()
+        self.assertEqual(len(db_staller.get_staged_satellites()[me_models.SatTSC2]), 5)
+        self.assertEqual(me_models.HubC.objects.count(), 4)
+        self.assertEqual(me_models.SatC1.objects.count(), 4)
+        self.assertEqual(me_models.SatTSC2.objects.count(), 5)
+        self.assertEqual(me_models.LinkHubCHubD.objects.count(), 4)
+        self.assertEqual(
+            me_models.SatTSC2.objects.get(field_tsc2_float=0.5).hub_value_date.hub,
+            existing_sat.hub_entity,
+        )
+        sat_c1 = me_models.SatC1.objects.get(field_c1_str="c1")
+        self.assertEqual(sat_c1.hash_identifier, sat_c1.get_hash_identifier)
+        self.assertEqual(sat_c1.hash_value, sat_c1.get_hash_value)
+        queryset = repository.receive().filter(field_c1_str="c1")
+        self.assertEqual(
+            sorted(queryset.values_list("field_tsc2_float", flat=True)), [1.5, 2.5]
+        )
+        self.assertEqual(json.loads(queryset.first().field_d1_str), ["Test D"])
+
+
+class TestCreateBySatelliteDiffs(TestCase):
+    def setUp(self) -> None:
+        user = MontrekUserFactory()
+        self.session_data = {"user_id": user.id}
+
+    def test_only_changed_rows_create_satellites(self):
+        repository = HubARepository(session_data=self.session_data)
+        repository.create_by_data_frame(
+            pd.DataFrame({"field_a1_str": ["a", "b"], "field_a1_int": [1, 2]})
+        )
+        with patch.object(
+            SatelliteCreator,
+            "create_static_satellite",
+            autospec=True,
+            side_effect=SatelliteCreator.create_static_satellite,
+        ) as create_static_satellite:
+            repository.create_by_data_frame(
+                pd.DataFrame(
+                    {"field_a1_str": ["a", "b", "c"], "field_a1_int": [1, 3, 4]}
+                )
+            )
+        created = [
+            call.args[2]["field_a1_str"]
+            for call in create_static_satellite.call_args_list
+            if call.args[1] is me_models.SatA1
+        ]
+        self.assertEqual(created, ["b", "c"])
+        self.assertEqual(me_models.HubA.objects.count(), 3)
+        self.assertEqual(me_models.SatA1.objects.count(), 4)
+        self.assertEqual(
+            sorted(repository.receive().values_list("field_a1_str", "field_a1_int")),
+            [("a", 1), ("b", 3), ("c", 4)],
+        )
+
+
+class TestQueryResultCache(TestCase):
+    def setUp(self) -> None:
+        caches[QUERY_RESULT_CACHE_ALIAS].clear()
+        user = MontrekUserFactory()
+        self.session_data = {"user_id": user.id}
+
+        class HubACachedRepository(HubARepository):
+            result_cache_timeout = 60
+
+        self.repository_class = HubACachedRepository
+        self.repository_class(self.session_data).create_by_dict({"field_a1_str": "a"})
+
+    def test_count_and_page_are_served_from_cache(self):
+        repository = self.repository_class(self.session_data)
+        self.assertEqual(repository.receive_count(), 1)
+        page = repository.receive_page(0, 10)
+
+        repository = self.repository_class(self.session_data)
+        with self.assertNumQueries(0):
+            self.assertEqual(repository.receive_count(), 1)
+            cached_page = repository.receive_page(0, 10)
+        self.assertEqual(
+            [row.field_a1_str for row in cached_page],
+            [row.field_a1_str for row in page],
+        )
+
+    def test_writes_and_deletes_invalidate_cache(self):
+        repository = self.repository_class(self.session_data)
+        self.assertEqual(repository.receive_count(), 1)
+
+        repository.create_by_dict({"field_a1_str": "b"})
+        self.assertEqual(repository.receive_count(), 2)
+        self.assertEqual(len(repository.get_df()), 2)
+
+        repository.delete(me_models.HubA.objects.first())
+        self.assertEqual(repository.receive_count(), 1)
+        self.assertEqual(len(repository.get_df()), 1)
+
+    def test_filter_is_part_of_the_key(self):
+        repository = self.repository_class(self.session_data)
+        repository.create_by_dict({"field_a1_str": "b"})
+        self.assertEqual(repository.receive_count(), 2)
+
+        session_data = {
+            **self.session_data,
+            "request_path": "/a",
+            "filter": {
+                "/a": {
+                    "field_a1_str__exact": {
+                        "filter_value": "b",
+                        "filter_negate": False,
+                    }
+                }
+            },
+        }
+        repository = self.repository_class(session_data)
+        self.assertEqual(repository.receive_count(), 1)
+
+
+class TestReceiveCount(TestCase):
+    def setUp(self) -> None:
+        caches[QUERY_RESULT_CACHE_ALIAS].clear()
+        self.session_data = {"user_id": MontrekUserFactory().id}
+        ts_satellite_c1 = me_factories.SatC1Factory.create(field_c1_str="Hallo")
+        for value_date in (montrek_time(2024, 2, 5), montrek_time(2024, 2, 6)):
+            me_factories.SatTSC2Factory.create(
+                hub_value_date__hub=ts_satellite_c1.hub_entity,
+                field_tsc2_float=1.0,
+                value_date=value_date,
+            )
+        me_factories.SatC1Factory.create(field_c1_str="Static")
+
+    def test_count_matches_receive(self):
+        repository = HubCRepository(self.session_data)
+        self.assertEqual(repository.receive_count(), repository.receive().count())
+        session_data = {
+            **self.session_data,
+            "start_date": montrek_time(2024, 2, 6),
+            "end_date": montrek_time(2024, 3, 1),
+        }
+        repository = HubCRepository(session_data)
+        self.assertEqual(repository.receive_count(), repository.receive().count())
+
+    def test_count_is_cached(self):
+        class HubCCountedRepository(HubCRepository):
+            count_cache_timeout = 60
+
+        count = HubCCountedRepository(self.session_data).receive_count()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                HubCCountedRepository(self.session_data).receive_count(), count
+            )
+
+    def test_count_falls_back_to_estimate(self):
+        class HubCEstimatedRepository(HubCRepository):
+            count_estimate_threshold = -1
+
+        repository = HubCEstimatedRepository(self.session_data)
+        with patch(
+            "baseclasses.repositories.montrek_repository.estimate_row_count",
+            return_value=1_000_000,
+        ):
+            self.assertEqual(repository.receive_count(), 1_000_000)
+
+
+class TestRequestedFields(TestCase):
+    def setUp(self) -> None:
+        self.session_data = {"user_id": MontrekUserFactory().id}
+        for field_c1_str in ("first", "second"):
+            sat_c1 = me_factories.SatC1Factory.create(field_c1_str=field_c1_str)
+            me_factories.SatTSC2Factory.create(
+                hub_value_date__hub=sat_c1.hub_entity,
+                field_tsc2_float=1.0,
+                value_date=montrek_time(2024, 2, 5),
+            )
+
+    def test_receive_only(self):
+        repository = HubCRepository(self.session_data)
+        queryset = repository.receive_only(["field_c1_str"])
+        self.assertEqual(
+            set(queryset.query.annotation_select),
+            {"field_c1_str", "value_date", "hub_entity_id"},
+        )
+        self.assertEqual(
+            sorted(queryset.values_list("field_c1_str", flat=True)),
+            ["first", "second"],
+        )
+        self.assertGreater(len(repository.receive().query.annotation_select), 3)
+
+    def test_get_df_with_columns(self):
+        repository = HubCRepository(self.session_data)
+        test_df = repository.get_df(columns=["field_c1_str", "field_tsc2_float"])
+        self.assertEqual(test_df.columns.tolist(), ["field_tsc2_float", "field_c1_str"])
+        self.assertEqual(sorted(test_df["field_c1_str"]), ["first", "second"])
+
+    def test_get_hubs_by_field_values(self):
+        repository = HubCRepository(self.session_data)
+        hubs = repository.get_hubs_by_field_values(["second"], "field_c1_str")
+        self.assertEqual(
+            hubs[0].pk, me_models.SatC1.objects.get(field_c1_str="second").hub_entity_id
+        )
+
+
+class PrefetchHubARepository2(HubARepository2):
+    prefetch_linked_fields = True
+
+
+class PrefetchHubARepository3(HubARepository3):
+    prefetch_linked_fields = True
+
+
+class PrefetchHubCRepository2(HubCRepository2):
+    prefetch_linked_fields = True
+
+
+class TestPrefetchLinkedFields(TestCase):
+    def setUp(self):
+        self.huba1 = me_factories.HubAFactory()
+        huba2 = me_factories.HubAFactory()
+        me_factories.SatA1Factory(hub_entity=self.huba1, field_a1_int=5)
+        me_factories.SatA1Factory(hub_entity=huba2, field_a1_int=7)
+        hubc1 = me_factories.HubCFactory()
+        hubc2 = me_factories.HubCFactory()
+        me_factories.HubCFactory()
+        me_factories.LinkHubAHubCFactory(hub_in=self.huba1, hub_out=hubc1)
+        me_factories.LinkHubAHubCFactory(hub_in=huba2, hub_out=hubc1)
+        me_factories.SatC1Factory(hub_entity=hubc1, field_c1_str="First")
+        me_factories.SatC1Factory(hub_entity=hubc2, field_c1_str="Second")
+        satd1 = me_factories.SatD1Factory(field_d1_str="Fourth")
+        me_factories.LinkHubCHubDFactory(hub_in=hubc1, hub_out=satd1.hub_entity)
+
+    def get_rows(self, repository, field: str) -> list[tuple]:
+        repository.set_order_fields(("hub_entity_id",))
+        return [(row.pk, getattr(row, field)) for row in repository.receive()]
+
+    def test_same_rows_as_subqueries(self):
+        for repository_class, prefetch_class, field in (
+            (HubARepository2, PrefetchHubARepository2, "field_c1_str"),
+            (HubCRepository2, PrefetchHubCRepository2, "field_a1_int"),
+            (HubARepository3, PrefetchHubARepository3, "field_d1_str"),
+        ):
+            self.assertEqual(
+                self.get_rows(prefetch_class(), field),
+                self.get_rows(repository_class(), field),
+            )
+
+    def test_linked_fields_are_not_selected(self):
+        queryset = PrefetchHubARepository2().receive()
+        self.assertNotIn("field_c1_str", queryset.query.annotation_select)
+        self.assertEqual(
+            queryset.values_list("field_c1_str", flat=True)[0],
+            "First",
+        )
+        self.assertEqual(queryset.filter(field_c1_str="First").count(), 2)
+
+    def test_iterator(self):
+        queryset = PrefetchHubCRepository2().receive().order_by("hub_entity_id")
+        values = [row.field_a1_int for row in queryset.iterator(chunk_size=2)]
+        self.assertEqual(sorted(json.loads(values[0])), [5, 7])
+        self.assertEqual(values[1:], [None, None])
+
+    def test_parent_links(self):
+        values = [row.field_d1_str for row in PrefetchHubARepository3().receive()]
+        self.assertEqual(values, ["Fourth", "Fourth"])
+
+    def test_linked_fields_query_does_not_repeat_main_query(self):
+        hub_value_date_table = me_models.HubC.hub_value_date.field.model._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            list(PrefetchHubCRepository2().receive())
+        linked_field_queries = [
+            query["sql"]
+            for query in queries
+            if me_models.SatA1._meta.db_table in query["sql"]
+        ]
+        self.assertEqual(len(linked_field_queries), 1)
+        self.assertNotIn(hub_value_date_table, linked_field_queries[0])
+
+
 class TestTimeSeries(TestCase):
     def setUp(self) -> None:
         ts_satellite_c1 = me_factories.SatC1Factory.create(
@@ -3822,6 +4259,98 @@ class TestRepositoryViewModel(TestCase):
         self.assertEqual(post_objs.count(), 0)
 
 
+class TestRepositoryViewModelInsertFromSelect(TestCase):
+    def setUp(self):
+        hub_value_date = me_factories.CHubValueDateFactory.create(
+            value_date="2024-02-05"
+        )
+        me_factories.SatTSC2Factory.create(
+            hub_value_date=hub_value_date, field_tsc2_float=1.5
+        )
+        self.repo = HubCRepositoryViewModel()
+
+    def _stored_rows(self):
+        return list(
+            self.repo.view_model.objects.order_by("id").values(
+                "id", "hub_id", "value_date", "field_tsc2_float"
+            )
+        )
+
+    def test_store_does_not_load_rows_into_python(self):
+        with patch.object(
+            ViewModelRepository, "_bulk_create_from_query"
+        ) as bulk_create:
+            self.repo.store_in_view_model()
+        bulk_create.assert_not_called()
+        rows = self._stored_rows()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["value_date"], datetime.date(2024, 2, 5))
+        self.assertEqual(rows[0]["field_tsc2_float"], 1.5)
+
+    def test_fallback_stores_same_rows(self):
+        self.repo.store_in_view_model()
+        insert_rows = self._stored_rows()
+        with patch.object(ViewModelRepository, "INSERT_FROM_SELECT_VENDORS", set()):
+            self.repo.store_in_view_model()
+        self.assertEqual(self._stored_rows(), insert_rows)
+
+
+class TestRepositoryViewModelIncrementalRefresh(TestCase):
+    def setUp(self):
+        self.repo = HubARepository()
+        self.sat_1 = me_factories.SatA1Factory.create(field_a1_str="Test1")
+        self.sat_2 = me_factories.SatA1Factory.create(field_a1_str="Test2")
+        self.repo.store_in_view_model()
+        # Mark the stored rows to tell recomputed rows from untouched ones
+        self.repo.view_model.objects.update(comment="stored")
+
+    def _get_row(self, sat):
+        return self.repo.view_model.objects.get(hub_entity_id=sat.hub_entity_id)
+
+    def test_first_incremental_refresh_stores_everything(self):
+        ViewModelRefresh.objects.all().delete()
+        self.repo.view_model.objects.all().delete()
+        self.repo.store_in_view_model(incremental=True)
+        self.assertEqual(self.repo.view_model.objects.count(), 2)
+
+    def test_only_changed_hubs_are_refreshed(self):
+        self.sat_1.field_a1_str = "Changed"
+        self.sat_1.save()
+        self.repo.store_in_view_model(incremental=True)
+        row_1 = self._get_row(self.sat_1)
+        row_2 = self._get_row(self.sat_2)
+        self.assertEqual(row_1.field_a1_str, "Changed")
+        self.assertEqual(row_1.comment, "")
+        self.assertEqual(row_2.comment, "stored")
+
+    def test_new_hub_is_added(self):
+        sat_3 = me_factories.SatA1Factory.create(field_a1_str="Test3")
+        self.repo.store_in_view_model(incremental=True)
+        self.assertEqual(self.repo.view_model.objects.count(), 3)
+        self.assertEqual(self._get_row(sat_3).field_a1_str, "Test3")
+        self.assertEqual(self._get_row(self.sat_1).comment, "stored")
+
+    def test_deleted_hub_is_removed(self):
+        self.repo.delete(self.sat_1.hub_entity)
+        self.repo.store_in_view_model(incremental=True)
+        self.assertFalse(
+            self.repo.view_model.objects.filter(
+                hub_entity_id=self.sat_1.hub_entity_id
+            ).exists()
+        )
+
+    def test_linked_satellite_change_refreshes_hub(self):
+        sat_b = me_factories.SatB1Factory.create(field_b1_str="LinkedOld")
+        self.sat_2.hub_entity.link_hub_a_hub_b.add(sat_b.hub_entity)
+        self.repo.store_in_view_model()
+        self.repo.view_model.objects.update(comment="stored")
+        sat_b.field_b1_str = "LinkedNew"
+        sat_b.save()
+        self.repo.store_in_view_model(incremental=True)
+        self.assertEqual(self._get_row(self.sat_2).field_b1_str, "LinkedNew")
+        self.assertEqual(self._get_row(self.sat_1).comment, "stored")
+
+
 class TestRepositoryAsDF(TestCase):
     def setUp(self):
         sats = me_factories.SatA1Factory.create_batch(5)
@@ -3895,6 +4424,34 @@ class TestRepositoryAsDF(TestCase):
         test_df = repo.get_df(columns=["field_a1_str", "field_a2_float"])
         self.assertEqual(test_df.shape, (5, 2))
 
+    def test_get_df_chunked(self):
+        repo = HubBRepository({})
+        repo.store_in_view_model()
+        expected_df = repo.get_df()
+        test_df = repo.get_df(chunk_size=2)
+        pd.testing.assert_frame_equal(test_df, expected_df)
+
+    def test_get_df_chunked_empty(self):
+        repo = HubCRepository({})
+        expected_df = repo.get_df()
+        test_df = repo.get_df(chunk_size=2)
+        pd.testing.assert_frame_equal(test_df, expected_df)
+
+    def test_iter_df(self):
+        repo = HubARepository({})
+        repo.store_in_view_model()
+        expected_df = repo.get_df()
+        chunks = list(repo.iter_df(chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        for chunk in chunks:
+            self.assertEqual(list(chunk.columns), list(expected_df.columns))
+            self.assertTrue(pd.api.types.is_integer_dtype(chunk["field_a1_int"]))
+            self.assertTrue(pd.api.types.is_datetime64tz_dtype(chunk["created_at"]))
+        test_df = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_series_equal(
+            test_df["field_a1_str"], expected_df["field_a1_str"].astype("string")
+        )
+
     def test_get_df_no_category_columns(self):
         repo = HubBRepository({})
         df = repo.get_df(no_category_columns=["alert_level"])
@@ -4,7 +4,7 @@ from baseclasses.models import MontrekSatelliteABC
 
 
 class PipelineRegistrySatelliteABC(MontrekSatelliteABC):
-    class Meta:
+    class Meta(MontrekSatelliteABC.Meta):
         abstract = True
 
     celery_task_id = models.CharField(max_length=255, default="")
@@ -3,13 +3,14 @@ import datetime
 import inspect
 import json
 import tempfile
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
 from typing import Any, ClassVar, TypeVar
 from urllib.parse import quote, urlencode, urlparse
 
+import numpy as np
 import pandas as pd
 import requests
 from baseclasses.dataclasses.alert import AlertEnum
@@ -24,8 +25,9 @@ from django.utils.html import strip_tags
 from encrypted_fields import EncryptedCharField
 from pandas.core.tools.datetimes import DateParseError
 from reporting.core.reporting_colors import Color, ReportingColors
-from reporting.core.text_converter import HtmlLatexConverter
+from reporting.core.text_converter import HtmlLatexConverter, HtmlTextConverter
 from reporting.dataclasses.display_field import DisplayField
+from reporting.modules.compiled_templates import get_field_formatter
 from rest_framework import serializers
 
 from montrek.utils import SystemFormatting
@@ -55,6 +57,20 @@ class TableElement:
     td_classes: ClassVar[TdClassesType] = ["text-start"]
     th_classes: ClassVar[TdClassesType | None] = None
     field_template: ClassVar[str | None] = None
+    # Overriding any of these makes get_column_display_fields fall back to
+    # get_display_field row by row.
+    row_wise_methods: ClassVar[tuple[str, ...]] = (
+        "get_attribute",
+        "get_display_field",
+        "get_none_table_element",
+        "get_style_attrs",
+        "get_style_attrs_str",
+        "format_style_attr",
+        "get_td_classes",
+        "get_td_classes_str",
+        "format_td_classes",
+        "render_field_template",
+    )
 
     def format(self, _value):
         raise NotImplementedError
@@ -79,6 +95,37 @@ class TableElement:
     def get_value(self, _obj: Any) -> Any:
         raise NotImplementedError
 
+    def get_series(self, rows: Sequence[Any]) -> pd.Series:
+        """Column-wise counterpart of ``get_value`` for a batch of rows.
+
+        Elements reading a plain attribute convert the batch in one step with
+        ``format_series``; all others call ``get_value`` on each row.
+        """
+        if self._reads_column():
+            values = [self._get_value_from_attr(row, self.attr) for row in rows]
+            series = self.format_series(pd.Series(values, dtype=object))
+            if pd.api.types.is_object_dtype(series) or isinstance(
+                series.dtype, pd.StringDtype
+            ):
+                series = series.map(
+                    HtmlTextConverter.convert, na_action="ignore"
+                ).astype(series.dtype)
+            return series
+        values = [HtmlTextConverter.convert(self.get_value(row)) for row in rows]
+        return pd.Series(values, dtype=object)
+
+    def _reads_column(self) -> bool:
+        if not self.attr:
+            return False
+        # A subclass customising get_value without a matching format_series
+        # has to be evaluated row by row.
+        for klass in type(self).__mro__:
+            if "format_series" in vars(klass):
+                return True
+            if "get_value" in vars(klass):
+                return False
+        return False
+
     def get_value_len(self, obj: Any) -> int:
         return len(str(self.get_value(obj)))
 
@@ -129,6 +176,61 @@ class TableElement:
             value=obj_value,
         )
 
+    def get_column_display_fields(self, objs: Sequence[Any]) -> list[DisplayField]:
+        """Column-wise counterpart of ``get_display_field`` for a list of rows.
+
+        The styles and classes not depending on the value are built once for
+        the whole column. Elements rendering a field template or customising
+        one of ``row_wise_methods`` call ``get_display_field`` row by row.
+        """
+        if not self._formats_column():
+            return [self.get_display_field(obj) for obj in objs]
+        values = [self.get_attribute(obj, "html") for obj in objs]
+        return self._format_column(values, objs)
+
+    def _formats_column(self) -> bool:
+        if self.field_template is not None:
+            return False
+        element_class = type(self)
+        column_class = next(
+            klass for klass in element_class.__mro__ if "_format_column" in vars(klass)
+        )
+        return all(
+            getattr(element_class, name) is getattr(column_class, name)
+            for name in self.row_wise_methods
+        )
+
+    def _format_column(
+        self, values: list[Any], objs: Sequence[Any]
+    ) -> list[DisplayField]:
+        none_element = self.get_none_table_element()
+        none_style_attrs_str = none_element.get_style_attrs_str(None, None)
+        none_td_classes_str = none_element.get_td_classes_str(None, None)
+        style_attrs_str = self.get_style_attrs_str(None, None)
+        td_classes_str = self.get_td_classes_str(None, None)
+        display_fields = []
+        for value, obj in zip(values, objs, strict=True):
+            if self.empty_value(value):
+                display_field = DisplayField(
+                    name=self.name,
+                    display_value=none_element.format(value),
+                    style_attrs_str=none_style_attrs_str,
+                    td_classes_str=none_td_classes_str,
+                    hover_text=self.get_hover_text(obj, value),
+                    value=value,
+                )
+            else:
+                display_field = DisplayField(
+                    name=self.name,
+                    display_value=self.format(value),
+                    style_attrs_str=style_attrs_str,
+                    td_classes_str=td_classes_str,
+                    hover_text=self.get_hover_text(obj, value),
+                    value=value,
+                )
+            display_fields.append(display_field)
+        return display_fields
+
     def get_none_table_element(self):
         return NoneTableElement()
 
@@ -157,9 +259,11 @@ class TableElement:
             return value
         context_data = self.get_field_context_data(value, obj)
         context_data["value"] = value
-        return render_to_string(
-            f"tables/elements/{self.field_template}.html", context_data
-        )
+        template_name = f"tables/elements/{self.field_template}.html"
+        field_formatter = get_field_formatter(template_name)
+        if field_formatter is not None:
+            return field_formatter(context_data)
+        return render_to_string(template_name, context_data)
 
     def get_field_context_data(self, _value: Any, _obj: Any) -> dict[str, Any]:
         return {}
@@ -211,6 +315,9 @@ class AttrTableElement(TableElement):
     def format(self, value):
         return value
 
+    def format_series(self, series: pd.Series) -> pd.Series:
+        return series
+
 
 @dataclass
 class ExternalLinkTableElement(AttrTableElement):
@@ -520,6 +627,9 @@ class StringTableElement(AttrTableElement):
             return None
         return value
 
+    def format_series(self, series: pd.Series) -> pd.Series:
+        return series.astype("string")
+
     def _chunk_text(self, text: str) -> list[str]:
         words = text.split()
         chunks, current = [], ""
@@ -610,6 +720,48 @@ class NumberTableElement(AttrTableElement):
             value=value,
         )
 
+    def _format_column(
+        self, values: list[Any], objs: Sequence[Any]
+    ) -> list[DisplayField]:
+        # The style and classes only depend on whether the value is missing,
+        # a number, a negative number or something else.
+        is_na = pd.isna(pd.Series(values, dtype=object)).tolist()
+        na_td_classes_str = self.format_td_classes(self.get_td_classes(None, None))
+        text_td_classes_str = self.format_td_classes(self.get_td_classes("", None))
+        number_td_classes_str = self.format_td_classes(self.get_td_classes(0, None))
+        number_style_attrs_str = self.format_style_attr(self.get_style_attrs(0, None))
+        negative_style_attrs_str = self.format_style_attr(
+            self.get_style_attrs(-1, None)
+        )
+        empty_style_attrs_str = self.format_style_attr({})
+        display_fields = []
+        for value, obj, value_is_na in zip(values, objs, is_na, strict=True):
+            if value_is_na:
+                display_value = "-"
+                style_attrs_str = empty_style_attrs_str
+                td_classes_str = na_td_classes_str
+            elif not isinstance(value, int | float | Decimal):
+                display_value = str(value)
+                style_attrs_str = empty_style_attrs_str
+                td_classes_str = text_td_classes_str
+            else:
+                display_value = self._format_value(value)
+                style_attrs_str = (
+                    negative_style_attrs_str if value < 0 else number_style_attrs_str
+                )
+                td_classes_str = number_td_classes_str
+            display_fields.append(
+                DisplayField(
+                    name=self.name,
+                    display_value=display_value,
+                    style_attrs_str=style_attrs_str,
+                    td_classes_str=td_classes_str,
+                    hover_text=self.get_hover_text(obj, value),
+                    value=value,
+                )
+            )
+        return display_fields
+
     def get_td_classes(self, _value: Any, _obj: Any) -> TdClassesType:
         if pd.isna(_value):
             return ["text-center"]
@@ -651,13 +803,28 @@ class NumberTableElement(AttrTableElement):
         return self.shortener.shorten(value, 2)
 
     def get_value(self, obj: Any) -> Any:
-        value = super().get_value(obj)
+        return self._to_numerical_value(super().get_value(obj))
+
+    def _to_numerical_value(self, value: Any) -> Any:
         try:
             numerical_value = self.numerical_type(value)
         except (TypeError, ValueError):
             return value
         return numerical_value
 
+    def format_series(self, series: pd.Series) -> pd.Series:
+        numerical_series = pd.to_numeric(series, errors="coerce")
+        if numerical_series.isna().sum() > series.isna().sum():
+            # Values that are no numbers are kept as they are, like in get_value
+            return series.map(self._to_numerical_value)
+        if self.numerical_type is int:
+            try:
+                # Converted directly so integers above 2**53 stay exact
+                return series.astype("Int64")
+            except (TypeError, ValueError):
+                return np.trunc(numerical_series.astype("Float64")).astype("Int64")
+        return numerical_series.astype("Float64")
+
 
 @dataclass
 class FloatTableElement(NumberTableElement):
@@ -770,6 +937,14 @@ class DateTableBaseElement(AttrTableElement):
             value = timezone.make_naive(value)
         return value
 
+    def format_series(self, series: pd.Series) -> pd.Series:
+        datetime_series = pd.to_datetime(series, errors="coerce")
+        if datetime_series.dt.tz is not None:
+            datetime_series = datetime_series.dt.tz_convert(
+                timezone.get_current_timezone_name()
+            ).dt.tz_localize(None)
+        return datetime_series
+
 
 class DateTableElement(DateTableBaseElement):
     serializer_field_class = serializers.DateField
@@ -805,6 +980,9 @@ class BooleanTableElement(AttrTableElement):
     td_classes: ClassVar[TdClassesType] = ["text-center"]
     field_template: ClassVar[str | None] = "bool"
 
+    def format_series(self, series: pd.Series) -> pd.Series:
+        return series.astype("boolean")
+
     def format_latex(self, value) -> str:
         if value:
             return "\\twemoji{white_check_mark} &"
@@ -1135,3 +1313,8 @@ class SecretStringTableElement(StringTableElement):
         if value is None:
             return ""
         return "*" * min(56, len(str(value)))
+
+    def format_series(self, series: pd.Series) -> pd.Series:
+        lengths = series.astype("string").str.len().fillna(0).clip(upper=56)
+        stars = pd.Series("*", index=series.index, dtype="string")
+        return stars.str.repeat(lengths.astype(int))
@@ -1,11 +1,17 @@
 import datetime
+import itertools
 import math
 import os
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
 from decimal import Decimal
 from io import BytesIO
+from typing import Any
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from baseclasses.dataclasses.montrek_message import MontrekMessageInfo
 from baseclasses.managers.montrek_manager import MontrekManager
 from baseclasses.typing import SessionDataType, TableElementsType
@@ -13,8 +19,8 @@ from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.db.models import QuerySet
-from django.http import HttpResponseRedirect
-from django.template.loader import get_template, render_to_string
+from django.http import FileResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.template.loader import get_template
 from django.urls import reverse
 from django.utils import timezone
 from django.views.generic.base import HttpResponse
@@ -26,7 +32,9 @@ from reporting.core.text_converter import HtmlTextConverter
 from reporting.dataclasses import table_elements as te
 from reporting.dataclasses.display_field import DisplayField
 from reporting.lib.protocols import ReportElementProtocol
+from reporting.modules.compiled_templates import format_row, format_rows
 from reporting.modules.excel_formatter import MontrekExcelFormatter
+from reporting.modules.keyset_paginator import KeysetCursor, KeysetPaginator
 from reporting.modules.table_serializer import TableSerializer
 from reporting.tasks.download_table_task import DownloadTableTask
 from reporting.tasks.refresh_data_task import RefreshDataTask
@@ -46,6 +54,11 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
     is_compact_format = False
     is_large: bool = False
     latex_rows_per_page: int = 25
+    export_chunk_size: int = 10_000
+    # Serve csv and xlsx downloads batch by batch from get_output_dfs instead
+    # of building them in memory; they are streamed however large the table,
+    # instead of being sent by mail
+    stream_downloads: bool = False
     excel_formatter_class: type[MontrekExcelFormatter] = MontrekExcelFormatter
 
     def __init__(self, session_data: SessionDataType | None = None):
@@ -119,13 +132,21 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
         }
 
     def get_display_fields(self) -> list[list[DisplayField]]:
-        rows = []
-        for query_object in self.get_table():
-            elements = []
-            for table_element in self.table_elements:
-                elements.append(table_element.get_display_field(query_object))
-            rows.append(elements)
-        return rows
+        return self._get_display_fields(self.get_table(), self.table_elements)
+
+    @staticmethod
+    def _get_display_fields(
+        table: Iterable[Any], table_elements: Iterable[te.TableElement]
+    ) -> list[list[DisplayField]]:
+        # Formatted column by column, see TableElement.get_column_display_fields
+        rows = list(table)
+        columns = [
+            table_element.get_column_display_fields(rows)
+            for table_element in table_elements
+        ]
+        if not columns:
+            return [[] for _ in rows]
+        return [list(row) for row in zip(*columns, strict=True)]
 
     def to_html(self):
         template = get_template("tables/base_table.html")
@@ -133,11 +154,13 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
             order_field = self.order_field[1:]
         else:
             order_field = self.order_field
+        display_fields = self.get_display_fields()
         return template.render(
             context={
                 "table_title": self.table_title,
                 "table_elements": self.table_elements,
-                "display_fields": self.get_display_fields(),
+                "display_fields": display_fields,
+                "table_rows": format_rows(display_fields),
                 "order_field": order_field,
                 "order_descending": self.order_descending,
             }
@@ -154,7 +177,7 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
             table_element.get_display_field(query_object)
             for table_element in self.table_elements
         ]
-        return render_to_string("tables/partials/table_row.html", {"cells": cells})
+        return format_row(cells)
 
     def get_all_display_fields(self) -> list[list[DisplayField]]:
         """All rows (unpaginated) for PDF rendering."""
@@ -165,18 +188,20 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
         pdf_elements = [
             e for e in self.table_elements if not isinstance(e, te.LinkTableElement)
         ]
-        return [[e.get_display_field(obj) for e in pdf_elements] for obj in table]
+        return self._get_display_fields(table, pdf_elements)
 
     def to_pdf_html(self) -> str:
         template = get_template("tables/base_table.html")
         pdf_elements = [
             e for e in self.table_elements if not isinstance(e, te.LinkTableElement)
         ]
+        display_fields = self.get_all_display_fields()
         return template.render(
             context={
                 "table_title": self.table_title,
                 "table_elements": pdf_elements,
-                "display_fields": self.get_all_display_fields(),
+                "display_fields": display_fields,
+                "table_rows": format_rows(display_fields),
                 "order_field": None,
                 "order_descending": False,
                 "pdf_mode": True,
@@ -201,19 +226,13 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
         sheet_name: str = "Montrek Data",
         show_table_title: bool = False,
     ) -> HttpResponse | BytesIO | str:
-        table_df = self.get_output_df()
-        col_formats = self._get_excel_col_formats()
-        with pd.ExcelWriter(output, engine="openpyxl") as excel_writer:
-            row_offset = 3 if show_table_title else 0
-            table_df.to_excel(
-                excel_writer, index=False, sheet_name=sheet_name, startrow=row_offset
-            )
-            self.excel_formatter_class.format_excel(
-                excel_writer,
-                sheet_name=sheet_name,
-                col_formats=col_formats,
-                table_title=self.table_title if show_table_title else None,
-            )
+        self.excel_formatter_class.write_excel(
+            output,
+            [self.get_output_df()],
+            sheet_name=sheet_name,
+            col_formats=self._get_excel_col_formats(),
+            table_title=self.table_title if show_table_title else None,
+        )
         return output
 
     def _get_excel_col_formats(self) -> dict[int, str | None]:
@@ -227,18 +246,58 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
         table_df.to_csv(output, index=False)
         return output
 
+    def iter_csv(self) -> Iterator[str]:
+        """Yield the csv export batch by batch, the header with the first one."""
+        for idx, table_df in enumerate(self.get_output_dfs()):
+            yield table_df.to_csv(index=False, header=idx == 0)
+
+    def to_parquet(
+        self, output: HttpResponse | BytesIO | str
+    ) -> HttpResponse | BytesIO | str:
+        writer: pq.ParquetWriter | None = None
+        schema: pa.Schema | None = None
+        for table_df in self.get_output_dfs():
+            table = pa.Table.from_pandas(table_df, preserve_index=False)
+            if writer is None:
+                # Columns without any value in the first batch are typed as strings
+                schema = pa.schema(
+                    (
+                        field.with_type(pa.string())
+                        if pa.types.is_null(field.type)
+                        else field
+                    )
+                    for field in table.schema
+                )
+                writer = pq.ParquetWriter(output, schema)
+            writer.write_table(table.cast(schema))
+        if writer is not None:
+            writer.close()
+        return output
+
     def get_output_df(self) -> pd.DataFrame:
         return self.get_df()
 
+    def get_output_dfs(self) -> Iterator[pd.DataFrame]:
+        """Yield the export table in batches, used by the columnar exports."""
+        yield self.get_output_df()
+
     def download_or_mail_csv(self) -> HttpResponse:
-        return self._download_or_mail("csv", self._download_csv)
+        return self._download_or_mail("csv", self._download_csv, self._stream_csv)
 
     def download_or_mail_excel(self) -> HttpResponse:
-        return self._download_or_mail("xlsx", self._download_excel)
+        return self._download_or_mail("xlsx", self._download_excel, self._stream_excel)
+
+    def download_or_mail_parquet(self) -> HttpResponse:
+        return self._download_or_mail("parquet", self._download_parquet)
 
     def _download_or_mail(
-        self, filetype: str, download_method: callable
+        self,
+        filetype: str,
+        download_method: callable,
+        stream_method: callable | None = None,
     ) -> HttpResponse:
+        if self.stream_downloads and stream_method is not None:
+            return stream_method()
         if self.is_large:
             return self._handle_large_table(filetype)
         table_dimensions = self._get_table_dimensions()
@@ -274,6 +333,47 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
         )
         return response
 
+    def _stream_csv(self) -> StreamingHttpResponse:
+        response = StreamingHttpResponse(self.iter_csv())
+        return self.do_download(
+            response=response,
+            filename=f"{self.document_name}.csv",
+            content_type="text/csv",
+        )
+
+    def _stream_excel(self) -> FileResponse:
+        # openpyxl only writes the zip archive on save, so unlike the csv the
+        # whole workbook is written to a temporary file before the first byte
+        # is sent; only the memory is bounded. FileResponse takes ownership and
+        # closes it after streaming, so it is only closed here if writing fails
+        output = tempfile.TemporaryFile()  # noqa: SIM115
+        try:
+            self.excel_formatter_class.write_excel(
+                output,
+                self.get_output_dfs(),
+                sheet_name="Montrek Data",
+                col_formats=self._get_excel_col_formats(),
+            )
+            output.seek(0)
+        except Exception:
+            output.close()
+            raise
+        return self.do_download(
+            response=FileResponse(output),
+            filename=f"{self.document_name}.xlsx",
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+    def _download_parquet(self):
+        response = HttpResponse()
+        self.to_parquet(response)
+        response = self.do_download(
+            response=response,
+            filename=f"{self.document_name}.parquet",
+            content_type="application/vnd.apache.parquet",
+        )
+        return response
+
     def do_download(self, response, filename, content_type):
         response["Content-Type"] = content_type
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
@@ -295,6 +395,8 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
             self._send_table_excel_by_mail(file_name)
         elif filetype == "csv":
             self._send_table_csv_by_mail(file_name)
+        elif filetype == "parquet":
+            self._send_table_parquet_by_mail(file_name)
 
     def _send_table_excel_by_mail(self, file_name: str):
         output = BytesIO()
@@ -313,6 +415,12 @@ class MontrekTableManagerABC(MontrekManager, metaclass=MontrekTableMetaClass):
         self.to_csv(default_storage.path(temp_file_path))
         self._send_mail_with_file(temp_file_path, file_name)
 
+    def _send_table_parquet_by_mail(self, file_name: str):
+        if not os.path.exists(default_storage.path("")):
+            os.mkdir(default_storage.path(""))
+        self.to_parquet(default_storage.path(file_name))
+        self._send_mail_with_file(file_name, file_name)
+
     def _send_mail_with_file(self, saved_file: str, file_name: str):
         # Return the URL of the stored file
         file_url = self.session_data.get("host_url", "/") + reverse(
@@ -337,6 +445,10 @@ class MontrekTablePaginator:
     number: int
     num_pages: int
     show_paginator: bool
+    # Set by keyset pagination to lead to the neighbouring and last pages
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+    last_cursor: str | None = None
 
     @property
     def has_previous(self) -> bool:
@@ -357,6 +469,12 @@ class MontrekTablePaginator:
 
 class MontrekTableManager(MontrekTableManagerABC):
     is_paginated = True
+    # Page by seeking past the rows of the neighbouring page instead of by
+    # offset, so deep pages are as fast as the first one.
+    is_keyset_paginated: bool = False
+    # Only annotate the fields named by the table elements. Leave it off if a
+    # table element reads other fields, e.g. in an overridden get_value.
+    receive_table_fields_only: bool = False
 
     def __init__(self, session_data: SessionDataType | None = None):
         super().__init__(session_data)
@@ -374,25 +492,78 @@ class MontrekTableManager(MontrekTableManagerABC):
 
     def get_full_table(self) -> QuerySet | dict:
         self.set_order_field()
-        return self.repository.receive()
+        return self._receive_table()
 
     def get_df(self) -> pd.DataFrame:
-        queryset = self.repository.receive()
+        queryset = self._receive_table()
         self._preload_container(queryset)
         queryset = list(queryset)
         return self._build_df(queryset)
 
+    def get_table_fields(self) -> set[str]:
+        """Names of all fields the table elements read from a row."""
+        fields = set()
+        for table_element in self.table_elements:
+            values = [
+                getattr(table_element, name, "")
+                for name in ("attr", "text", "list_attr")
+            ]
+            values += getattr(table_element, "kwargs", {}).values()
+            fields.update(
+                value.split(".")[0] for value in values if isinstance(value, str)
+            )
+        fields.discard("")
+        return fields
+
+    def _receive_table(self) -> QuerySet:
+        if self.receive_table_fields_only:
+            return self.repository.receive_only(self.get_table_fields())
+        return self.repository.receive()
+
     def _preload_container(self, queryset: QuerySet | dict) -> None:
         """Hook for subclasses to bulk-prefetch data before row iteration."""
 
-    def _build_df(self, queryset: list) -> pd.DataFrame:
-        table_data = {}
-        table_elements = [
+    def get_output_dfs(self) -> Iterator[pd.DataFrame]:
+        """Yield the export table in batches of ``export_chunk_size`` rows.
+
+        The rows come from the same queryset and hooks as ``get_df``; each
+        column of a batch is built in one step (see ``TableElement.get_series``).
+        """
+        if not self._builds_output_in_batches():
+            yield from super().get_output_dfs()
+            return
+        table_elements = self._get_output_table_elements()
+        queryset = self._receive_table()
+        self._preload_container(queryset)
+        rows = queryset.iterator(chunk_size=self.export_chunk_size)
+        is_empty = True
+        for batch in itertools.batched(rows, self.export_chunk_size):
+            is_empty = False
+            yield pd.DataFrame(
+                {element.name: element.get_series(batch) for element in table_elements}
+            )
+        if is_empty:
+            yield pd.DataFrame(
+                {element.name: pd.Series(dtype=object) for element in table_elements}
+            )
+
+    def _builds_output_in_batches(self) -> bool:
+        # A manager changing how get_df builds the table exports it in one piece
+        return all(
+            getattr(type(self), name) is getattr(MontrekTableManager, name)
+            for name in ("get_output_df", "get_df", "_build_df")
+        )
+
+    def _get_output_table_elements(self) -> list[te.TableElement]:
+        return [
             table_element
             for table_element in self.table_elements
             if not isinstance(table_element, te.LinkTableElement)
         ]
-        for element in table_elements:
+
+    def _build_df(self, queryset: list) -> pd.DataFrame:
+        table_data = {}
+        for element in self._get_output_table_elements():
             table_data[element.name] = [
                 HtmlTextConverter.convert(element.get_value(row)) for row in queryset
             ]
@@ -407,18 +578,23 @@ class MontrekTableManager(MontrekTableManagerABC):
     def _paginate_queryset(self, queryset: QuerySet | dict):
         page_number = int(self.session_data.get("page", [1])[0])
         paginate_by = self.paginate_by
+        if self.is_keyset_paginated and isinstance(queryset, QuerySet):
+            keyset_paginator = KeysetPaginator(queryset, paginate_by)
+            if keyset_paginator.is_supported:
+                return self._paginate_by_keyset(keyset_paginator, page_number)
         offset = (page_number - 1) * paginate_by
-        results = list(
-            queryset[offset : offset + paginate_by + 1]
+        results = self._get_cached_result(
+            "page",
+            lambda: list(queryset[offset : offset + paginate_by + 1]),
+            offset,
+            paginate_by + 1,
         )  # Fetch 1 extra item
 
         len_results = len(results)
         trim_next = len_results > paginate_by
         if trim_next:
             results = results[:paginate_by]
-        len_full_table = (
-            paginate_by + 5 if self.is_large else self.get_full_table().count()
-        )
+        len_full_table = paginate_by + 5 if self.is_large else self.get_full_count()
         show_paginator = len_full_table > paginate_by
         num_pages = -1 if self.is_large else math.ceil(len_full_table / paginate_by)
 
@@ -429,8 +605,64 @@ class MontrekTableManager(MontrekTableManagerABC):
         )
         return results
 
+    def _paginate_by_keyset(
+        self, keyset_paginator: KeysetPaginator, page_number: int
+    ) -> list:
+        paginate_by = self.paginate_by
+        len_full_table = paginate_by + 5 if self.is_large else self.get_full_count()
+        num_pages = -1 if self.is_large else math.ceil(len_full_table / paginate_by)
+        keyset_paginator.count = None if self.is_large else len_full_table
+        cursor = self.session_data.get("cursor")
+        if isinstance(cursor, list | tuple):
+            cursor = cursor[0]
+        keyset_cursor = None if cursor is None else KeysetCursor.decode(cursor)
+        results = self._get_cached_result(
+            "keyset_page",
+            lambda: keyset_paginator.get_page(page_number, keyset_cursor),
+            page_number,
+            paginate_by,
+            cursor,
+        )
+
+        self.paginator = MontrekTablePaginator(
+            number=page_number,
+            num_pages=num_pages,
+            show_paginator=len_full_table > paginate_by,
+        )
+        if results:
+            self.paginator.next_cursor = keyset_paginator.get_cursor(
+                page_number + 1, results[-1]
+            )
+        if results and page_number > 1:
+            self.paginator.previous_cursor = keyset_paginator.get_cursor(
+                page_number - 1, results[0], backwards=True
+            )
+        if num_pages > 1:
+            self.paginator.last_cursor = keyset_paginator.get_cursor(
+                num_pages, None, backwards=True
+            )
+        return results
+
+    def get_full_count(self) -> int:
+        if type(self).get_full_table is MontrekTableManager.get_full_table:
+            # The repository counts its rows without building the annotations
+            self.set_order_field()
+            return self.repository.receive_count()
+        return self._get_cached_result("count", lambda: self.get_full_table().count())
+
+    def _get_cached_result(
+        self, name: str, compute: Callable[[], Any], *args: Any
+    ) -> Any:
+        # Keyed by the manager as get_full_table may be overridden
+        result_cache = self.repository.get_result_cache()
+        if result_cache is None:
+            return compute()
+        return result_cache.get_or_compute(
+            f"{type(self).__qualname__}.{name}", compute, *args
+        )
+
     def _get_table_dimensions(self) -> int:
-        rows = self.repository.receive().count()
+        rows = self.repository.receive_count()
         cols = len(self.table_elements)
         return rows * cols
 
@@ -0,0 +1,119 @@
+"""
+Python counterparts of the table templates rendered for every row and cell.
+
+Each formatter returns the same HTML as its template, but without a Django
+template render per call. A formatter is only used while its template
+resolves to the file shipped with this app; projects overriding the
+template keep rendering it with Django. All values are escaped by
+render_value, so the assembled HTML is marked safe.
+"""
+
+from collections.abc import Callable, Iterable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from django.template import Context
+from django.template.base import render_value_in_context
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import SafeString, mark_safe
+from reporting.dataclasses.display_field import DisplayField
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+TABLE_ROW_TEMPLATE = "tables/partials/table_row.html"
+TABLE_CELL_TEMPLATE = "tables/partials/table_cell.html"
+
+# Only read by render_value_in_context, so one instance serves all calls
+_CONTEXT = Context()
+
+
+@cache
+def is_default_template(template_name: str) -> bool:
+    origin = get_template(template_name).origin
+    return Path(origin.name) == TEMPLATES_DIR / template_name
+
+
+def render_value(value: Any) -> str:
+    """The output of {{ value }} in an autoescaping template."""
+    return render_value_in_context(value, _CONTEXT)
+
+
+def format_string_field(context_data: dict[str, Any]) -> SafeString:
+    # tables/elements/string.html
+    chunks = context_data.get("chunks")
+    if chunks:
+        last = len(chunks) - 1
+        lines = "".join(
+            f"\n    {render_value(chunk)}{'<br>' if i < last else ''}\n  "
+            for i, chunk in enumerate(chunks)
+        )
+        return mark_safe(f"\n  {lines}\n\n")  # noqa: S308  # nosec B308 B703
+    value = render_value(context_data.get("value"))
+    return mark_safe(f"\n  {value}\n\n")  # noqa: S308  # nosec B308 B703
+
+
+def format_money_field(context_data: dict[str, Any]) -> SafeString:
+    # tables/elements/money.html
+    value = render_value(context_data.get("value"))
+    ccy_symbol = render_value(context_data.get("ccy_symbol", ""))
+    return mark_safe(f"{value}{ccy_symbol}\n")  # noqa: S308  # nosec B308 B703
+
+
+def format_bool_field(context_data: dict[str, Any]) -> SafeString:
+    # tables/elements/bool.html
+    if context_data.get("value"):
+        icon = "bi-check-circle-fill text-success"
+    else:
+        icon = "bi-x-circle-fill text-danger"
+    html = f'\n    <span class="bi {icon}"></span>\n\n'
+    return mark_safe(html)  # noqa: S308  # nosec B308 B703
+
+
+FIELD_FORMATTERS: dict[str, Callable[[dict[str, Any]], SafeString]] = {
+    "tables/elements/string.html": format_string_field,
+    "tables/elements/money.html": format_money_field,
+    "tables/elements/bool.html": format_bool_field,
+}
+
+
+def get_field_formatter(
+    template_name: str,
+) -> Callable[[dict[str, Any]], SafeString] | None:
+    formatter = FIELD_FORMATTERS.get(template_name)
+    if formatter is None or not is_default_template(template_name):
+        return None
+    return formatter
+
+
+def format_cell(display_field: DisplayField) -> str:
+    # tables/partials/table_cell.html
+    html = "<td\n  "
+    if display_field.td_classes_str:
+        html += f'\n    class="{render_value(display_field.td_classes_str)}"\n  '
+    html += "\n  "
+    if display_field.style_attrs_str:
+        html += f'\n    style="{render_value(display_field.style_attrs_str)}"\n  '
+    html += "\n  "
+    if display_field.hover_text:
+        html += (
+            '\n    data-bs-toggle="tooltip"'
+            f'\n    data-bs-title="{render_value(display_field.hover_text)}"\n  '
+        )
+    return f"{html}\n>\n  {render_value(display_field.display_value)}\n</td>\n"
+
+
+def format_row(cells: Iterable[DisplayField]) -> SafeString:
+    """The output of tables/partials/table_row.html for the cells."""
+    if not (
+        is_default_template(TABLE_ROW_TEMPLATE)
+        and is_default_template(TABLE_CELL_TEMPLATE)
+    ):
+        return render_to_string(TABLE_ROW_TEMPLATE, {"cells": cells})
+    html = "".join(f"\n    {format_cell(cell)}\n  " for cell in cells)
+    return mark_safe(f"<tr>\n  {html}\n</tr>\n")  # noqa: S308  # nosec B308 B703
+
+
+def format_rows(rows: Iterable[Iterable[DisplayField]]) -> SafeString:
+    """The table body rendered by the row loop of tables/base_table.html."""
+    html = "".join(f"\n          {format_row(cells)}\n        " for cells in rows)
+    return mark_safe(html)  # noqa: S308  # nosec B308 B703
@@ -1,4 +1,11 @@
-from openpyxl.styles import PatternFill, Border, Side, Alignment, Font
+import datetime
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Border, Side, Alignment, Font, NamedStyle
 from openpyxl.utils import get_column_letter
 
 from baseclasses.templatetags.colors import get_color
@@ -25,6 +32,161 @@ class MontrekExcelFormatter:
         """
         cls()._format_excel_impl(writer, sheet_name, col_formats, table_title)
 
+    @classmethod
+    def write_excel(
+        cls,
+        output,
+        dfs: Iterable[pd.DataFrame],
+        sheet_name="Sheet1",
+        col_formats=None,
+        table_title: None | str = None,
+    ):
+        """Write the data frames one after another into a single sheet.
+
+        Uses a write-only workbook and styles each cell as it is appended, so
+        only one data frame is held in memory at a time. A write-only sheet
+        needs its column widths before the first row, so they are sized from
+        the first data frame; pass all rows in one data frame to size them
+        from the whole table.
+        """
+        cls()._write_excel_impl(output, dfs, sheet_name, col_formats, table_title)
+
+    def _write_excel_impl(
+        self,
+        output,
+        dfs: Iterable[pd.DataFrame],
+        sheet_name="Sheet1",
+        col_formats=None,
+        table_title: None | str = None,
+    ):
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(sheet_name)
+        styles = self._get_style_objects()
+        col_formats = col_formats or {}
+        row_style_names: list[tuple[str, str]] | None = None
+        row_idx = 1
+        for df_idx, df in enumerate(dfs):
+            if df_idx == 0:
+                self._set_column_widths(worksheet, df)
+                if table_title is not None:
+                    self._append_title(worksheet, table_title, len(df.columns))
+                worksheet.append(self._get_header_cells(worksheet, df, styles))
+                if not self._styles_depend_on_row():
+                    row_style_names = self._add_row_styles(
+                        workbook, len(df.columns), col_formats, styles
+                    )
+            for values in self._get_values(df).itertuples(index=False, name=None):
+                row_idx += 1
+                if row_style_names is None:
+                    row = [WriteOnlyCell(worksheet, value=value) for value in values]
+                    for col_idx, cell in enumerate(row):
+                        self._style_data_cell(cell, row_idx, styles, row)
+                        self._format_data_cell(cell, col_formats.get(col_idx))
+                else:
+                    row = [
+                        self._get_data_cell(worksheet, value, names[row_idx % 2])
+                        for value, names in zip(values, row_style_names, strict=True)
+                    ]
+                worksheet.append(row)
+        workbook.save(output)
+
+    def _styles_depend_on_row(self) -> bool:
+        """Whether a subclass styles data cells by more than the row parity, in
+        which case the shared named styles cannot be used."""
+        return type(self)._style_data_cell is not MontrekExcelFormatter._style_data_cell
+
+    def _append_title(self, worksheet, title: str, num_cols: int) -> None:
+        """Append the title in the second of three rows above the header."""
+        title_cell = WriteOnlyCell(worksheet, value=title)
+        title_cell.font = Font(bold=True, size=14)
+        title_cell.alignment = Alignment(horizontal="center", vertical="center")
+        worksheet.row_dimensions[2].height = 24
+        if num_cols > 1:
+            worksheet.merged_cells.add(f"A2:{get_column_letter(num_cols)}2")
+        worksheet.append([])
+        worksheet.append([title_cell])
+        worksheet.append([])
+
+    def _get_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        values = df.astype(object).where(df.notna(), None)
+        for col_idx, dtype in enumerate(df.dtypes):
+            if pd.api.types.is_object_dtype(dtype):
+                values.iloc[:, col_idx] = values.iloc[:, col_idx].map(
+                    self._get_excel_value
+                )
+        return values
+
+    def _get_excel_value(self, value):
+        """Convert a value the way pandas' ExcelWriter does before writing it."""
+        if value is None or isinstance(value, (str, int, float, datetime.date)):
+            return value
+        if isinstance(value, datetime.timedelta):
+            return value.total_seconds() / 86400
+        if isinstance(value, np.generic):
+            return value.item()
+        return str(value)
+
+    def _get_header_cells(self, worksheet, df: pd.DataFrame, styles) -> list:
+        cells = []
+        for col_idx, name in enumerate(df.columns):
+            cell = WriteOnlyCell(worksheet, value=name)
+            self._style_header_cell(cell, styles, col_idx)
+            cells.append(cell)
+        return cells
+
+    def _add_row_styles(
+        self,
+        workbook,
+        num_cols: int,
+        col_formats: dict[int, str | None],
+        styles,
+    ) -> list[tuple[str, str]]:
+        """Register one named style per row colour and column format and return
+        the (even, odd) style names of each column. Only used while
+        _style_data_cell depends on nothing but the row parity."""
+        style_names: dict[str | None, tuple[str, str]] = {}
+        excel_format_strs = dict.fromkeys(col_formats.get(i) for i in range(num_cols))
+        for excel_format_str in excel_format_strs:
+            names = []
+            for row_idx in (0, 1):
+                name = f"montrek_data_{len(style_names)}_{row_idx}"
+                style = NamedStyle(name=name)
+                self._style_data_cell(style, row_idx, styles, [])
+                self._format_data_cell(style, excel_format_str)
+                workbook.add_named_style(style)
+                names.append(name)
+            style_names[excel_format_str] = tuple(names)
+        return [style_names[col_formats.get(i)] for i in range(num_cols)]
+
+    def _get_data_cell(self, worksheet, value, style_name: str) -> WriteOnlyCell:
+        cell = WriteOnlyCell(worksheet)
+        cell.style = style_name
+        # Set after the style so dates keep the number format openpyxl gives them
+        cell.value = value
+        return cell
+
+    def _set_column_widths(self, worksheet, df: pd.DataFrame) -> None:
+        for col_idx, name in enumerate(df.columns, 1):
+            max_length = max(
+                len(str(name)) * self.BOLD_FONT_MULTIPLIER,
+                self._get_series_display_length(df.iloc[:, col_idx - 1])
+                * self.NORMAL_FONT_MULTIPLIER,
+            )
+            column_letter = get_column_letter(col_idx)
+            worksheet.column_dimensions[column_letter].width = self._bound_width(
+                max_length
+            )
+
+    def _get_series_display_length(self, series: pd.Series) -> int:
+        """The display length of the longest value, taken from the column
+        statistics instead of measuring each cell."""
+        values = series.dropna()
+        if values.empty:
+            return 0
+        if pd.api.types.is_float_dtype(values):
+            return max(len(f"{value:,.2f}") for value in (values.min(), values.max()))
+        return int(values.astype(str).str.len().max())
+
     def _format_excel_impl(
         self,
         writer,
@@ -133,7 +295,10 @@ class MontrekExcelFormatter:
                 display_length = self._get_display_length(cell)
                 max_length = max(max_length, display_length)
 
-        # Apply bounds and padding
+        return self._bound_width(max_length)
+
+    def _bound_width(self, max_length: float) -> float:
+        """Apply bounds and padding to a content length."""
         return min(
             max(
                 max_length + self.COLUMN_PADDING,
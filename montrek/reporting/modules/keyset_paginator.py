@@ -0,0 +1,172 @@
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import OrderBy
+
+DATETIME_KEY = "__datetime__"
+
+
+class KeysetCursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder cuts datetimes to milliseconds, cursors need them exact."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return {DATETIME_KEY: o.isoformat()}
+        return super().default(o)
+
+
+def _decode_datetime(obj: dict[str, Any]) -> Any:
+    if DATETIME_KEY in obj:
+        return datetime.datetime.fromisoformat(obj[DATETIME_KEY])
+    return obj
+
+
+@dataclass
+class KeysetCursor:
+    """
+    Position of a page next to the row with the given order values.
+
+    A cursor leads forwards to the page after the row, or backwards to the
+    page before it. Backwards without values it leads to the last page.
+    """
+
+    page: int
+    order_by: list[str]
+    values: list[Any] | None
+    backwards: bool = False
+
+    def encode(self) -> str:
+        data = json.dumps(
+            [self.page, self.order_by, self.values, self.backwards],
+            cls=KeysetCursorEncoder,
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "KeysetCursor | None":
+        try:
+            page, order_by, values, backwards = json.loads(
+                base64.urlsafe_b64decode(cursor.encode()),
+                object_hook=_decode_datetime,
+            )
+        except (binascii.Error, TypeError, ValueError):
+            return None
+        return cls(page, order_by, values, backwards)
+
+
+class KeysetPaginator:
+    """
+    Page through a queryset by seeking past the row next to the page instead
+    of skipping all rows before it, so every page costs the same.
+
+    Rows are ordered by the order fields of the queryset, with nulls last and
+    the primary key as tiebreaker. Pages without a matching cursor are read
+    by offset in the same order.
+    """
+
+    def __init__(self, queryset: QuerySet, paginate_by: int, count: int | None = None):
+        self.queryset = queryset
+        self.paginate_by = paginate_by
+        self.count = count
+        self.order_by = self.get_order_by(queryset)
+
+    @staticmethod
+    def get_order_by(queryset: QuerySet) -> list[str] | None:
+        """Return the order fields with the tiebreaker, or None if unsupported."""
+        order_by = list(queryset.query.order_by or queryset.model._meta.ordering)
+        for field in order_by:
+            # Expressions, random order and related fields cannot be read
+            # back from the rows of a page
+            if not isinstance(field, str) or field == "?" or LOOKUP_SEP in field:
+                return None
+        descending = bool(order_by) and order_by[-1].startswith("-")
+        return order_by + ["-pk" if descending else "pk"]
+
+    @property
+    def is_supported(self) -> bool:
+        return self.order_by is not None
+
+    def get_page(self, page_number: int, cursor: KeysetCursor | None) -> list:
+        if page_number > 1 and self._leads_to_page(cursor, page_number):
+            if cursor.values is not None:
+                return self._seek(cursor.values, cursor.backwards)
+            if self.count is not None:
+                last_page_size = self.count - (page_number - 1) * self.paginate_by
+                rows = self.queryset.order_by(*self._get_ordering(backwards=True))
+                return list(rows[: max(last_page_size, 0)])[::-1]
+        offset = (max(page_number, 1) - 1) * self.paginate_by
+        rows = self.queryset.order_by(*self._get_ordering())
+        return list(rows[offset : offset + self.paginate_by])
+
+    def get_cursor(
+        self, page_number: int, row: Any | None, backwards: bool = False
+    ) -> str:
+        values = None if row is None else self._get_values(row)
+        return KeysetCursor(page_number, self.order_by, values, backwards).encode()
+
+    def _leads_to_page(self, cursor: KeysetCursor | None, page_number: int) -> bool:
+        return (
+            cursor is not None
+            and cursor.page == page_number
+            and cursor.order_by == self.order_by
+            and (cursor.values is None or len(cursor.values) == len(self.order_by))
+        )
+
+    def _seek(self, values: list[Any], backwards: bool) -> list:
+        rows = self.queryset.filter(self._get_seek_filter(values, backwards))
+        rows = rows.order_by(*self._get_ordering(backwards))[: self.paginate_by]
+        return list(rows)[::-1] if backwards else list(rows)
+
+    def _get_seek_filter(self, values: list[Any], backwards: bool) -> Q:
+        # Rows after (or before) the cursor row: equal on all previous order
+        # fields and beyond it on the current one
+        conditions = []
+        equal = Q()
+        for field, value in zip(self.order_by, values, strict=True):
+            name = field.removeprefix("-")
+            descending = field.startswith("-")
+            beyond = self._get_beyond_filter(name, value, descending, backwards)
+            if beyond is not None:
+                conditions.append(equal & beyond)
+            if value is None:
+                equal &= Q(**{f"{name}__isnull": True})
+            else:
+                equal &= Q(**{name: value})
+        return reduce(or_, conditions)
+
+    @staticmethod
+    def _get_beyond_filter(
+        name: str, value: Any, descending: bool, backwards: bool
+    ) -> Q | None:
+        # Nulls are ordered last, so they follow every value
+        if value is None:
+            return Q(**{f"{name}__isnull": False}) if backwards else None
+        lookup = "lt" if descending != backwards else "gt"
+        beyond = Q(**{f"{name}__{lookup}": value})
+        if not backwards:
+            beyond |= Q(**{f"{name}__isnull": True})
+        return beyond
+
+    def _get_ordering(self, backwards: bool = False) -> list[OrderBy]:
+        # Backwards is the exact reverse of the page order
+        nulls = {"nulls_first": True} if backwards else {"nulls_last": True}
+        ordering = []
+        for field in self.order_by:
+            expression = F(field.removeprefix("-"))
+            if field.startswith("-") != backwards:
+                ordering.append(expression.desc(**nulls))
+            else:
+                ordering.append(expression.asc(**nulls))
+        return ordering
+
+    def _get_values(self, row: Any) -> list[Any]:
+        return [getattr(row, field.removeprefix("-")) for field in self.order_by]
@@ -8,6 +8,6 @@ class RefreshDataTask(MontrekTask):
         task_name = f"{manager_class.__module__}.{manager_class.__name__}_refresh_data"
         super().__init__(task_name)
 
-    def run(self) -> str:
-        self.manager_class().repository.store_in_view_model()
+    def run(self, incremental: bool = False) -> str:
+        self.manager_class().repository.store_in_view_model(incremental=incremental)
         return "Refreshed data"
@@ -2,10 +2,13 @@ import datetime
 from dataclasses import dataclass
 from decimal import Decimal
 from functools import wraps
+from types import SimpleNamespace
 from typing import Any, Protocol
 from unittest import mock
 from montrek.utils import SystemFormatting
 
+import pandas as pd
+
 import reporting.dataclasses.table_elements as te
 from baseclasses.tests.factories.baseclass_factories import TestMontrekSatelliteFactory
 from django.test import TestCase, override_settings
@@ -121,6 +124,9 @@ class TableElementTestingToolMixin(HasAssertEqual):
         if expected_td_classes is None:
             expected_td_classes = ["text-start"]
         test_display_field = table_element.get_display_field(obj)
+        self.assertEqual(
+            table_element.get_column_display_fields([obj]), [test_display_field]
+        )
         self.assertEqual(test_display_field.name, table_element.name)
         self.assertEqual(
             test_display_field.display_value.replace("\n", "").lstrip(),
@@ -1719,6 +1725,149 @@ class TestTableElements(TestCase, TableElementTestingToolMixin):
         self.assertEqual(element.get_display_field({}).display_value, "-")
 
 
+class TestTableElementGetSeries(TestCase):
+    def setUp(self):
+        self.rows = [
+            SimpleNamespace(
+                text="a &amp; b",
+                number=1.7,
+                flag=True,
+                date=datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.UTC),
+                masked="hidden",
+                parent=SimpleNamespace(name="p"),
+            ),
+            SimpleNamespace(
+                text=None,
+                number=None,
+                flag=None,
+                date=None,
+                masked=None,
+                parent=SimpleNamespace(name=None),
+            ),
+        ]
+
+    def test_string_series(self):
+        series = te.StringTableElement(name="T", attr="text").get_series(self.rows)
+        self.assertEqual(series.dtype, "string")
+        self.assertEqual(series[0], "a & b")
+        self.assertTrue(pd.isna(series[1]))
+
+    def test_number_series(self):
+        series = te.IntTableElement(name="N", attr="number").get_series(self.rows)
+        self.assertEqual(series.dtype, "Int64")
+        self.assertEqual(series[0], 1)
+        series = te.FloatTableElement(name="N", attr="number").get_series(self.rows)
+        self.assertEqual(series.dtype, "Float64")
+        self.assertEqual(series[0], 1.7)
+        self.assertTrue(pd.isna(series[1]))
+
+    def test_number_series_keeps_non_numbers(self):
+        rows = [SimpleNamespace(number=1.5), SimpleNamespace(number="n/a")]
+        for element_class in (te.FloatTableElement, te.IntTableElement):
+            with self.subTest(element_class=element_class):
+                element = element_class(name="N", attr="number")
+                self.assertEqual(
+                    element.get_series(rows + self.rows[1:]).tolist(),
+                    [element.get_value(row) for row in rows + self.rows[1:]],
+                )
+
+    def test_int_series_keeps_large_integers(self):
+        rows = [SimpleNamespace(number=2**60 + 1), SimpleNamespace(number=None)]
+        series = te.IntTableElement(name="N", attr="number").get_series(rows)
+        self.assertEqual(series.dtype, "Int64")
+        self.assertEqual(series[0], 2**60 + 1)
+        self.assertTrue(pd.isna(series[1]))
+
+    def test_bool_series(self):
+        series = te.BooleanTableElement(name="B", attr="flag").get_series(self.rows)
+        self.assertEqual(series.dtype, "boolean")
+        self.assertTrue(series[0])
+
+    @override_settings(TIME_ZONE="Europe/Berlin")
+    def test_date_series_is_naive_local_time(self):
+        series = te.DateTimeTableElement(name="D", attr="date").get_series(self.rows)
+        self.assertEqual(series[0], pd.Timestamp(2024, 1, 1, 13))
+        self.assertTrue(pd.isna(series[1]))
+
+    def test_secret_series(self):
+        series = te.SecretStringTableElement(name="S", attr="masked").get_series(
+            self.rows
+        )
+        self.assertEqual(series.tolist(), ["******", ""])
+
+    def test_custom_get_value_is_evaluated_per_row(self):
+        @dataclass
+        class UpperTableElement(te.StringTableElement):
+            def get_value(self, obj):
+                return obj.text.upper() if obj.text else None
+
+        series = UpperTableElement(name="U", attr="text").get_series(self.rows)
+        self.assertEqual(series.tolist(), ["A & B", None])
+
+    def test_related_attr_is_evaluated_per_row(self):
+        @dataclass
+        class ParentTableElement(te.StringTableElement):
+            def get_value(self, obj):
+                return obj.parent.name
+
+        series = ParentTableElement(name="P", attr="parent").get_series(self.rows)
+        self.assertEqual(series.tolist(), ["p", None])
+
+    def test_missing_attr_matches_get_value(self):
+        element = te.StringTableElement(name="M", attr="missing")
+        self.assertEqual(
+            element.get_series(self.rows).tolist(),
+            [element.get_value(row) for row in self.rows],
+        )
+
+
+class TestTableElementColumnDisplayFields(TestCase):
+    def setUp(self):
+        self.rows = [
+            {"value": 1234.5, "date": datetime.date(2024, 1, 31)},
+            {"value": -2, "date": None},
+            {"value": None, "date": datetime.date(2024, 2, 1)},
+            {"value": "n/a", "date": datetime.date(2024, 2, 2)},
+        ]
+
+    def assert_column_matches_rows(self, table_element: te.TableElement):
+        self.assertEqual(
+            table_element.get_column_display_fields(self.rows),
+            [table_element.get_display_field(row) for row in self.rows],
+        )
+
+    def test_number_columns(self):
+        for element_class in (
+            te.FloatTableElement,
+            te.IntTableElement,
+            te.PercentTableElement,
+            te.EuroTableElement,
+        ):
+            with self.subTest(element_class=element_class):
+                self.assert_column_matches_rows(element_class(name="N", attr="value"))
+
+    def test_date_column(self):
+        self.assert_column_matches_rows(te.DateTableElement(name="D", attr="date"))
+
+    def test_formats_column_without_templates(self):
+        self.assertTrue(te.FloatTableElement(name="N", attr="value")._formats_column())
+        self.assertTrue(te.DateTableElement(name="D", attr="date")._formats_column())
+        self.assertFalse(te.EuroTableElement(name="N", attr="value")._formats_column())
+        self.assertFalse(
+            te.StringTableElement(name="S", attr="value")._formats_column()
+        )
+
+    def test_custom_style_is_evaluated_per_row(self):
+        @dataclass
+        class BoldDateTableElement(te.DateTableElement):
+            def get_td_classes(self, value, obj):
+                return ["fw-bold"] if value else ["text-start"]
+
+        table_element = BoldDateTableElement(name="D", attr="date")
+        self.assertFalse(table_element._formats_column())
+        self.assert_column_matches_rows(table_element)
+
+
 class TestCompDataField(TestCase):
     """Tests for CompDataField and its wiring into ComparisonTableElement.
 
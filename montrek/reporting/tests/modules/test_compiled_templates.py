@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+from django.template.loader import render_to_string
+from django.test import TestCase
+from reporting.dataclasses.display_field import DisplayField
+from reporting.modules.compiled_templates import (
+    TABLE_ROW_TEMPLATE,
+    format_bool_field,
+    format_money_field,
+    format_row,
+    format_rows,
+    format_string_field,
+    get_field_formatter,
+    is_default_template,
+)
+
+
+class TestCompiledTemplates(TestCase):
+    def setUp(self):
+        self.cells = [
+            DisplayField(
+                name="a",
+                display_value="<b>&</b>",
+                style_attrs_str="color: #BE0D3E;",
+                td_classes_str="text-end",
+                hover_text='say "hi"',
+                value=1,
+            ),
+            DisplayField(
+                name="b",
+                display_value=1234.5,
+                style_attrs_str="",
+                td_classes_str="",
+                hover_text=None,
+                value=1234.5,
+            ),
+        ]
+
+    def test_field_formatters_match_templates(self):
+        cases = [
+            (format_string_field, "string", {"value": "a <b>", "chunks": None}),
+            (
+                format_string_field,
+                "string",
+                {"value": "long text", "chunks": ["long", "te&xt"]},
+            ),
+            (format_money_field, "money", {"value": "1,234.00", "ccy_symbol": "€"}),
+            (format_bool_field, "bool", {"value": True}),
+            (format_bool_field, "bool", {"value": False}),
+        ]
+        for formatter, template, context_data in cases:
+            with self.subTest(template=template, context_data=context_data):
+                self.assertEqual(
+                    formatter(context_data),
+                    render_to_string(f"tables/elements/{template}.html", context_data),
+                )
+
+    def test_format_row_matches_template(self):
+        self.assertEqual(
+            format_row(self.cells),
+            render_to_string(TABLE_ROW_TEMPLATE, {"cells": self.cells}),
+        )
+
+    def test_format_rows(self):
+        row = format_row(self.cells)
+        self.assertEqual(
+            format_rows([self.cells, self.cells]),
+            f"\n          {row}\n        \n          {row}\n        ",
+        )
+        self.assertEqual(format_rows([]), "")
+
+    def test_default_templates(self):
+        self.assertTrue(is_default_template(TABLE_ROW_TEMPLATE))
+        self.assertIsNotNone(get_field_formatter("tables/elements/string.html"))
+        self.assertIsNone(get_field_formatter("tables/elements/link.html"))
+
+    def test_overridden_templates_are_rendered(self):
+        with patch(
+            "reporting.modules.compiled_templates.is_default_template",
+            return_value=False,
+        ):
+            self.assertIsNone(get_field_formatter("tables/elements/string.html"))
+            with patch(
+                "reporting.modules.compiled_templates.render_to_string",
+                return_value="<tr></tr>",
+            ) as render_mock:
+                self.assertEqual(format_row(self.cells), "<tr></tr>")
+            render_mock.assert_called_once()
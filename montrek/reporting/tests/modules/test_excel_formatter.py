@@ -1,6 +1,11 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pandas as pd
 from django.test import TestCase
 from unittest.mock import Mock
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import PatternFill, Border, Font
 
 from baseclasses.templatetags.colors import get_color
@@ -41,6 +46,122 @@ class MontrekExcelFormatterTests(TestCase):
         # Verify column width was adjusted
         self.assertGreater(self.worksheet.column_dimensions["A"].width, 0)
 
+    # ==================== Tests for write_excel ====================
+
+    def test_write_excel_writes_all_data_frames_styled(self):
+        """Test that write_excel appends every data frame below one header."""
+        dfs = [
+            pd.DataFrame({"Name": ["a", "b"], "Value": [1.5, None]}),
+            pd.DataFrame({"Name": ["c"], "Value": [1234567.891]}),
+        ]
+        output = io.BytesIO()
+
+        self.excel_formatter.write_excel(
+            output, iter(dfs), col_formats={0: None, 1: "#,##0.00"}
+        )
+
+        output.seek(0)
+        worksheet = load_workbook(output)["Sheet1"]
+        values = [[cell.value for cell in row] for row in worksheet.iter_rows()]
+        self.assertEqual(
+            values,
+            [["Name", "Value"], ["a", 1.5], ["b", None], ["c", 1234567.891]],
+        )
+        self.assertTrue(worksheet["A1"].font.bold)
+        self.assertEqual(worksheet["B2"].number_format, "#,##0.00")
+        self.assertEqual(worksheet["B2"].alignment.horizontal, "right")
+        self.assertEqual(worksheet["A2"].alignment.horizontal, "left")
+        primary_light = get_color("primary_light").lstrip("#").upper()
+        self.assertTrue(worksheet["A2"].fill.start_color.rgb.endswith(primary_light))
+        self.assertTrue(worksheet["A3"].fill.start_color.rgb.endswith("FFFFFF"))
+        self.assertTrue(worksheet["A4"].fill.start_color.rgb.endswith(primary_light))
+        # Widths are sized from the first data frame, so "1,234,567.89" is ignored
+        self.assertAlmostEqual(
+            worksheet.column_dimensions["B"].width,
+            len("Value") * self.excel_formatter.BOLD_FONT_MULTIPLIER
+            + self.excel_formatter.COLUMN_PADDING,
+        )
+
+    def test_write_excel_with_title(self):
+        """Test that write_excel places the title above the offset header."""
+        df = pd.DataFrame({"Name": ["a"], "Value": [1]})
+        output = io.BytesIO()
+
+        self.excel_formatter.write_excel(output, [df], table_title="My Title")
+
+        output.seek(0)
+        worksheet = load_workbook(output)["Sheet1"]
+        self.assertEqual(worksheet["A2"].value, "My Title")
+        self.assertTrue(worksheet["A2"].font.bold)
+        self.assertIn("A2:B2", worksheet.merged_cells)
+        self.assertEqual(worksheet["A4"].value, "Name")
+        self.assertEqual(worksheet["B5"].value, 1)
+
+    def test_write_excel_passes_rows_to_style_hook(self):
+        """Test that an overridden _style_data_cell receives the written row."""
+
+        class NegativeRowFormatter(MontrekExcelFormatter):
+            def _style_data_cell(self, cell, row_idx, styles, row: list):
+                super()._style_data_cell(cell, row_idx, styles, row)
+                if row[1].value < 0:
+                    cell.font = Font(color="FF0000")
+
+        dfs = [
+            pd.DataFrame({"Name": ["a", "b"], "Value": [1, -1]}),
+            pd.DataFrame({"Name": ["c"], "Value": [-2]}),
+        ]
+        output = io.BytesIO()
+
+        NegativeRowFormatter.write_excel(output, dfs, col_formats={1: "0"})
+
+        output.seek(0)
+        worksheet = load_workbook(output)["Sheet1"]
+        red_rows = [
+            row[0].row
+            for row in worksheet.iter_rows(min_row=2)
+            if row[0].font.color is not None
+            and row[0].font.color.rgb.endswith("FF0000")
+        ]
+        self.assertEqual(red_rows, [3, 4])
+        self.assertEqual(worksheet["B3"].number_format, "0")
+        self.assertTrue(worksheet["A3"].fill.start_color.rgb.endswith("FFFFFF"))
+
+    def test_write_excel_converts_values(self):
+        """Test that values are converted like pandas' ExcelWriter does."""
+        df = pd.DataFrame(
+            {
+                "Date": [datetime.datetime(2024, 7, 13)],
+                "Decimal": [Decimal("1.5")],
+                "Object": [[1, 2]],
+            }
+        )
+        output = io.BytesIO()
+
+        self.excel_formatter.write_excel(output, [df])
+
+        output.seek(0)
+        worksheet = load_workbook(output)["Sheet1"]
+        self.assertEqual(worksheet["A2"].value, datetime.datetime(2024, 7, 13))
+        self.assertTrue(worksheet["A2"].is_date)
+        self.assertEqual(worksheet["B2"].value, "1.5")
+        self.assertEqual(worksheet["C2"].value, "[1, 2]")
+
+    def test_get_series_display_length(self):
+        """Test that the display length is taken from the column statistics."""
+        self.assertEqual(
+            self.excel_formatter._get_series_display_length(pd.Series([-1234.5, 2.0])),
+            len("-1,234.50"),
+        )
+        self.assertEqual(
+            self.excel_formatter._get_series_display_length(
+                pd.Series(["a", "abc", None])
+            ),
+            3,
+        )
+        self.assertEqual(
+            self.excel_formatter._get_series_display_length(pd.Series([None])), 0
+        )
+
     # ==================== Tests for _get_style_objects ====================
 
     def test_get_style_objects_returns_all_styles(self):
@@ -0,0 +1,136 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from montrek_example.managers.montrek_example_managers import HubBManager
+from montrek_example.models.example_models import HubB
+from montrek_example.repositories.hub_b_repository import HubBRepository
+from reporting.modules.keyset_paginator import KeysetCursor, KeysetPaginator
+from user.tests.factories.montrek_user_factories import MontrekUserFactory
+
+
+class KeysetHubBManager(HubBManager):
+    is_keyset_paginated = True
+
+
+class TestKeysetPaginator(TestCase):
+    def setUp(self):
+        self.session_data = {"user_id": MontrekUserFactory().id}
+        repository = HubBRepository(self.session_data)
+        for field_b1_str in ["b", "a", "c", "a", "b", None, "a"]:
+            if field_b1_str is None:
+                repository.create_by_dict({"field_b2_str": "only b2"})
+            else:
+                repository.create_by_dict({"field_b1_str": field_b1_str})
+
+    def get_queryset(self, order_field: str):
+        repository = HubBRepository(self.session_data)
+        repository.set_order_fields((order_field,))
+        return repository.receive()
+
+    def get_expected(self, paginator: KeysetPaginator) -> list[int]:
+        queryset = paginator.queryset.order_by(*paginator._get_ordering())
+        return [row.pk for row in queryset]
+
+    def page_through(self, paginator: KeysetPaginator) -> list[list[int]]:
+        pages = []
+        cursor = None
+        for page_number in range(1, 5):
+            rows = paginator.get_page(page_number, cursor)
+            pages.append([row.pk for row in rows])
+            if rows:
+                cursor = KeysetCursor.decode(
+                    paginator.get_cursor(page_number + 1, rows[-1])
+                )
+        return pages
+
+    def test_pages_forwards(self):
+        for order_field in ("field_b1_str", "-field_b1_str"):
+            paginator = KeysetPaginator(self.get_queryset(order_field), 2)
+            pages = self.page_through(paginator)
+            self.assertEqual(sum(pages, []), self.get_expected(paginator))
+            self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+    def test_pages_backwards(self):
+        paginator = KeysetPaginator(self.get_queryset("-field_b1_str"), 2)
+        pages = self.page_through(paginator)
+        for page_number in (3, 2, 1):
+            first_row = paginator.get_page(page_number + 1, None)[0]
+            cursor = KeysetCursor.decode(
+                paginator.get_cursor(page_number, first_row, backwards=True)
+            )
+            rows = paginator.get_page(page_number, cursor)
+            self.assertEqual([row.pk for row in rows], pages[page_number - 1])
+
+    def test_last_page(self):
+        paginator = KeysetPaginator(self.get_queryset("field_b1_str"), 2, count=7)
+        cursor = KeysetCursor.decode(paginator.get_cursor(4, None, backwards=True))
+        rows = paginator.get_page(4, cursor)
+        self.assertEqual([row.pk for row in rows], self.get_expected(paginator)[6:])
+
+    def test_mismatching_cursor_falls_back_to_offset(self):
+        paginator = KeysetPaginator(self.get_queryset("field_b1_str"), 2)
+        other_paginator = KeysetPaginator(self.get_queryset("-field_b1_str"), 2)
+        row = other_paginator.get_page(1, None)[-1]
+        cursor = KeysetCursor.decode(other_paginator.get_cursor(2, row))
+        rows = paginator.get_page(2, cursor)
+        self.assertEqual([row.pk for row in rows], self.get_expected(paginator)[2:4])
+
+    def test_pages_by_datetime_with_microseconds(self):
+        # All rows share one millisecond, so only exact cursors keep the order
+        start = timezone.make_aware(datetime.datetime(2024, 1, 1, 12))
+        hubs = list(HubB.objects.order_by("pk"))
+        for microsecond, hub in zip(
+            [300, 100, 200, 100, 500, 400, 600], hubs, strict=True
+        ):
+            hub.state_date_start = start.replace(microsecond=microsecond)
+            hub.save()
+        for order_field in ("state_date_start", "-state_date_start"):
+            paginator = KeysetPaginator(HubB.objects.order_by(order_field), 2)
+            pages = self.page_through(paginator)
+            self.assertEqual(sum(pages, []), self.get_expected(paginator))
+
+    def test_cursor_keeps_datetime_precision(self):
+        value = timezone.make_aware(datetime.datetime(2024, 1, 1, 12, 0, 0, 123456))
+        cursor = KeysetCursor.decode(
+            KeysetCursor(2, ["state_date_start", "pk"], [value, 1]).encode()
+        )
+        self.assertEqual(cursor.values, [value, 1])
+
+    def test_invalid_cursor(self):
+        self.assertIsNone(KeysetCursor.decode("not a cursor"))
+
+    def test_unsupported_order(self):
+        queryset = self.get_queryset("field_b1_str").order_by("hub__created_at")
+        self.assertFalse(KeysetPaginator(queryset, 2).is_supported)
+
+
+class TestKeysetPaginatedTableManager(TestCase):
+    def setUp(self):
+        self.user_id = MontrekUserFactory().id
+        repository = HubBRepository({"user_id": self.user_id})
+        for i in range(7):
+            repository.create_by_dict({"field_b1_str": f"b{i}"})
+
+    def test_manager_follows_cursors(self):
+        session_data = {
+            "user_id": self.user_id,
+            "current_paginate_by": 5,
+            "order_field": "-field_b1_str",
+        }
+        manager = KeysetHubBManager(session_data)
+        first_page = [row.field_b1_str for row in manager.get_table()]
+        self.assertEqual(first_page, ["b6", "b5", "b4", "b3", "b2"])
+        self.assertIsNone(manager.paginator.previous_cursor)
+        self.assertEqual(manager.paginator.num_pages, 2)
+
+        session_data["page"] = [2]
+        session_data["cursor"] = [manager.paginator.next_cursor]
+        manager = KeysetHubBManager(session_data)
+        second_page = [row.field_b1_str for row in manager.get_table()]
+        self.assertEqual(second_page, ["b1", "b0"])
+
+        session_data["page"] = [1]
+        session_data["cursor"] = [manager.paginator.previous_cursor]
+        manager = KeysetHubBManager(session_data)
+        self.assertEqual([row.field_b1_str for row in manager.get_table()], first_page)